@@ -0,0 +1,17 @@
+"""Baseline: the schema Base.metadata.create_all built before migrations existed
+
+Databases created by init_db.py before this point are stamped at this
+revision; fresh databases are created from the models and stamped at head.
+"""
+revision = '001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,23 @@
+"""Composite indexes for keyset pagination of nba_games by (date, game_id)"""
+from alembic import op
+from src.database.migrations import create_indexes, drop_indexes
+
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_nba_games_date_game_id", ["date", "game_id"]),
+    ("ix_nba_games_season_date_game_id", ["season", "date", "game_id"]),
+    ("ix_nba_games_home_team_date_game_id", ["home_team", "date", "game_id"]),
+    ("ix_nba_games_away_team_date_game_id", ["away_team", "date", "game_id"]),
+]
+
+
+def upgrade():
+    create_indexes(op, "nba_games", INDEXES)
+
+
+def downgrade():
+    drop_indexes(op, "nba_games", INDEXES)
@@ -0,0 +1,21 @@
+"""data_versions: per-table write counters for API cache invalidation"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(100), primary_key=True),
+        sa.Column('version', sa.BigInteger, nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
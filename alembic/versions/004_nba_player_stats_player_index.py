@@ -0,0 +1,20 @@
+"""Index nba_player_stats by (player_name, game_id) for player game logs"""
+from alembic import op
+from src.database.migrations import create_indexes, drop_indexes
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_nba_player_stats_player_name_game_id", ["player_name", "game_id"]),
+]
+
+
+def upgrade():
+    create_indexes(op, "nba_player_stats", INDEXES)
+
+
+def downgrade():
+    drop_indexes(op, "nba_player_stats", INDEXES)
@@ -0,0 +1,35 @@
+"""scrape_jobs: DB-backed queue for background scrapes"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scrape_jobs',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('params', sa.JSON, nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('attempts', sa.Integer, nullable=False),
+        sa.Column('worker', sa.String(100)),
+        sa.Column('pages_fetched', sa.Integer, nullable=False),
+        sa.Column('pages_parsed', sa.Integer, nullable=False),
+        sa.Column('rows_written', sa.Integer, nullable=False),
+        sa.Column('timings', sa.JSON),
+        sa.Column('error', sa.Text),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(timezone=True)),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True)),
+        sa.Column('finished_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index('ix_scrape_jobs_status_id', 'scrape_jobs', ['status', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_scrape_jobs_status_id', table_name='scrape_jobs')
+    op.drop_table('scrape_jobs')
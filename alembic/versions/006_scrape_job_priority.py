@@ -0,0 +1,37 @@
+"""scrape_jobs: priority and dedup_key for the scheduler"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('scrape_jobs', sa.Column('dedup_key', sa.String(255)))
+    op.add_column('scrape_jobs', sa.Column('priority', sa.Integer, nullable=False, server_default='0'))
+
+    # Same format as src.workers.jobs.dedup_key
+    jobs = sa.table('scrape_jobs', sa.column('id', sa.Integer), sa.column('kind', sa.String),
+                    sa.column('params', sa.JSON), sa.column('dedup_key', sa.String))
+    conn = op.get_bind()
+    for job_id, kind, params in conn.execute(sa.select(jobs.c.id, jobs.c.kind, jobs.c.params)).all():
+        key = f"{kind}:{json.dumps(params or {}, sort_keys=True, separators=(',', ':'))}"
+        conn.execute(jobs.update().where(jobs.c.id == job_id).values(dedup_key=key))
+
+    with op.batch_alter_table('scrape_jobs') as batch:
+        batch.alter_column('dedup_key', existing_type=sa.String(255), nullable=False)
+        batch.drop_index('ix_scrape_jobs_status_id')
+        batch.create_index('ix_scrape_jobs_status_priority_id', ['status', 'priority', 'id'])
+        batch.create_index('ix_scrape_jobs_dedup_key_id', ['dedup_key', 'id'])
+
+
+def downgrade():
+    with op.batch_alter_table('scrape_jobs') as batch:
+        batch.drop_index('ix_scrape_jobs_dedup_key_id')
+        batch.drop_index('ix_scrape_jobs_status_priority_id')
+        batch.create_index('ix_scrape_jobs_status_id', ['status', 'id'])
+        batch.drop_column('priority')
+        batch.drop_column('dedup_key')
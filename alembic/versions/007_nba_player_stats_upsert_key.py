@@ -0,0 +1,26 @@
+"""Unique (game_id, player_name) on nba_player_stats so box-score refreshes can upsert"""
+from alembic import op
+import sqlalchemy as sa
+from src.database.migrations import create_indexes, drop_indexes
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("uq_nba_player_stats_game_id_player_name", ["game_id", "player_name"]),
+]
+
+
+def upgrade():
+    # Keep the first copy of any duplicated player line before enforcing uniqueness
+    stats = sa.table('nba_player_stats', sa.column('id', sa.Integer),
+                     sa.column('game_id', sa.String), sa.column('player_name', sa.String))
+    keep = sa.select(sa.func.min(stats.c.id)).group_by(stats.c.game_id, stats.c.player_name)
+    op.execute(stats.delete().where(stats.c.id.not_in(keep)))
+    create_indexes(op, "nba_player_stats", INDEXES, unique=True)
+
+
+def downgrade():
+    drop_indexes(op, "nba_player_stats", INDEXES)
@@ -0,0 +1,181 @@
+"""
+players dimension: stat tables key players by integer player_id instead of
+a name string, NBA minutes / NHL time on ice become integer seconds, and
+every stat table gets game and player indexes. Existing rows are backfilled.
+
+On Postgres the dropped text columns keep their space until the table is
+rewritten (VACUUM FULL or pg_repack); new rows are smaller straight away.
+"""
+from alembic import op
+import sqlalchemy as sa
+from src.database.migrations import create_indexes, drop_indexes
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# (table, sport, game key column)
+STAT_TABLES = [
+    ("nba_player_stats", "nba", "game_id"),
+    ("nfl_player_stats", "nfl", "game_id"),
+    ("cfb_player_stats", "cfb", "game_id"),
+    ("nhl_player_stats", "nhl", "game_id"),
+    ("soccer_player_stats", "soccer", "match_id"),
+    ("lol_player_stats", "lol", "match_id"),
+    ("cs2_player_stats", "cs2", "match_id"),
+    ("dota2_player_stats", "dota2", "match_id"),
+    ("cod_player_stats", "cod", "match_id"),
+]
+
+# (table, text column, new integer seconds column)
+TIME_COLUMNS = [
+    ("nba_player_stats", "minutes", "seconds_played"),
+    ("nhl_player_stats", "time_on_ice", "toi_seconds"),
+]
+
+OLD_NBA_INDEXES = [
+    ("ix_nba_player_stats_player_name_game_id", ["player_name", "game_id"]),
+    ("uq_nba_player_stats_game_id_player_name", ["game_id", "player_name"]),
+]
+NBA_UNIQUE = [("uq_nba_player_stats_game_id_player_id", ["game_id", "player_id"])]
+
+
+def new_indexes(table, key):
+    if table == "nba_player_stats":
+        return [("ix_nba_player_stats_player_id_game_id", ["player_id", "game_id"])]
+    return [(f"ix_{table}_{key}", [key]), (f"ix_{table}_player_id_{key}", ["player_id", key])]
+
+
+def seconds_sql(dialect: str, column: str) -> str:
+    """SQL turning 'MM:SS' / 'MM' text into integer seconds; anything else -> NULL"""
+    if dialect == "postgresql":
+        return (f"CASE WHEN {column} ~ '^[0-9]+(:[0-9]{{2}})?$' THEN "
+                f"split_part({column}, ':', 1)::int * 60 "
+                f"+ COALESCE(NULLIF(split_part({column}, ':', 2), '')::int, 0) END")
+    return (f"CASE WHEN {column} GLOB '[0-9]*:[0-9][0-9]' THEN "
+            f"CAST(substr({column}, 1, instr({column}, ':') - 1) AS INTEGER) * 60 "
+            f"+ CAST(substr({column}, instr({column}, ':') + 1) AS INTEGER) "
+            f"WHEN {column} GLOB '[0-9]*' AND {column} NOT GLOB '*[^0-9]*' "
+            f"THEN CAST({column} AS INTEGER) * 60 END")
+
+
+def create_cfb_tables():
+    """
+    The CFB models never got a migration of their own, so databases built
+    from the baseline models lack their tables; create them before the
+    player_id backfill below touches cfb_player_stats
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('cfb_games'):
+        op.create_table(
+            'cfb_games',
+            sa.Column('game_id', sa.String(100), primary_key=True),
+            sa.Column('date', sa.Date, nullable=False),
+            sa.Column('year', sa.Integer),
+            sa.Column('week', sa.Integer),
+            sa.Column('home_team', sa.String(100)),
+            sa.Column('away_team', sa.String(100)),
+            sa.Column('home_score', sa.Integer),
+            sa.Column('away_score', sa.Integer),
+            sa.Column('winner', sa.String(100)),
+            sa.Column('scraped_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    if not inspector.has_table('cfb_player_stats'):
+        op.create_table(
+            'cfb_player_stats',
+            sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column('game_id', sa.String(100), sa.ForeignKey('cfb_games.game_id')),
+            sa.Column('player_name', sa.String(100)),
+            sa.Column('team', sa.String(100)),
+            sa.Column('stat_type', sa.String(20)),
+            *[sa.Column(name, sa.Integer) for name in (
+                'pass_cmp', 'pass_att', 'pass_yds', 'pass_td', 'pass_int',
+                'rush_att', 'rush_yds', 'rush_td',
+                'rec_tgt', 'rec_rec', 'rec_yds', 'rec_td', 'def_tackles')],
+            sa.Column('def_sacks', sa.Float),
+            sa.Column('def_int', sa.Integer),
+        )
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    create_cfb_tables()
+    op.create_table(
+        'players',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('sport', sa.String(10), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('uq_players_sport_name', 'players', ['sport', 'name'], unique=True)
+
+    for table, sport, _ in STAT_TABLES:
+        op.add_column(table, sa.Column('player_id', sa.Integer))
+        params = {"sport": sport}
+        op.get_bind().execute(sa.text(
+            f"INSERT INTO players (sport, name) SELECT DISTINCT :sport, s.player_name FROM {table} s "
+            f"WHERE s.player_name IS NOT NULL AND NOT EXISTS "
+            f"(SELECT 1 FROM players p WHERE p.sport = :sport AND p.name = s.player_name)"), params)
+        if dialect == "postgresql":
+            op.get_bind().execute(sa.text(
+                f"UPDATE {table} SET player_id = p.id FROM players p "
+                f"WHERE p.sport = :sport AND p.name = {table}.player_name"), params)
+        else:
+            op.get_bind().execute(sa.text(
+                f"UPDATE {table} SET player_id = (SELECT p.id FROM players p "
+                f"WHERE p.sport = :sport AND p.name = {table}.player_name) "
+                f"WHERE player_name IS NOT NULL"), params)
+
+    for table, text_column, seconds_column in TIME_COLUMNS:
+        op.add_column(table, sa.Column(seconds_column, sa.Integer))
+        op.execute(f"UPDATE {table} SET {seconds_column} = {seconds_sql(dialect, text_column)}")
+
+    drop_indexes(op, "nba_player_stats", OLD_NBA_INDEXES)
+    dropped = {table: [column] for table, column, _ in TIME_COLUMNS}
+    for table, _, _ in STAT_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.create_foreign_key(f"fk_{table}_player_id", "players", ["player_id"], ["id"])
+            for column in ["player_name", *dropped.get(table, [])]:
+                batch.drop_column(column)
+
+    create_indexes(op, "nba_player_stats", NBA_UNIQUE, unique=True)
+    for table, _, key in STAT_TABLES:
+        create_indexes(op, table, new_indexes(table, key))
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table, _, key in STAT_TABLES:
+        drop_indexes(op, table, new_indexes(table, key))
+    drop_indexes(op, "nba_player_stats", NBA_UNIQUE)
+
+    for table, text_column, seconds_column in TIME_COLUMNS:
+        op.add_column(table, sa.Column(text_column, sa.String(10)))
+        if dialect == "postgresql":
+            text = f"({seconds_column} / 60)::text || ':' || lpad(({seconds_column} % 60)::text, 2, '0')"
+        else:
+            text = f"({seconds_column} / 60) || ':' || substr('0' || ({seconds_column} % 60), -2)"
+        op.execute(f"UPDATE {table} SET {text_column} = {text} WHERE {seconds_column} IS NOT NULL")
+
+    seconds = {table: column for table, _, column in TIME_COLUMNS}
+    inspector = sa.inspect(op.get_bind())
+    for table, _, _ in STAT_TABLES:
+        op.add_column(table, sa.Column('player_name', sa.String(100)))
+        op.execute(f"UPDATE {table} SET player_name = "
+                   f"(SELECT p.name FROM players p WHERE p.id = {table}.player_id)")
+        # Tables built by create_all have an unnamed foreign key; SQLite's
+        # batch copy drops it along with the column
+        foreign_keys = [fk["name"] for fk in inspector.get_foreign_keys(table)
+                        if fk["constrained_columns"] == ["player_id"] and fk["name"]]
+        with op.batch_alter_table(table) as batch:
+            for name in foreign_keys:
+                batch.drop_constraint(name, type_="foreignkey")
+            batch.drop_column('player_id')
+            if table in seconds:
+                batch.drop_column(seconds[table])
+
+    create_indexes(op, "nba_player_stats", OLD_NBA_INDEXES[:1])
+    create_indexes(op, "nba_player_stats", OLD_NBA_INDEXES[1:], unique=True)
+    op.drop_index('uq_players_sport_name', table_name='players')
+    op.drop_table('players')
@@ -0,0 +1,158 @@
+"""
+nba_games and nba_player_stats partitioned by season (LIST) on Postgres.
+
+Postgres can't partition a table in place, so both tables are rebuilt: the
+old ones are renamed to *_unpartitioned, the partitioned parents and one
+partition per stored season are created, rows are copied across and the old
+tables dropped. The copy runs in the migration's transaction and locks both
+tables until it commits; run it when the scrapers are stopped.
+
+Every game gets a season (derived from its date where missing) and player
+lines take their game's season; lines whose game isn't stored are dropped.
+The season joins both primary keys, and nba_player_stats loses its
+surrogate id for the natural key (game_id, player_id, season). SQLite gets
+the same columns and keys without partitions.
+"""
+from alembic import op
+import sqlalchemy as sa
+from src.database.partitions import create_partition
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+GAME_INDEXES = [
+    ("ix_nba_games_date_game_id", ["date", "game_id"]),
+    ("ix_nba_games_season_date_game_id", ["season", "date", "game_id"]),
+    ("ix_nba_games_home_team_date_game_id", ["home_team", "date", "game_id"]),
+    ("ix_nba_games_away_team_date_game_id", ["away_team", "date", "game_id"]),
+]
+STAT_INDEXES = [("ix_nba_player_stats_player_id_game_id", ["player_id", "game_id"])]
+OLD_STAT_UNIQUE = [("uq_nba_player_stats_game_id_player_id", ["game_id", "player_id"])]
+
+GAME_COLUMNS = ["game_id", "date", "home_team", "away_team", "home_score", "away_score",
+                "season", "scraped_at"]
+STAT_VALUES = ["team", "seconds_played", "points", "rebounds", "assists", "steals", "blocks",
+               "turnovers", "fg_made", "fg_attempted", "three_made", "three_attempted",
+               "ft_made", "ft_attempted"]
+
+
+def game_columns(season_nullable: bool = False):
+    return [
+        sa.Column('game_id', sa.String(20), nullable=False),
+        sa.Column('date', sa.Date, nullable=False),
+        sa.Column('home_team', sa.String(50)),
+        sa.Column('away_team', sa.String(50)),
+        sa.Column('home_score', sa.Integer),
+        sa.Column('away_score', sa.Integer),
+        sa.Column('season', sa.Integer, nullable=season_nullable),
+        sa.Column('scraped_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def stat_value_columns():
+    return [sa.Column('team', sa.String(50)),
+            *[sa.Column(name, sa.Integer) for name in STAT_VALUES[1:]]]
+
+
+def season_sql(dialect: str) -> str:
+    """Basketball-Reference season from a game date: Nov 2025 -> 2026"""
+    if dialect == "postgresql":
+        return ("CAST(EXTRACT(YEAR FROM date) AS INTEGER) "
+                "+ CASE WHEN EXTRACT(MONTH FROM date) > 6 THEN 1 ELSE 0 END")
+    return "CAST(strftime('%Y', date) AS INTEGER) + (CAST(strftime('%m', date) AS INTEGER) > 6)"
+
+
+def move_aside(table: str, indexes, suffix: str) -> str:
+    """Rename table out of the way, freeing its index and primary key names"""
+    old = f"{table}_{suffix}"
+    for name, _ in indexes:
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.rename_table(table, old)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(f"ALTER INDEX IF EXISTS {table}_pkey RENAME TO {old}_pkey")
+    return old
+
+
+def copy_rows(source: str, target: str, columns):
+    column_list = ", ".join(columns)
+    op.execute(f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {source}")
+
+
+def create_index_list(table: str, indexes, unique: bool = False):
+    # Plain CREATE INDEX: the tables are new and locked by this transaction anyway
+    for name, columns in indexes:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    op.execute(f"UPDATE nba_games SET season = {season_sql(dialect)} WHERE season IS NULL")
+
+    op.add_column('nba_player_stats', sa.Column('season', sa.Integer))
+    if dialect == "postgresql":
+        op.execute("UPDATE nba_player_stats SET season = g.season FROM nba_games g "
+                   "WHERE g.game_id = nba_player_stats.game_id")
+    else:
+        op.execute("UPDATE nba_player_stats SET season = "
+                   "(SELECT g.season FROM nba_games g WHERE g.game_id = nba_player_stats.game_id)")
+    op.execute("DELETE FROM nba_player_stats WHERE season IS NULL OR player_id IS NULL")
+
+    old_stats = move_aside("nba_player_stats", STAT_INDEXES + OLD_STAT_UNIQUE, "unpartitioned")
+    old_games = move_aside("nba_games", GAME_INDEXES, "unpartitioned")
+
+    op.create_table(
+        'nba_games', *game_columns(),
+        sa.PrimaryKeyConstraint('game_id', 'season'),
+        postgresql_partition_by='LIST (season)',
+    )
+    op.create_table(
+        'nba_player_stats',
+        sa.Column('game_id', sa.String(20), nullable=False),
+        sa.Column('player_id', sa.Integer, sa.ForeignKey('players.id'), nullable=False),
+        sa.Column('season', sa.Integer, nullable=False),
+        *stat_value_columns(),
+        sa.PrimaryKeyConstraint('game_id', 'player_id', 'season'),
+        sa.ForeignKeyConstraint(['game_id', 'season'], ['nba_games.game_id', 'nba_games.season']),
+        postgresql_partition_by='LIST (season)',
+    )
+    if dialect == "postgresql":
+        seasons = op.get_bind().execute(sa.text(f"SELECT DISTINCT season FROM {old_games}")).scalars()
+        for season in seasons:
+            create_partition(op.get_bind(), "nba_games", season)
+            create_partition(op.get_bind(), "nba_player_stats", season)
+
+    copy_rows(old_games, "nba_games", GAME_COLUMNS)
+    copy_rows(old_stats, "nba_player_stats", ["game_id", "player_id", "season", *STAT_VALUES])
+    op.drop_table(old_stats)
+    op.drop_table(old_games)
+
+    create_index_list("nba_games", GAME_INDEXES)
+    create_index_list("nba_player_stats", STAT_INDEXES)
+
+
+def downgrade():
+    old_stats = move_aside("nba_player_stats", STAT_INDEXES, "partitioned")
+    old_games = move_aside("nba_games", GAME_INDEXES, "partitioned")
+
+    op.create_table(
+        'nba_games', *game_columns(season_nullable=True),
+        sa.PrimaryKeyConstraint('game_id'),
+    )
+    op.create_table(
+        'nba_player_stats',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('game_id', sa.String(20), sa.ForeignKey('nba_games.game_id')),
+        sa.Column('player_id', sa.Integer, sa.ForeignKey('players.id')),
+        *stat_value_columns(),
+    )
+    copy_rows(old_games, "nba_games", GAME_COLUMNS)
+    copy_rows(old_stats, "nba_player_stats", ["game_id", "player_id", *STAT_VALUES])
+    # Dropping a partitioned parent drops its partitions
+    op.drop_table(old_stats)
+    op.drop_table(old_games)
+
+    create_index_list("nba_games", GAME_INDEXES)
+    create_index_list("nba_player_stats", STAT_INDEXES)
+    create_index_list("nba_player_stats", OLD_STAT_UNIQUE, unique=True)
@@ -0,0 +1,25 @@
+"""change_log: ingest cursor for the /changes feed"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_log',
+        sa.Column('seq', sa.BigInteger().with_variant(sa.Integer, "sqlite"), primary_key=True,
+                  autoincrement=True),
+        sa.Column('table_name', sa.String(50), nullable=False),
+        sa.Column('row_key', sa.JSON, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_change_log_created_at', 'change_log', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_change_log_created_at', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,163 @@
+"""
+Deterministic fixture pages shaped like the sites the scrapers read.
+
+Pages are generated from a seed instead of checked in, so the suite has no
+large HTML blobs in the repo and every run parses byte-identical input.
+"""
+import random
+from datetime import date, timedelta
+
+NBA_TEAMS = [
+    ("Boston Celtics", "BOS"), ("Los Angeles Lakers", "LAL"), ("New York Knicks", "NYK"),
+    ("Miami Heat", "MIA"), ("Chicago Bulls", "CHI"), ("Dallas Mavericks", "DAL"),
+    ("Denver Nuggets", "DEN"), ("Golden State Warriors", "GSW"),
+]
+NBA_STATS = [
+    ("fg", "FG"), ("fga", "FGA"), ("fg_pct", "FG%"), ("fg3", "3P"), ("fg3a", "3PA"),
+    ("fg3_pct", "3P%"), ("ft", "FT"), ("fta", "FTA"), ("ft_pct", "FT%"), ("orb", "ORB"),
+    ("drb", "DRB"), ("trb", "TRB"), ("ast", "AST"), ("stl", "STL"), ("blk", "BLK"),
+    ("tov", "TOV"), ("pf", "PF"), ("pts", "PTS"), ("game_score", "GmSc"),
+]
+CFB_TABLES = {
+    "passing": ["Cmp", "Att", "Pct", "Yds", "Y/A", "TD", "Int", "Rate"],
+    "rushing": ["Att", "Yds", "Avg", "TD"],
+    "receiving": ["Tgt", "Rec", "Yds", "Avg", "TD"],
+    "defense": ["Solo", "Ast", "Tkl", "TFL", "Sk", "Int", "PD"],
+}
+CFB_TEAMS = ["Alabama", "Georgia", "Ohio State", "Michigan", "Texas", "Oregon", "Clemson", "LSU"]
+
+# Real pages carry navigation, ads and other tables the parsers must skip
+_FILLER = "".join(
+    f'<div class="filler"><p>Section {i} <a href="/section/{i}.html">more</a></p></div>'
+    for i in range(800)
+)
+
+
+def nba_game_ids(count: int, start: date = date(2025, 1, 1)):
+    ids = []
+    for i in range(count):
+        day = start + timedelta(days=i // 8)
+        ids.append(f"{day:%Y%m%d}0{NBA_TEAMS[i % len(NBA_TEAMS)][1]}")
+    return ids
+
+
+def _nba_basic_table(abbr: str, rng: random.Random, header: str) -> str:
+    head = (
+        '<tr class="over_header"><th colspan="2"></th><th colspan="19">Basic Box Score Stats</th></tr>'
+        f'<tr><th data-stat="player">{header}</th><th data-stat="mp">MP</th>'
+        + "".join(f'<th data-stat="{stat}">{label}</th>' for stat, label in NBA_STATS)
+        + "</tr>"
+    )
+    rows = []
+    for i in range(13):
+        if i == 5:
+            rows.append('<tr class="thead"><th data-stat="player">Reserves</th>'
+                        '<th data-stat="mp">MP</th><th data-stat="fg">FG</th></tr>')
+        name = f'<th data-stat="player"><a href="/players/{abbr.lower()}{i}.html">{abbr} Player {i}</a></th>'
+        if i >= 11:
+            rows.append(f'<tr>{name}<td data-stat="reason" colspan="20">Did Not Play</td></tr>')
+            continue
+        cells = "".join(f'<td data-stat="{stat}">{rng.randint(0, 12)}</td>' for stat, _ in NBA_STATS)
+        rows.append(f'<tr>{name}<td data-stat="mp">{rng.randint(5, 40)}:{rng.randint(10, 59)}</td>{cells}</tr>')
+    foot = '<tr><th>Team Totals</th><td>240</td>' + "<td>1</td>" * len(NBA_STATS) + "</tr>"
+    return (
+        f'<div class="table_container" id="div_box-{abbr}-game-basic">'
+        f'<table class="sortable stats_table" id="box-{abbr}-game-basic">'
+        f"<thead>{head}</thead><tbody>{''.join(rows)}</tbody><tfoot>{foot}</tfoot></table></div>"
+    )
+
+
+def nba_box_score(game_id: str, seed: int = 0, header: str = "Starters") -> str:
+    """Box score page; the home team's basic table is hidden in a comment"""
+    rng = random.Random(seed)
+    home_abbr = game_id[-3:]
+    home = next((t for t in NBA_TEAMS if t[1] == home_abbr), (home_abbr, home_abbr))
+    away = rng.choice([t for t in NBA_TEAMS if t[1] != home_abbr])
+    advanced = '<table class="stats_table" id="box-{0}-game-advanced"><tr><th>Player</th><th>TS%</th></tr></table>'
+    return (
+        f"<html><head><title>{away[0]} vs {home[0]}</title></head><body>{_FILLER}"
+        '<div class="scorebox">'
+        f'<div><div><strong><a itemprop="name" href="/teams/{away[1]}/2025.html">{away[0]}</a></strong></div>'
+        f'<div class="scores"><div class="score">{rng.randint(90, 130)}</div></div></div>'
+        f'<div><div><strong><a itemprop="name" href="/teams/{home[1]}/2025.html">{home[0]}</a></strong></div>'
+        f'<div class="scores"><div class="score">{rng.randint(90, 130)}</div></div></div>'
+        '<div class="scorebox_meta"><div>7:30 PM, January 1, 2025</div></div></div>'
+        + _nba_basic_table(away[1], rng, header) + advanced.format(away[1])
+        + '<div class="placeholder"></div>\n<!--\n' + _nba_basic_table(home[1], rng, header) + "\n-->"
+        + advanced.format(home[1]) + _FILLER + "</body></html>"
+    )
+
+
+def nba_month_page(game_ids) -> str:
+    rows = "".join(
+        f'<tr><th data-stat="date_game">{gid[:8]}</th>'
+        f'<td data-stat="visitor_team_name">Away</td><td data-stat="home_team_name">Home</td>'
+        f'<td data-stat="box_score_text"><a href="/boxscores/{gid}.html">Box Score</a></td></tr>'
+        for gid in game_ids
+    )
+    return f'<html><body>{_FILLER}<table id="schedule"><tbody>{rows}</tbody></table></body></html>'
+
+
+def cfb_schedule(year: int, weeks: int = 15, games_per_week: int = 50, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    head = ("<tr><th>Rk</th><th>Wk</th><th>Date</th><th>Time</th><th>Day</th><th>Winner</th>"
+            "<th>Pts</th><th></th><th>Loser</th><th>Pts</th><th>Notes</th></tr>")
+    rows = []
+    rank = 0
+    for week in range(1, weeks + 1):
+        day = date(year, 8, 31) + timedelta(weeks=week - 1)
+        for game in range(games_per_week):
+            rank += 1
+            winner, loser = f"School {week}-{game}A", f"School {week}-{game}B"
+            at = "@" if rng.random() < 0.4 else ""
+            rows.append(
+                f"<tr><td>{rank}</td><td>{week}</td><td>{day:%Y-%m-%d}</td><td>3:30 PM</td><td>Sat</td>"
+                f"<td>{winner}</td><td>{rng.randint(21, 56)}</td><td>{at}</td>"
+                f"<td>{loser}</td><td>{rng.randint(0, 20)}</td><td>{at}</td></tr>"
+            )
+    return (f'<html><body>{_FILLER}<table id="schedule"><thead>{head}</thead>'
+            f"<tbody>{''.join(rows)}</tbody></table></body></html>")
+
+
+def cfb_box_score(seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = []
+    for team in rng.sample(CFB_TEAMS, 2):
+        parts.append(f"<h2>{team}</h2>")
+        for kind, columns in CFB_TABLES.items():
+            head = (f'<tr class="over_header"><th></th><th colspan="{len(columns)}">{kind.title()}</th></tr>'
+                    "<tr><th>Player</th>" + "".join(f"<th>{c}</th>" for c in columns) + "</tr>")
+            rows = "".join(
+                f"<tr><th>{team} {kind} {i}</th>"
+                + "".join(f"<td>{rng.choice(['0.5', '1', '']) if c == 'Sk' else rng.randint(0, 30)}</td>"
+                          for c in columns)
+                + "</tr>"
+                for i in range(rng.randint(2, 8))
+            )
+            rows += "<tr><th>Team Total</th>" + "<td>1</td>" * len(columns) + "</tr>"
+            table = (f'<table class="sortable stats_table" id="{kind}_{team.lower().replace(" ", "_")}">'
+                     f"<thead>{head}</thead><tbody>{rows}</tbody></table>")
+            parts.append(f"<div><!--\n{table}\n--></div>" if kind == "defense" else table)
+    return f"<html><body>{_FILLER}{''.join(parts)}</body></html>"
+
+
+def lol_game_page(game_id: str, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    teams = ("Team Liquid", "Cloud9")
+    rows = []
+    for t, team in enumerate(teams):
+        for p in range(5):
+            rows.append(
+                f"<tr><td>{team}</td><td>Player{t}{p}</td><td>Champion{rng.randint(1, 160)}</td>"
+                f"<td>{rng.randint(0, 12)}</td><td>{rng.randint(0, 10)}</td><td>{rng.randint(0, 20)}</td>"
+                f"<td>{rng.randint(20, 350)}</td><td>{rng.randint(7000, 18000):,}</td>"
+                f"<td>{rng.randint(3000, 40000):,}</td><td>{rng.random():.2f}</td></tr>"
+            )
+    return (
+        f"<html><body>{_FILLER}<h1>{teams[0]} vs {teams[1]}</h1>"
+        f'<div class="score">{rng.randint(0, 1)}</div><div class="score">{rng.randint(0, 1)}</div>'
+        '<div class="game-date">2026-01-20</div>'
+        '<table class="table_list playersInfosLine"><tr><th>Team</th><th>Player</th><th>Champion</th>'
+        "<th>K</th><th>D</th><th>A</th><th>CS</th><th>Gold</th><th>Dmg</th><th>KP</th></tr>"
+        + "".join(rows) + "</table></body></html>"
+    )
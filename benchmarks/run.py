@@ -0,0 +1,356 @@
+"""
+Offline parser and ingest benchmarks, fed from generated fixture pages.
+
+    python -m benchmarks.run                       # writes bench_results.json
+    python -m benchmarks.run --quick --output a.json
+    python -m benchmarks.run --database-url postgresql://.../throwaway
+    python -m benchmarks.run --compare a.json b.json
+
+Nothing touches the network: every scraper fetch is answered from
+benchmarks.fixtures. DB benchmarks use a temporary SQLite file unless
+--database-url points at a throwaway database (its tables are dropped).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import contextlib
+import subprocess
+import multiprocessing
+from datetime import datetime, timezone
+from unittest import mock
+
+from benchmarks import fixtures
+
+
+def _peak_rss_kb() -> int:
+    # VmHWM belongs to this process's own address space; ru_maxrss on Linux
+    # also carries the parent's high-water mark across fork/exec
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 2) if seconds > 0 else 0.0
+
+
+def _timed(fn, items):
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - started
+
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _reset_tables():
+    from src.database.connection import engine
+    from src.database.models import Base
+    from src.database.partitions import forget_partitions
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    forget_partitions()
+    return engine
+
+
+# --- parsing -----------------------------------------------------------------
+
+def bench_parse(pages: int) -> dict:
+    from src.scrapers.nba import parse_box_score, parse_box_score_bs4
+    from src.scrapers.cfb import parse_cfb_game_stats
+
+    game_ids = fixtures.nba_game_ids(pages)
+    nba_pages = [(gid, fixtures.nba_box_score(gid, seed=i)) for i, gid in enumerate(game_ids)]
+    reference_pages = nba_pages[:max(1, pages // 10)]
+    cfb_pages = [fixtures.cfb_box_score(seed=i) for i in range(pages)]
+
+    results = {}
+    with _quiet():
+        seconds = _timed(lambda page: parse_box_score(page[1], page[0], 2025), nba_pages)
+        results["nba_box_score_lxml"] = {"pages": len(nba_pages), "seconds": round(seconds, 4),
+                                         "pages_per_sec": _rate(len(nba_pages), seconds)}
+
+        seconds = _timed(lambda page: parse_box_score_bs4(page[1], page[0], 2025), reference_pages)
+        results["nba_box_score_bs4"] = {"pages": len(reference_pages), "seconds": round(seconds, 4),
+                                        "pages_per_sec": _rate(len(reference_pages), seconds)}
+
+        seconds = _timed(lambda html: parse_cfb_game_stats(html, "bench"), cfb_pages)
+        results["cfb_box_score"] = {"pages": len(cfb_pages), "seconds": round(seconds, 4),
+                                    "pages_per_sec": _rate(len(cfb_pages), seconds)}
+
+    page_bytes = sum(len(html.encode()) for _, html in nba_pages) / len(nba_pages)
+    results["nba_box_score_lxml"]["avg_page_kb"] = round(page_bytes / 1024, 1)
+    return results
+
+
+def check_parity(pages: int) -> dict:
+    """The lxml NBA parser must produce exactly what the reference parser does"""
+    from src.scrapers.nba import parse_box_score, parse_box_score_bs4
+
+    checked, mismatches = 0, []
+    with _quiet():
+        for i, gid in enumerate(fixtures.nba_game_ids(pages)):
+            for header in ("Starters", "Player"):
+                html = fixtures.nba_box_score(gid, seed=i, header=header)
+                checked += 1
+                if parse_box_score(html, gid, 2025) != parse_box_score_bs4(html, gid, 2025):
+                    mismatches.append(f"{gid}/{header}")
+    return {"nba_box_score": {"pages": checked, "ok": not mismatches, "mismatches": mismatches}}
+
+
+# --- DB writes ---------------------------------------------------------------
+
+def _stat_rows(games: int):
+    rows = []
+    for gid in fixtures.nba_game_ids(games):
+        for p in range(26):
+            rows.append({
+                "game_id": gid, "player_name": f"Player {p}", "season": 2025, "team": gid[-3:],
+                "seconds_played": 1440,
+                "points": p, "rebounds": 5, "assists": 3, "steals": 1, "blocks": 0, "turnovers": 2,
+                "fg_made": 4, "fg_attempted": 9, "three_made": 1, "three_attempted": 3,
+                "ft_made": 2, "ft_attempted": 2,
+            })
+    return rows
+
+
+def bench_db_writes(games: int) -> dict:
+    from sqlalchemy.orm import Session
+    from src.database.bulk import BulkWriter, resolve_player_ids
+    from src.database.models import NBAPlayerStat
+
+    rows = _stat_rows(games)
+    engine = _reset_tables()
+    started = time.perf_counter()
+    with BulkWriter(engine) as writer:
+        writer.add_many(NBAPlayerStat, rows)
+    bulk_seconds = time.perf_counter() - started
+    bulk_rows = sum(writer.rows_written.values())
+
+    # ORM unit-of-work baseline, one commit per game like the old scrapers
+    engine = _reset_tables()
+    baseline = rows[:max(26, len(rows) // 10)]
+    with engine.begin() as conn:
+        ids = resolve_player_ids(conn, "nba", [row["player_name"] for row in baseline])
+    baseline = [{**{k: v for k, v in row.items() if k != "player_name"},
+                 "player_id": ids[row["player_name"]]} for row in baseline]
+    started = time.perf_counter()
+    with Session(engine) as db:
+        for start in range(0, len(baseline), 26):
+            for row in baseline[start:start + 26]:
+                db.add(NBAPlayerStat(**row))
+            db.commit()
+    orm_seconds = time.perf_counter() - started
+
+    return {
+        "dialect": engine.dialect.name,
+        "bulk_writer": {"rows": bulk_rows, "seconds": round(bulk_seconds, 4),
+                        "rows_per_sec": _rate(bulk_rows, bulk_seconds)},
+        "orm_add": {"rows": len(baseline), "seconds": round(orm_seconds, 4),
+                    "rows_per_sec": _rate(len(baseline), orm_seconds)},
+    }
+
+
+# --- end-to-end scrapes with peak RSS ------------------------------------------
+
+def _ingest_nba(count: int) -> int:
+    from sqlalchemy.orm import Session
+    from src.database.connection import engine
+    from src.scrapers import core, nba
+
+    game_ids = fixtures.nba_game_ids(count)
+    pages = {f"{nba.BR_BASE}/boxscores/{gid}.html": fixtures.nba_box_score(gid, seed=i)
+             for i, gid in enumerate(game_ids)}
+    with mock.patch.object(core, "fetch", lambda url, **kwargs: pages[url]):
+        with Session(engine) as db:
+            for url in pages:
+                nba.scrape_single_game(url, 2025, db)
+    return len(pages)
+
+
+def _fixture_fetch_async(pages):
+    async def fetch_raw_async(session, url, timeout=10, throttle=None, headers=None,
+                              revalidate=False):
+        return pages[url].encode(), "utf-8"
+    return fetch_raw_async
+
+
+def _ingest_nba_month(count: int) -> int:
+    from src.scrapers import nba, pipeline
+
+    game_ids = fixtures.nba_game_ids(count)
+    pages = {f"{nba.BR_BASE}/boxscores/{gid}.html": fixtures.nba_box_score(gid, seed=i)
+             for i, gid in enumerate(game_ids)}
+    pages[f"{nba.BR_BASE}/leagues/NBA_2025_games-january.html"] = fixtures.nba_month_page(game_ids)
+    with mock.patch.object(nba, "fetch", lambda url, **kwargs: pages[url]), \
+            mock.patch.object(pipeline, "fetch_raw_async", _fixture_fetch_async(pages)):
+        nba.scrape_nba_month(2025, "january")
+    return len(game_ids)
+
+
+def _ingest_cfb(count: int) -> int:
+    from src.scrapers import cfb
+
+    weeks = max(1, min(15, count // 10))
+    page = fixtures.cfb_schedule(2025, weeks=weeks)
+    with mock.patch.object(cfb, "fetch", lambda url, **kwargs: page):
+        for week in range(1, weeks + 1):
+            cfb.scrape_cfb_week(2025, week)
+    return weeks
+
+
+def _ingest_lol(count: int) -> int:
+    from sqlalchemy.orm import Session
+    from src.database.connection import engine
+    from src.scrapers import core, lol
+
+    pages = {f"{lol.GOL_BASE}/game/stats/{60000 + i}/page-game/": fixtures.lol_game_page(str(i), seed=i)
+             for i in range(count)}
+    with mock.patch.object(core, "fetch", lambda url, **kwargs: pages[url]):
+        with Session(engine) as db:
+            for i in range(count):
+                lol.scrape_single_lol_game(str(60000 + i), "LCS", "2026-spring", db)
+    return count
+
+
+INGEST_TARGETS = {
+    "scrape_single_game": _ingest_nba,
+    "scrape_nba_month": _ingest_nba_month,
+    "scrape_cfb_week": _ingest_cfb,
+    "scrape_single_lol_game": _ingest_lol,
+}
+
+
+def _ingest_worker(name: str, count: int, queue):
+    # Runs in a fresh interpreter so ru_maxrss belongs to this scraper alone,
+    # and the rows its BulkWriters flushed are all this scraper's
+    try:
+        from src.metrics import ROWS_WRITTEN
+        _reset_tables()
+        _reset_peak_rss()
+        baseline = _peak_rss_kb()
+        rows_before = ROWS_WRITTEN.total()
+        started = time.perf_counter()
+        with _quiet():
+            items = INGEST_TARGETS[name](count)
+        seconds = time.perf_counter() - started
+        rows = int(ROWS_WRITTEN.total() - rows_before)
+        # Throughput counts rows actually written, so failed or skipped pages don't inflate it
+        queue.put({"items": items, "rows": rows, "seconds": round(seconds, 4),
+                   "rows_per_sec": _rate(rows, seconds),
+                   "peak_rss_kb": _peak_rss_kb(), "baseline_rss_kb": baseline})
+    except Exception as e:
+        queue.put({"error": repr(e)})
+
+
+def bench_ingest(count: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in INGEST_TARGETS:
+        queue = context.Queue()
+        process = context.Process(target=_ingest_worker, args=(name, count, queue))
+        process.start()
+        results[name] = queue.get()
+        process.join()
+    return results
+
+
+# --- driver -------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(quick: bool = False) -> dict:
+    pages = 20 if quick else 100
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "parity": check_parity(max(4, pages // 10)),
+        "parse": bench_parse(pages),
+        "db_write": bench_db_writes(pages * 10),
+        "ingest": bench_ingest(pages // 2),
+    }
+
+
+def _flatten(data, prefix=""):
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, name + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = dict(_flatten(json.load(f)))
+    with open(new_path) as f:
+        new = dict(_flatten(json.load(f)))
+    print(f"{'metric':<50} {'old':>12} {'new':>12} {'new/old':>8}")
+    for name in sorted(old.keys() & new.keys()):
+        if name.startswith("meta."):
+            continue
+        ratio = f"{new[name] / old[name]:.2f}" if old[name] else "-"
+        print(f"{name:<50} {old[name]:>12} {new[name]:>12} {ratio:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs for a fast smoke run")
+    parser.add_argument("--database-url", help="throwaway database to benchmark against")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before src.database.connection is imported, here and in workers
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        results = run(quick=args.quick)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"\nWrote {args.output}")
+    if not results["parity"]["nba_box_score"]["ok"]:
+        sys.exit("NBA lxml parser output differs from the reference parser")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,19 @@
 """Initialize database tables"""
 import os
 from src.database.connection import engine
-from src.database.models import Base
+from src.database.migrations import upgrade_database
 
 def init_database():
-    """Create all tables in the database"""
-    print("Creating database tables...")
-    Base.metadata.create_all(engine)
-    print("✓ All tables created successfully!")
+    """Create all tables, or apply pending migrations to an existing database"""
+    print("Initializing database schema...")
+    result = upgrade_database()
+    print(f"✓ Database {result} (alembic head)")
     
     # List all tables
     from sqlalchemy import inspect
     inspector = inspect(engine)
     tables = inspector.get_table_names()
-    print(f"\nCreated {len(tables)} tables:")
+    print(f"\n{len(tables)} tables:")
     for table in sorted(tables):
         print(f"  - {table}")
 
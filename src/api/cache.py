@@ -0,0 +1,123 @@
+"""
+In-process response cache for the read endpoints.
+
+Entries are keyed by route and query string and remember the data_versions
+of the tables they were built from. BulkWriter bumps those versions on every
+scrape commit, so an entry is served until its TTL runs out or a scraper
+writes to one of its tables. Versions are read at most once per
+VERSION_CHECK_INTERVAL per process, which keeps repeat polls off the
+database entirely.
+"""
+import os
+import time
+import asyncio
+import hashlib
+import orjson
+from collections import OrderedDict
+from fastapi import Request, Response
+from sqlalchemy import select
+from src.database.models import DataVersion
+
+CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "512"))
+CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+VERSION_CHECK_INTERVAL = float(os.environ.get("RESPONSE_CACHE_VERSION_CHECK", "2"))
+
+
+class ResponseCache:
+    """LRU of (versions, body, etag, stored_at) with a TTL"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key, versions):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry_versions, body, etag, stored_at = entry
+        if entry_versions != versions or time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body, etag
+
+    def put(self, key, versions, body: bytes, etag: str):
+        self._entries[key] = (versions, body, etag, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class VersionTracker:
+    """Caches data_versions rows for VERSION_CHECK_INTERVAL seconds"""
+
+    def __init__(self, interval: float = VERSION_CHECK_INTERVAL):
+        self.interval = interval
+        self._versions = {}
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def versions(self, db, tables) -> tuple:
+        async with self._lock:
+            if time.monotonic() - self._checked_at > self.interval or any(
+                    table not in self._versions for table in tables):
+                rows = await db.execute(select(DataVersion.name, DataVersion.version))
+                self._versions = dict(rows.all())
+                self._checked_at = time.monotonic()
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+
+response_cache = ResponseCache()
+version_tracker = VersionTracker()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+
+def _response(request: Request, body: bytes, etag: str, cache_status: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": cache_status}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def render_json(content) -> bytes:
+    # orjson writes dates/datetimes as ISO strings natively
+    return orjson.dumps(content, default=str)
+
+
+async def cached_json(request: Request, db, tables, build):
+    """
+    Serve build()'s JSON for this route + query from the cache while the
+    versions of tables are unchanged. build is an async callable returning
+    a JSON-able dict; error payloads are never cached.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    try:
+        versions = await version_tracker.versions(db, tables)
+    except Exception:
+        # data_versions missing (migration not applied yet): serve uncached
+        await db.rollback()
+        versions = None
+    cached = response_cache.get(key, versions) if versions is not None else None
+    if cached is not None:
+        return _response(request, *cached, "HIT")
+
+    content = await build()
+    body = render_json(content)
+    etag = make_etag(body)
+    if versions is not None and content.get("status") != "error":
+        response_cache.put(key, versions, body, etag)
+    return _response(request, body, etag, "MISS")
@@ -0,0 +1,171 @@
+"""
+Change feed: game and stat rows the scrapers inserted or changed after a cursor.
+
+    GET /changes                  -> {"cursor": ...} to start following from now
+    GET /changes?since=<cursor>   -> changed rows grouped by table, plus the next cursor
+    GET /changes/stream?since=<cursor>
+                                  -> the same pages as Server-Sent Events, pushed as
+                                     scrapes commit (reconnects resume from Last-Event-ID)
+
+Cursors are change_log seqs, which BulkWriter writes in commit order. Rows
+are returned as they are now, so a row changed twice since the cursor
+appears once. Cursors older than the change_log retention get a 410; reload
+the full list and follow from a fresh cursor.
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.api.cache import render_json
+from src.api.pagination import MAX_PAGE_SIZE
+from src.database.bulk import LOOKUP_CHUNK
+from src.database.connection import get_async_db, get_async_sessionmaker
+from src.database.models import Base, ChangeLog, Player
+
+CHANGES_POLL_SECONDS = float(os.environ.get("CHANGES_POLL_SECONDS", "1"))
+CHANGES_HEARTBEAT_SECONDS = float(os.environ.get("CHANGES_HEARTBEAT_SECONDS", "15"))
+
+router = APIRouter()
+
+
+class ChangeHead:
+    """
+    Latest change_log seq, read at most once per interval for every stream
+    in this process, so idle streams cost one tiny query per second in total
+    """
+
+    def __init__(self, interval: float = CHANGES_POLL_SECONDS):
+        self.interval = interval
+        self.seq = 0
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def current(self) -> int:
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= self.interval:
+                async with get_async_sessionmaker()() as db:
+                    self.seq = await head(db)
+                self._checked_at = time.monotonic()
+        return self.seq
+
+    async def wait_past(self, cursor: int, timeout: float) -> int:
+        """Wait until the head passes cursor or timeout runs out; returns the head"""
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = await self.current()
+            if seq > cursor or time.monotonic() >= deadline:
+                return seq
+            await asyncio.sleep(self.interval)
+
+
+change_head = ChangeHead()
+
+
+async def head(db) -> int:
+    return (await db.execute(select(func.max(ChangeLog.seq)))).scalar() or 0
+
+
+async def check_cursor(db, since: int):
+    """410 if entries after since were already pruned"""
+    oldest = (await db.execute(select(func.min(ChangeLog.seq)))).scalar()
+    if oldest is not None and since < oldest - 1:
+        raise HTTPException(status_code=410, detail="Cursor expired; reload and follow from a new cursor")
+
+
+async def fetch_rows(db, table_name: str, keys: list) -> list:
+    """Current rows of table_name with these primary keys; stat rows get player_name"""
+    table = Base.metadata.tables[table_name]
+    primary_key = list(table.primary_key.columns)
+    columns = list(table.columns)
+    if "player_id" in table.c:
+        columns.append(Player.name.label("player_name"))
+    rows = []
+    per_query = max(1, LOOKUP_CHUNK // len(primary_key))
+    for start in range(0, len(keys), per_query):
+        stmt = select(*columns).where(tuple_(*primary_key).in_(keys[start:start + per_query]))
+        if "player_id" in table.c:
+            stmt = stmt.outerjoin(Player, table.c.player_id == Player.id)
+        rows.extend(dict(row._mapping) for row in (await db.execute(stmt)).all())
+    return rows
+
+
+async def changes_since(db, since: int, limit: int) -> dict:
+    entries = (await db.execute(
+        select(ChangeLog.seq, ChangeLog.table_name, ChangeLog.row_key)
+        .where(ChangeLog.seq > since).order_by(ChangeLog.seq).limit(limit + 1)
+    )).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    keys = {}
+    for entry in entries:
+        keys.setdefault(entry.table_name, {})[tuple(entry.row_key)] = None
+    changes = {table: await fetch_rows(db, table, list(table_keys))
+               for table, table_keys in keys.items() if table in Base.metadata.tables}
+    return {
+        "status": "success",
+        "cursor": entries[-1].seq if entries else since,
+        "has_more": has_more,
+        "count": sum(len(rows) for rows in changes.values()),
+        "changes": changes,
+    }
+
+
+@router.get("/changes")
+async def get_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Rows inserted or updated after since (at most limit change entries; keep
+    calling with the returned cursor while has_more). Without since, returns
+    the current cursor and no rows.
+    """
+    if since is None:
+        return {"status": "success", "cursor": await head(db), "has_more": False, "count": 0,
+                "changes": {}}
+    await check_cursor(db, since)
+    return await changes_since(db, since, limit)
+
+
+@router.get("/changes/stream")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events: one 'changes' event per page of changes (the same
+    body as GET /changes), with the page's cursor as the event id, and a
+    comment line every CHANGES_HEARTBEAT_SECONDS while nothing changes.
+    """
+    async with get_async_sessionmaker()() as db:
+        if last_event_id and last_event_id.isdigit():
+            cursor = int(last_event_id)
+        elif since is not None:
+            cursor = since
+        else:
+            cursor = await head(db)
+        await check_cursor(db, cursor)
+
+    async def events():
+        nonlocal cursor
+        yield f"retry: {int(CHANGES_POLL_SECONDS * 1000)}\n\n"
+        while not await request.is_disconnected():
+            latest = await change_head.wait_past(cursor, CHANGES_HEARTBEAT_SECONDS)
+            if latest <= cursor:
+                yield ": keep-alive\n\n"
+                continue
+            async with get_async_sessionmaker()() as db:
+                page = await changes_since(db, cursor, limit)
+            cursor = page["cursor"]
+            yield f"id: {cursor}\nevent: changes\ndata: {render_json(page).decode()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,203 @@
+"""
+Streaming bulk export of player stat tables as NDJSON, CSV or Parquet.
+
+Rows are read with a server-side cursor in EXPORT_BATCH_SIZE partitions
+and each partition is encoded and sent before the next is fetched, so
+memory stays flat however many rows match.
+"""
+import io
+import csv
+import os
+from dataclasses import dataclass
+from datetime import date
+from typing import Literal, Optional
+import orjson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Date, DateTime, Float, Integer, BigInteger, and_, select
+from src.database.connection import get_async_engine
+from src.database.models import (
+    NBAGame, NBAPlayerStat, CFBGame, CFBPlayerStat, LoLMatch, LoLPlayerStat, Player
+)
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "5000"))
+
+router = APIRouter()
+
+
+@dataclass
+class ExportSpec:
+    """A stat table joined to its game table for date/season filters"""
+    stats: type
+    game: type
+    join_on: object
+    date: object
+    season: object
+
+
+EXPORTS = {
+    "nba_player_stats": ExportSpec(NBAPlayerStat, NBAGame,
+                                   and_(NBAPlayerStat.game_id == NBAGame.game_id,
+                                        NBAPlayerStat.season == NBAGame.season),
+                                   NBAGame.date, NBAGame.season),
+    "cfb_player_stats": ExportSpec(CFBPlayerStat, CFBGame, CFBPlayerStat.game_id == CFBGame.game_id,
+                                   CFBGame.date, CFBGame.year),
+    "lol_player_stats": ExportSpec(LoLPlayerStat, LoLMatch, LoLPlayerStat.match_id == LoLMatch.match_id,
+                                   LoLMatch.date, LoLMatch.season),
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns(spec: ExportSpec) -> list:
+    """Every stat column plus the player's name and the game's date and season"""
+    # A stat table's own season copy (a partition key) duplicates the game's
+    stats = [c for c in spec.stats.__table__.columns if c.name != "season"]
+    return stats + [Player.name.label("player_name"), spec.date.label("game_date"),
+                    spec.season.label("season")]
+
+
+def export_query(spec: ExportSpec, season: str = None, start_date: date = None,
+                 end_date: date = None):
+    stmt = (
+        select(*export_columns(spec))
+        .join(spec.game, spec.join_on)
+        .outerjoin(Player, spec.stats.player_id == Player.id)
+    )
+    if season is not None:
+        if isinstance(spec.season.type, Integer):
+            try:
+                season = int(season)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="season must be a year for this table")
+        stmt = stmt.where(spec.season == season)
+    if start_date:
+        stmt = stmt.where(spec.date >= start_date)
+    if end_date:
+        stmt = stmt.where(spec.date <= end_date)
+    return stmt.order_by(*spec.stats.__table__.primary_key.columns)
+
+
+async def stream_rows(stmt, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield lists of row tuples from a server-side cursor"""
+    async with get_async_engine().connect() as conn:
+        result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):
+            yield partition
+
+
+async def ndjson_chunks(batches, names):
+    async for rows in batches:
+        yield b"".join(orjson.dumps(dict(zip(names, row))) + b"\n" for row in rows)
+
+
+async def csv_chunks(batches, names):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _arrow_type(pa, column_type):
+    if isinstance(column_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(columns):
+    """pyarrow schema for a list of SQLAlchemy columns / labels"""
+    import pyarrow as pa
+    return pa.schema([(c.name, _arrow_type(pa, c.type)) for c in columns])
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def parquet_chunks(batches, columns):
+    """One Parquet row group per batch, streamed as it is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for rows in batches:
+            arrays = [pa.array(values, type=field.type)
+                      for values, field in zip(zip(*rows), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+@router.get("/export/{table}")
+async def export_table(
+    table: str,
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    season: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Stream every row of a player stats table, optionally filtered by the
+    game's season and date range.
+    """
+    spec = EXPORTS.get(table)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Unknown table; available: {', '.join(EXPORTS)}")
+
+    columns = export_columns(spec)
+    names = [c.name for c in columns]
+    batches = stream_rows(export_query(spec, season, start_date, end_date))
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export needs pyarrow installed")
+        body = parquet_chunks(batches, columns)
+    elif format == "csv":
+        body = csv_chunks(batches, names)
+    else:
+        body = ndjson_chunks(batches, names)
+
+    filename = f"{table}.{format}"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format],
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
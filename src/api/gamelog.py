@@ -0,0 +1,98 @@
+"""Player game logs with rolling averages computed by SQL window functions"""
+import math
+from sqlalchemy import and_, case, func, select
+from src.database.models import NBAGame, NBAPlayerStat, Player
+
+ROLLING_STATS = {
+    "points": NBAPlayerStat.points,
+    "rebounds": NBAPlayerStat.rebounds,
+    "assists": NBAPlayerStat.assists,
+    "threes": NBAPlayerStat.three_made,
+}
+ROLLING_WINDOWS = (5, 10, 20)
+
+LOG_COLUMNS = ["seconds_played", "points", "rebounds", "assists", "steals", "blocks", "turnovers",
+               "fg_made", "fg_attempted", "three_made", "three_attempted", "ft_made", "ft_attempted"]
+
+
+def _home_abbr():
+    # Basketball-Reference game ids end in the home team's abbreviation: 202501010LAL
+    return func.substr(NBAGame.game_id, 10, 3)
+
+
+def gamelog_query(player_names, windows=ROLLING_WINDOWS, stats=ROLLING_STATS):
+    """
+    One row per game played (seconds_played not NULL) for each of player_names, with
+    count/sum/sum-of-squares windows over the last N games for every rolling
+    stat. rolling_values() turns those into averages and standard deviations.
+    Returns a subquery so callers can filter, order and limit the outer select.
+    """
+    order = (NBAGame.date, NBAGame.game_id)
+    home = NBAPlayerStat.team == _home_abbr()
+    window_columns = []
+    for name, column in stats.items():
+        for n in windows:
+            def over(expr):
+                return expr.over(partition_by=NBAPlayerStat.player_id, order_by=order,
+                                 rows=(-(n - 1), 0))
+            window_columns += [
+                over(func.count(column)).label(f"{name}_n_{n}"),
+                over(func.sum(column)).label(f"{name}_s1_{n}"),
+                over(func.sum(column * column)).label(f"{name}_s2_{n}"),
+            ]
+    return (
+        select(
+            Player.name.label("player_name"),
+            NBAGame.game_id,
+            NBAGame.date,
+            NBAGame.season,
+            NBAPlayerStat.team,
+            case((home, NBAGame.away_team), else_=NBAGame.home_team).label("opponent"),
+            home.label("home"),
+            *[getattr(NBAPlayerStat, c) for c in LOG_COLUMNS],
+            *window_columns,
+        )
+        .join(Player, NBAPlayerStat.player_id == Player.id)
+        .join(NBAGame, and_(NBAPlayerStat.game_id == NBAGame.game_id,
+                             NBAPlayerStat.season == NBAGame.season))
+        .where(Player.sport == "nba", Player.name.in_(player_names),
+               NBAPlayerStat.seconds_played.isnot(None))
+        .subquery()
+    )
+
+
+def rolling_values(row, windows=ROLLING_WINDOWS, stats=ROLLING_STATS) -> dict:
+    """{stat}_avg_{n} and sample {stat}_std_{n} from the window sums of one row"""
+    values = {}
+    for name in stats:
+        for n in windows:
+            count = row[f"{name}_n_{n}"]
+            total = row[f"{name}_s1_{n}"]
+            squares = row[f"{name}_s2_{n}"]
+            values[f"{name}_avg_{n}"] = round(total / count, 2) if count else None
+            if count and count > 1:
+                variance = max(0.0, (squares - total * total / count) / (count - 1))
+                values[f"{name}_std_{n}"] = round(math.sqrt(variance), 2)
+            else:
+                values[f"{name}_std_{n}"] = None
+    return values
+
+
+def format_minutes(seconds) -> str:
+    """2052 -> '34:12'"""
+    return None if seconds is None else f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def gamelog_entry(row) -> dict:
+    entry = {
+        "game_id": row["game_id"],
+        "date": row["date"],
+        "season": row["season"],
+        "team": row["team"],
+        "opponent": row["opponent"],
+        "home": bool(row["home"]),
+    }
+    entry.update({column: row[column] for column in LOG_COLUMNS})
+    entry["minutes"] = format_minutes(row["seconds_played"])
+    entry.update(rolling_values(row))
+    return entry
@@ -1,10 +1,40 @@
 """FastAPI server for sports betting stats"""
 import os
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.database.connection import engine, get_async_db, get_async_engine
+from src.database.models import NBAGame, ScrapeJob
+from src.api.projection import (
+    DEFAULT_FIELDS, GAME_FIELDS, PLAYER_FIELDS, TEAM_FIELDS, columns, parse_fields, shape_rows
+)
+from src.database.migrations import upgrade_database
+from src.api.pagination import MAX_PAGE_SIZE, encode_cursor, keyset_page
+from src.api.cache import cached_json
+from src.api.changes import router as changes_router
+from src.api.export import router as export_router
+from src.api.gamelog import gamelog_entry, gamelog_query
+from src.api.props import MAX_WINDOW, evaluate_props, game_tensor, parse_stat, recent_games_query
+from src.metrics import REQUEST_SECONDS, log_event, render
+from src.workers.jobs import JOB_KINDS, JobError, enqueue, job_dict
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled async connections if any request opened the engine
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
 
-app = FastAPI(title="Sports Betting Model API", version="1.0.0")
+app = FastAPI(title="Sports Betting Model API", version="1.0.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 # CORS for frontend access
 app.add_middleware(
@@ -15,6 +45,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(export_router)
+app.include_router(changes_router)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Per-route latency histogram plus one structured log line per request"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        seconds = time.perf_counter() - started
+        # Route template (/nba/games), not the raw path, to keep label values bounded
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUEST_SECONDS.observe(seconds, method=request.method, route=path, status=status)
+        log_event("api.request", method=request.method, route=path, status=status, seconds=seconds)
+
 @app.get("/")
 def root():
     return {
@@ -32,6 +82,14 @@ def health_check():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus scrape endpoint for API request latency. Scrapes run in the
+    worker, which serves the scraper_* series on WORKER_METRICS_PORT.
+    """
+    return PlainTextResponse(render("api_"), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/nba/stats/sample")
 def get_nba_sample():
     """Get sample NBA endpoint data"""
@@ -47,97 +105,197 @@ def get_nba_sample():
 
 
 # Data endpoints for Lovable frontend
+# fields= picks a comma-separated subset of columns; shape=columns returns
+# one array per field instead of one object per row.
+Shape = Literal["rows", "columns"]
+
 @app.get("/nba/games")
-def get_nba_games(limit: int = 100):
-    """Get recent NBA games"""
-    try:
-        from src.database.connection import engine
-        from src.database.models import NBAGame
-        from sqlalchemy.orm import Session
-        
-        with Session(engine) as session:
-            games = session.query(NBAGame).limit(limit).all()
-            return {"status": "success", "count": len(games), "games": [{
-                "id": g.id,
-                "date": g.date.isoformat() if g.date else None,
-                "home_team": g.home_team,
-                "away_team": g.away_team,
-                "home_score": g.home_score,
-                "away_score": g.away_score
-            } for g in games]}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+async def get_nba_games(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    team: Optional[str] = None,
+    season: Optional[int] = None,
+    order: Literal["desc", "asc"] = "desc",
+    fields: Optional[str] = None,
+    shape: Shape = "rows",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get NBA games, newest first by default, one keyset page at a time.
+    Pass next_cursor from the previous response to get the following page.
+    team matches either side of the game.
+    """
+    names = parse_fields(fields, GAME_FIELDS, DEFAULT_FIELDS["games"])
+    # The page key is always selected, ahead of the requested fields
+    stmt = select(NBAGame.date, NBAGame.game_id, *columns(GAME_FIELDS, names))
+    if start_date:
+        stmt = stmt.where(NBAGame.date >= start_date)
+    if end_date:
+        stmt = stmt.where(NBAGame.date <= end_date)
+    if season is not None:
+        stmt = stmt.where(NBAGame.season == season)
+    if team:
+        stmt = stmt.where(or_(NBAGame.home_team == team, NBAGame.away_team == team))
+    stmt = keyset_page(stmt, NBAGame.date, NBAGame.game_id, cursor, order == "desc", limit)
+    
+    async def build():
+        try:
+            rows = (await db.execute(stmt)).all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1][0], rows[-1][1])
+            return {"status": "success", "count": len(rows), "next_cursor": next_cursor,
+                    "games": shape_rows([row[2:] for row in rows], names, shape)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    return await cached_json(request, db, ("nba_games",), build)
 
 @app.get("/nba/teams")
-def get_nba_teams():
+async def get_nba_teams(request: Request, fields: Optional[str] = None, shape: Shape = "rows",
+                        db: AsyncSession = Depends(get_async_db)):
     """Get all NBA teams"""
-    try:
-        from src.database.connection import engine
-        from src.database.models import NBATeam
-        from sqlalchemy.orm import Session
-        
-        with Session(engine) as session:
-            teams = session.query(NBATeam).all()
-            return {"status": "success", "count": len(teams), "teams": [{
-                "id": t.id,
-                "name": t.name,
-                "abbreviation": t.abbreviation
-            } for t in teams]}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    names = parse_fields(fields, TEAM_FIELDS, DEFAULT_FIELDS["teams"])
+    
+    async def build():
+        try:
+            rows = (await db.execute(select(*columns(TEAM_FIELDS, names)))).all()
+            return {"status": "success", "count": len(rows), "teams": shape_rows(rows, names, shape)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    return await cached_json(request, db, ("nba_teams",), build)
 
 @app.get("/nba/players")
-def get_nba_players(limit: int = 100):
+async def get_nba_players(request: Request, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+                          fields: Optional[str] = None, shape: Shape = "rows",
+                          db: AsyncSession = Depends(get_async_db)):
     """Get NBA players"""
+    names = parse_fields(fields, PLAYER_FIELDS, DEFAULT_FIELDS["players"])
+    
+    async def build():
+        try:
+            rows = (await db.execute(select(*columns(PLAYER_FIELDS, names)).limit(limit))).all()
+            return {"status": "success", "count": len(rows), "players": shape_rows(rows, names, shape)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    return await cached_json(request, db, ("nba_players",), build)
+
+@app.get("/nba/players/{name}/gamelog")
+async def get_player_gamelog(request: Request, name: str,
+                             limit: int = Query(82, ge=1, le=MAX_PAGE_SIZE),
+                             season: Optional[int] = None,
+                             db: AsyncSession = Depends(get_async_db)):
+    """
+    A player's games, newest first, with opponent and last-5/10/20 rolling
+    averages and standard deviations for points, rebounds, assists and threes.
+    Rolling windows always look back across the player's full history, so a
+    season filter doesn't restart them.
+    """
+    log = gamelog_query([name])
+    stmt = select(log)
+    if season is not None:
+        stmt = stmt.where(log.c.season == season)
+    stmt = stmt.order_by(log.c.date.desc(), log.c.game_id.desc()).limit(limit)
+    
+    async def build():
+        try:
+            rows = (await db.execute(stmt)).mappings().all()
+            return {"status": "success", "player": name, "count": len(rows),
+                    "games": [gamelog_entry(row) for row in rows]}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    return await cached_json(request, db, ("nba_player_stats", "nba_games"), build)
+
+class Prop(BaseModel):
+    player: str
+    stat: str = Field(description="e.g. points, threes, pts+reb+ast, pra")
+    line: float
+    window: int = Field(10, ge=1, le=MAX_WINDOW, description="last N games played")
+
+class PropBatch(BaseModel):
+    props: List[Prop] = Field(max_length=2000)
+    season: Optional[int] = None
+
+@app.post("/nba/props/evaluate")
+async def evaluate_nba_props(batch: PropBatch, db: AsyncSession = Depends(get_async_db)):
+    """
+    Hit rates, averages, medians and over/under/push counts for a slate of
+    props, from one query over every player's recent games.
+    """
+    props = [prop.model_dump() for prop in batch.props]
+    for prop in props:
+        parse_stat(prop["stat"])
+    if not props:
+        return {"status": "success", "count": 0, "props": []}
+    
+    players = list(dict.fromkeys(prop["player"] for prop in props))
+    max_window = max(prop["window"] for prop in props)
     try:
-        from src.database.connection import engine
-        from sqlalchemy.orm import Session
-        from src.database.models import NBAPlayer
-        
-        with Session(engine) as session:
-            players = session.query(NBAPlayer).limit(limit).all()
-return {"status": "success", "count": len(players), "players": [{
-                "id": p.id,
-                "name": p.name,
-                "team": p.team,
-                "position": p.position
-            } for p in players]}
+        rows = (await db.execute(recent_games_query(players, max_window, batch.season))).all()
     except Exception as e:
         return {"status": "error", "message": str(e)}
+    
+    tensor = game_tensor(rows, players, max_window)
+    results = evaluate_props(props, tensor, {name: i for i, name in enumerate(players)})
+    return {"status": "success", "count": len(results), "props": results}
 
 
 @app.post("/admin/init-db")
 def init_database():
-    """Initialize database tables"""
+    """Initialize database tables, or apply pending migrations"""
     try:
-        from src.database.connection import engine
-        from src.database.models import Base
-        Base.metadata.create_all(engine)
-        return {"status": "success", "message": "Database tables created"}
+        result = upgrade_database()
+        return {"status": "success", "message": f"Database {result}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+# Scrapes run in the worker process (python -m src.workers.worker); these
+# endpoints only queue them and report progress.
+class JobRequest(BaseModel):
+    kind: str = Field(description=", ".join(JOB_KINDS))
+    params: dict = Field(default_factory=dict, description="keyword arguments for the scraper")
+    priority: int = Field(0, description="higher runs first; scheduled live refreshes use 20")
+
+def queue_job(kind: str, params: dict, priority: int = 0):
+    try:
+        with Session(engine) as db:
+            job, created = enqueue(db, kind, params, priority)
+            return {"status": "success", "created": created, "job": job_dict(job)}
+    except JobError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/admin/scrape-nba")
-def scrape_nba_data():
-    """Trigger NBA scraper for the next 4 days"""    try:    
-        from src.scrapers.nba import scrape_nba_month
-        from datetime import datetime
-        from dateutil.relativedelta import relativedelta
-    
-            # Scrape past 4 days of data
-            now = datetime.now()
-            month_map = {
-                            1: 'january', 2: 'february', 3: 'march', 4: 'april',
-                5: 'may', 6: 'june', 7: 'july', 8: 'august',
-                9: 'september', 10: 'october', 11: 'november', 12: 'december'
-            }
-    
-            for i in range(4):
-                target_date = now+- relativedelta(days=i)
-                month_slug = month_map[target_date.month]
-                target_season = target_date.year if target_date.month > 6 else target_date.year
-                scrape_nba_month(target_season, month_slug)
-    
-                return {"status": "success", "message": "NBA data scraped"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+def scrape_nba_data(days: int = Query(4, ge=1, le=31)):
+    """Queue an NBA scrape of the schedule months covering the past `days` days"""
+    return queue_job("nba_recent", {"days": days})
+
+@app.post("/admin/jobs")
+def create_job(request: JobRequest):
+    """Queue any scrape job kind; an identical queued or running job is returned instead"""
+    return queue_job(request.kind, request.params, request.priority)
+
+@app.get("/admin/jobs")
+def list_jobs(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    """Most recent jobs first"""
+    with Session(engine) as db:
+        stmt = select(ScrapeJob).order_by(ScrapeJob.id.desc()).limit(limit)
+        if status:
+            stmt = stmt.where(ScrapeJob.status == status)
+        jobs = db.execute(stmt).scalars().all()
+        return {"status": "success", "count": len(jobs), "jobs": [job_dict(job) for job in jobs]}
+
+@app.get("/admin/jobs/{job_id}")
+def get_job(job_id: int):
+    """Status, progress counters (pages fetched/parsed, rows written) and stage timings"""
+    with Session(engine) as db:
+        job = db.get(ScrapeJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {"status": "success", "job": job_dict(job)}
@@ -0,0 +1,40 @@
+"""Opaque keyset cursors for endpoints ordered by (date, id)"""
+import json
+import base64
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+MAX_PAGE_SIZE = 5000
+
+
+def encode_cursor(row_date: date, row_id: str) -> str:
+    payload = json.dumps([row_date.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Cursor -> (date, id); raises a 400 for anything we didn't hand out"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        row_date, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(row_date), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(stmt, date_column, id_column, cursor: str = None, descending: bool = True,
+                limit: int = 100):
+    """
+    Order stmt by (date, id) and start after cursor. Fetches limit + 1 rows so
+    the caller can tell whether another page exists.
+    """
+    key = tuple_(date_column, id_column)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        stmt = stmt.order_by(date_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(date_column, id_column)
+    return stmt.limit(limit + 1)
@@ -0,0 +1,58 @@
+"""Column projection and response shapes for the list endpoints"""
+from fastapi import HTTPException
+from src.database.models import NBAGame, NBAPlayer, NBATeam
+
+# Response field -> column, per resource. DEFAULT_FIELDS keeps the
+# original response layout when no fields= is given.
+GAME_FIELDS = {
+    "id": NBAGame.game_id,
+    "date": NBAGame.date,
+    "home_team": NBAGame.home_team,
+    "away_team": NBAGame.away_team,
+    "home_score": NBAGame.home_score,
+    "away_score": NBAGame.away_score,
+    "season": NBAGame.season,
+}
+TEAM_FIELDS = {
+    "id": NBATeam.id,
+    "name": NBATeam.name,
+    "abbreviation": NBATeam.abbreviation,
+}
+PLAYER_FIELDS = {
+    "id": NBAPlayer.id,
+    "name": NBAPlayer.name,
+    "team": NBAPlayer.team,
+    "position": NBAPlayer.position,
+}
+DEFAULT_FIELDS = {
+    "games": ["id", "date", "home_team", "away_team", "home_score", "away_score"],
+    "teams": ["id", "name", "abbreviation"],
+    "players": ["id", "name", "team", "position"],
+}
+
+
+def parse_fields(fields: str, available: dict, default) -> list:
+    """'id,date' -> ['id', 'date']; unknown names are a 400"""
+    if not fields:
+        return list(default)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown) or '(none)'}; available: {', '.join(available)}",
+        )
+    return names
+
+
+def columns(available: dict, names) -> list:
+    """Labelled columns for select(), so rows come back as plain tuples"""
+    return [available[name].label(name) for name in names]
+
+
+def shape_rows(rows, names, shape: str = "rows"):
+    """rows: a list of objects; columns: one array per field"""
+    if shape == "columns":
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: list(column) for name, column in zip(names, values)}
+    return [dict(zip(names, row)) for row in rows]
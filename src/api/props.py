@@ -0,0 +1,130 @@
+"""Vectorized prop hit-rate evaluation over recent player game logs"""
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import and_, func, select
+from src.database.models import NBAGame, NBAPlayerStat, Player
+
+# Stat name -> nba_player_stats column. Combos are written with '+',
+# e.g. 'points+rebounds+assists' or 'pts+reb+ast'.
+PROP_STATS = {
+    "points": NBAPlayerStat.points,
+    "rebounds": NBAPlayerStat.rebounds,
+    "assists": NBAPlayerStat.assists,
+    "threes": NBAPlayerStat.three_made,
+    "steals": NBAPlayerStat.steals,
+    "blocks": NBAPlayerStat.blocks,
+    "turnovers": NBAPlayerStat.turnovers,
+    "fg_made": NBAPlayerStat.fg_made,
+    "ft_made": NBAPlayerStat.ft_made,
+}
+STAT_ALIASES = {
+    "pts": "points", "reb": "rebounds", "ast": "assists", "3pm": "threes", "fg3": "threes",
+    "stl": "steals", "blk": "blocks", "tov": "turnovers",
+    "pra": "points+rebounds+assists", "pr": "points+rebounds", "pa": "points+assists",
+    "ra": "rebounds+assists", "stocks": "steals+blocks",
+}
+STAT_INDEX = {name: i for i, name in enumerate(PROP_STATS)}
+MAX_WINDOW = 82
+
+
+def parse_stat(stat: str) -> list:
+    """'PTS+REB+AST' -> ['points', 'rebounds', 'assists']"""
+    parts = []
+    for part in stat.lower().replace(" ", "").split("+"):
+        part = STAT_ALIASES.get(part, part)
+        parts.extend(part.split("+"))
+    unknown = [part for part in parts if part not in PROP_STATS]
+    if unknown or not parts:
+        raise HTTPException(status_code=400, detail=f"Unknown stat '{stat}'; "
+                            f"use {', '.join(PROP_STATS)} joined with '+', or {', '.join(STAT_ALIASES)}")
+    return parts
+
+
+def recent_games_query(player_names, max_window: int, season: int = None):
+    """Last max_window games played by each player, newest first, in one query"""
+    recency = func.row_number().over(
+        partition_by=NBAPlayerStat.player_id,
+        order_by=(NBAGame.date.desc(), NBAGame.game_id.desc()),
+    ).label("recency")
+    stmt = (
+        select(Player.name.label("player_name"), recency, *PROP_STATS.values())
+        .join(Player, NBAPlayerStat.player_id == Player.id)
+        .join(NBAGame, and_(NBAPlayerStat.game_id == NBAGame.game_id,
+                             NBAPlayerStat.season == NBAGame.season))
+        .where(Player.sport == "nba", Player.name.in_(player_names),
+               NBAPlayerStat.seconds_played.isnot(None))
+    )
+    if season is not None:
+        stmt = stmt.where(NBAGame.season == season)
+    ranked = stmt.subquery()
+    return select(ranked).where(ranked.c.recency <= max_window)
+
+
+def game_tensor(rows, players, max_window: int):
+    """
+    rows -> float array [player, game (newest first), stat] padded with NaN
+    where a player has fewer than max_window games.
+    """
+    index = {name: i for i, name in enumerate(players)}
+    tensor = np.full((len(players), max_window, len(PROP_STATS)), np.nan)
+    if rows:
+        data = np.array([row[2:] for row in rows], dtype=float)  # None -> nan
+        p = np.fromiter((index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+        g = np.fromiter((row[1] - 1 for row in rows), dtype=np.intp, count=len(rows))
+        tensor[p, g] = data
+    return tensor
+
+
+def evaluate_props(props, tensor, player_index) -> list:
+    """
+    props: dicts with player, stat, line, window (stat already validated).
+    Every prop is evaluated at once: each one's stat vector is the weighted
+    sum of its components over the player's games, masked to its window.
+    """
+    count = len(props)
+    max_window = tensor.shape[1]
+    weights = np.zeros((count, tensor.shape[2]))
+    for i, prop in enumerate(props):
+        for part in parse_stat(prop["stat"]):
+            weights[i, STAT_INDEX[part]] += 1
+    players = np.array([player_index[prop["player"]] for prop in props], dtype=np.intp)
+    lines = np.array([prop["line"] for prop in props], dtype=float)
+    windows = np.array([prop["window"] for prop in props])
+
+    # [prop, game, stat] weighted and summed over stats -> [prop, game].
+    # Unused stats are zeroed first so only a NaN in one of the prop's own
+    # components (or window padding) leaves the game out.
+    games = tensor[players]
+    used = weights[:, None, :] > 0
+    values = (np.where(used, games, 0.0) * weights[:, None, :]).sum(axis=2)
+    mask = (np.arange(max_window)[None, :] < windows[:, None]) & ~np.isnan(values)
+    values = np.where(mask, values, np.nan)
+
+    played = mask.sum(axis=1)
+    over = (mask & (values > lines[:, None])).sum(axis=1)
+    under = (mask & (values < lines[:, None])).sum(axis=1)
+    push = played - over - under
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average = np.nansum(values, axis=1) / played
+        hit_rate = over / played
+        medians = np.full(count, np.nan)
+        has_games = played > 0
+        if has_games.any():
+            medians[has_games] = np.nanmedian(values[has_games], axis=1)
+
+    def number(value):
+        return None if np.isnan(value) else round(float(value), 3)
+
+    return [{
+        "player": prop["player"],
+        "stat": prop["stat"],
+        "line": prop["line"],
+        "window": prop["window"],
+        "games": int(played[i]),
+        "over": int(over[i]),
+        "under": int(under[i]),
+        "push": int(push[i]),
+        "hit_rate": number(hit_rate[i]),
+        "average": number(average[i]),
+        "median": number(medians[i]),
+    } for i, prop in enumerate(props)]
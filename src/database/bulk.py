@@ -0,0 +1,340 @@
+"""Batched INSERT / upsert write path for scraped rows"""
+import time
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from src.database.changes import record_changes
+from src.database.models import DataVersion, Player
+from src.database.partitions import PARTITION_KEYS, create_partitions, unknown_partitions
+from src.metrics import COMMIT_SECONDS, ROWS_WRITTEN, log_event, sport_for_table
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Postgres caps a statement at 65535 bind parameters
+PG_MAX_PARAMS = 65535
+
+# Keys per IN (...) lookup; stays under SQLite's default variable limit
+LOOKUP_CHUNK = 900
+
+
+def existing_ids(db, column, ids) -> set:
+    """
+    Return the subset of ids already stored in column, using one
+    IN (...) query per LOOKUP_CHUNK candidates instead of one per id.
+    db is a Session or Connection.
+    """
+    ids = list(dict.fromkeys(ids))
+    found = set()
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        chunk = ids[start:start + LOOKUP_CHUNK]
+        found.update(db.execute(select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+def _conflict_clause(stmt, table, update_columns, key_columns=None):
+    if update_columns:
+        return stmt.on_conflict_do_update(
+            index_elements=list(key_columns or [c.name for c in table.primary_key.columns]),
+            set_={name: stmt.excluded[name] for name in update_columns},
+            # Rows that come back unchanged are left alone: no dead tuple, no change_log entry
+            where=or_(*[table.c[name].is_distinct_from(stmt.excluded[name]) for name in update_columns]),
+        )
+    return stmt.on_conflict_do_nothing()
+
+
+def insert_rows(conn, model, rows, update_columns=None, key_columns=None, written_keys=None) -> int:
+    """
+    Write plain dict rows for model in as few statements as possible.
+    Rows whose primary key already exists are skipped, or have
+    update_columns overwritten when given. key_columns names a unique index
+    to match existing rows on instead of the primary key, for tables keyed
+    by a surrogate id. Returns the number of rows written.
+    written_keys, when a list, receives the primary key tuple of every row
+    actually inserted or changed.
+    Postgres gets multi-row INSERT ... ON CONFLICT statements; SQLite and
+    other dialects fall back to a single executemany.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+    columns = [c.name for c in table.columns if any(c.name in row for row in rows)]
+    rows = [{name: row.get(name) for name in columns} for row in rows]
+    if update_columns:
+        # Never overwrite a stored value with a column these rows don't carry
+        update_columns = [name for name in update_columns if name in columns]
+    returning = list(table.primary_key.columns) if written_keys is not None else None
+
+    dialect = conn.dialect.name
+    if dialect == 'postgresql':
+        written = 0
+        per_statement = max(1, PG_MAX_PARAMS // len(columns))
+        for start in range(0, len(rows), per_statement):
+            stmt = postgresql.insert(table).values(rows[start:start + per_statement])
+            stmt = _conflict_clause(stmt, table, update_columns, key_columns)
+            if returning:
+                keys = conn.execute(stmt.returning(*returning)).all()
+                written_keys.extend(tuple(key) for key in keys)
+                written += len(keys)
+            else:
+                written += conn.execute(stmt).rowcount
+        return written
+    if dialect == 'sqlite':
+        stmt = _conflict_clause(sqlite.insert(table), table, update_columns, key_columns)
+        if returning:
+            keys = conn.execute(stmt.returning(*returning), rows).all()
+            written_keys.extend(tuple(key) for key in keys)
+            return len(keys)
+        result = conn.execute(stmt, rows)
+    else:
+        result = conn.execute(insert(table), rows)
+        if returning:
+            written_keys.extend(tuple(row.get(c.name) for c in returning) for row in rows)
+    return result.rowcount if result.rowcount >= 0 else len(rows)
+
+
+def resolve_player_ids(conn, sport: str, names, cache: dict = None) -> dict:
+    """
+    Map player names to players.id for sport, inserting names seen for the
+    first time. cache (name -> id) is consulted first and filled in.
+    """
+    cache = {} if cache is None else cache
+    missing = [name for name in dict.fromkeys(names) if name is not None and name not in cache]
+    if not missing:
+        return cache
+    table = Player.__table__
+
+    def lookup(chunk):
+        found = conn.execute(select(table.c.name, table.c.id)
+                             .where(table.c.sport == sport, table.c.name.in_(chunk)))
+        cache.update(found.all())
+
+    for start in range(0, len(missing), LOOKUP_CHUNK):
+        chunk = missing[start:start + LOOKUP_CHUNK]
+        lookup(chunk)
+        new = [{'sport': sport, 'name': name} for name in chunk if name not in cache]
+        if new:
+            # DO NOTHING covers a concurrent writer adding the same name first
+            insert_rows(conn, Player, new)
+            lookup([row['name'] for row in new])
+    return cache
+
+
+def bump_versions(conn, tables):
+    """Increment data_versions for tables so API caches built from them go stale"""
+    table = DataVersion.__table__
+    dialect = conn.dialect.name
+    for name in tables:
+        if dialect in ('postgresql', 'sqlite'):
+            module = postgresql if dialect == 'postgresql' else sqlite
+            stmt = module.insert(table).values(name=name, version=1)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=['name'],
+                set_={'version': table.c.version + 1, 'updated_at': func.now()},
+            ))
+        else:
+            result = conn.execute(update(table).where(table.c.name == name).values(
+                version=table.c.version + 1, updated_at=func.now()))
+            if result.rowcount == 0:
+                conn.execute(insert(table).values(name=name, version=1))
+
+
+def _items(pending):
+    for key, rows in pending.items():
+        for row in rows:
+            yield key, row
+
+
+def _row_count(pending) -> int:
+    return sum(len(rows) for rows in pending.values())
+
+
+class BulkWriter:
+    """
+    Buffers rows per table across many games and writes them in batches.
+    bind is an Engine (each flush runs in its own transaction) or a Session
+    (each flush commits it). Tables are flushed in the order they were first
+    added to, so add parent rows (games) before their child rows (stats).
+    A batch some rows of which the database rejects is rewritten in halves
+    until only the rejected rows are left out; any other failure puts the
+    batch back in the buffer and re-raises.
+    key_column (e.g. NBAGame.game_id) collects the values of that column
+    for rows that were committed in committed_keys, so callers can tell
+    which pages actually reached the database.
+
+        with BulkWriter(engine) as writer:
+            writer.add(NBAGame, game)
+            writer.add_many(NBAPlayerStat, player_stats)
+    """
+
+    def __init__(self, bind, batch_size: int = DEFAULT_BATCH_SIZE, key_column=None):
+        self.bind = bind
+        self.key_column = key_column
+        self.committed_keys = set()
+        self.batch_size = batch_size
+        self.pending = {}
+        self.pending_count = 0
+        self.rows_written = {}
+        self.player_ids = {}  # sport -> {name: id}
+
+    def add(self, model, row: dict, update_columns=None, key_columns=None):
+        """
+        Queue one row; update_columns turns the insert into an upsert, matched
+        on key_columns (a unique index) when given, else the primary key
+        """
+        key = (model, tuple(update_columns) if update_columns else None,
+               tuple(key_columns) if key_columns else None)
+        self.pending.setdefault(key, []).append(row)
+        self.pending_count += 1
+        if self.pending_count >= self.batch_size:
+            self.flush()
+
+    def add_many(self, model, rows, update_columns=None, key_columns=None):
+        for row in rows:
+            self.add(model, row, update_columns, key_columns)
+
+    def flush(self):
+        """Write every queued row in one transaction"""
+        if not self.pending:
+            return
+        pending, self.pending, self.pending_count = self.pending, {}, 0
+
+        started = time.perf_counter()
+        try:
+            self._create_partitions(pending)
+            written = self._commit(pending)
+        except (IntegrityError, DataError) as e:
+            log_event("db.flush_error", rows=_row_count(pending), error=str(e.orig))
+            try:
+                written = self._commit_halves(list(_items(pending)), e)
+            except Exception:
+                # Rows a half already committed are skipped as conflicts next time
+                self._restore(pending)
+                raise
+        except Exception:
+            self._restore(pending)
+            raise
+        seconds = time.perf_counter() - started
+
+        for table, count in written.items():
+            self.rows_written[table] = self.rows_written.get(table, 0) + count
+            ROWS_WRITTEN.observe(count, sport=sport_for_table(table), table=table)
+        # Tables of one flush belong to one scraper; label by the first
+        sport = sport_for_table(next(iter(pending))[0].__tablename__)
+        COMMIT_SECONDS.observe(seconds, sport=sport)
+        log_event("db.flush", sport=sport, seconds=seconds, rows=sum(written.values()),
+                  tables=",".join(written))
+
+    def _commit(self, pending) -> dict:
+        """Write pending in one transaction; returns rows written per table"""
+        try:
+            if isinstance(self.bind, Session):
+                try:
+                    written, changed = self._write(self.bind.connection(), pending)
+                    self.bind.commit()
+                except Exception:
+                    self.bind.rollback()
+                    raise
+            else:
+                with self.bind.begin() as conn:
+                    written, changed = self._write(conn, pending)
+        except Exception:
+            # Players inserted by the failed transaction were rolled back too
+            self.player_ids.clear()
+            raise
+        self._record_keys(changed)
+        return written
+
+    def _record_keys(self, changed):
+        if self.key_column is None:
+            return
+        table = self.key_column.table
+        position = [c.name for c in table.primary_key.columns].index(self.key_column.name)
+        self.committed_keys.update(key[position] for key in changed.get(table.name, []))
+
+    def _commit_apart(self, items) -> dict:
+        """Write (key, row) items in one transaction, or in halves if it's rejected"""
+        batch = {}
+        for key, row in items:
+            batch.setdefault(key, []).append(row)
+        try:
+            return self._commit(batch)
+        except (IntegrityError, DataError) as e:
+            return self._commit_halves(items, e)
+
+    def _commit_halves(self, items, error) -> dict:
+        """
+        Write the items of a rejected batch as two halves, each in its own
+        transaction and split again if rejected, so one bad row only costs
+        itself (and rows that reference it). Items stay in flush order, so
+        parents still commit before their children.
+        """
+        if len(items) == 1:
+            log_event("db.row_dropped", table=items[0][0][0].__tablename__, error=str(error.orig))
+            return {}
+        middle = len(items) // 2
+        written = self._commit_apart(items[:middle])
+        for table, count in self._commit_apart(items[middle:]).items():
+            written[table] = written.get(table, 0) + count
+        return written
+
+    def _restore(self, pending):
+        """Put a batch that failed to write back ahead of anything queued since"""
+        for key, rows in self.pending.items():
+            pending.setdefault(key, []).extend(rows)
+        self.pending = pending
+        self.pending_count = _row_count(pending)
+
+    def _create_partitions(self, pending):
+        """
+        Partitions for new seasons, committed on their own before the batch's
+        transaction starts so their DDL lock isn't held for the whole write
+        """
+        wanted = {}
+        for (model, _, _), rows in pending.items():
+            column = PARTITION_KEYS.get(model.__tablename__)
+            if column:
+                wanted.setdefault(model.__tablename__, set()).update(row.get(column) for row in rows)
+        engine = self.bind.get_bind() if isinstance(self.bind, Session) else self.bind
+        if engine.dialect.name != 'postgresql' or not unknown_partitions(wanted):
+            return
+        if isinstance(self.bind, Session):
+            # End the session's transaction first: locks it holds on the parent
+            # tables would block the DDL on the other connection
+            self.bind.commit()
+        create_partitions(engine, wanted)
+
+    def _write(self, conn, pending):
+        written, changed = {}, {}
+        for (model, update_columns, key_columns), rows in pending.items():
+            table = model.__tablename__
+            rows = self._resolve_players(conn, model, rows)
+            written[table] = written.get(table, 0) + insert_rows(
+                conn, model, rows, update_columns, key_columns, changed.setdefault(table, []))
+        # Same transaction, so readers never see new rows under an old version
+        bump_versions(conn, [table for table, count in written.items() if count])
+        record_changes(conn, changed)
+        return written, changed
+
+    def _resolve_players(self, conn, model, rows):
+        """player_name -> player_id for stat tables keyed by the players dimension"""
+        if 'player_id' not in model.__table__.c or not any('player_name' in row for row in rows):
+            return rows
+        sport = sport_for_table(model.__tablename__)
+        ids = resolve_player_ids(conn, sport, (row.get('player_name') for row in rows),
+                                 self.player_ids.setdefault(sport, {}))
+        resolved = []
+        for row in rows:
+            row = dict(row)
+            name = row.pop('player_name', None)
+            if 'player_id' not in row:
+                row['player_id'] = ids.get(name)
+            resolved.append(row)
+        return resolved
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
@@ -0,0 +1,34 @@
+"""
+change_log: one row per game / stat row a BulkWriter flush inserted or
+changed, numbered by change_log.seq. The seq is the cursor of the API's
+change feed (src/api/changes.py).
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, insert, text
+from src.database.models import ChangeLog
+
+CHANGE_LOG_RETENTION_DAYS = float(os.environ.get("CHANGE_LOG_RETENTION_DAYS", "7"))
+
+
+def record_changes(conn, changed: dict):
+    """
+    Log {table: [primary key tuples]} in the writer's transaction. On
+    Postgres writers take turns from here to commit, so seqs become visible
+    in order and a reader at cursor N never later finds a smaller seq.
+    """
+    rows = [{"table_name": table, "row_key": list(key)}
+            for table, keys in changed.items() for key in dict.fromkeys(keys)]
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('change_log'))"))
+    conn.execute(insert(ChangeLog.__table__), rows)
+
+
+def prune_change_log(db, days: float = CHANGE_LOG_RETENTION_DAYS) -> int:
+    """Delete entries older than days; cursors behind them get a 410 from /changes"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    result = db.execute(delete(ChangeLog).where(ChangeLog.created_at < cutoff))
+    db.commit()
+    return result.rowcount
@@ -1,5 +1,6 @@
 """Database connection and session management"""
 import os
+from functools import lru_cache
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -10,10 +11,61 @@ DATABASE_URL = os.environ.get("DATABASE_URL")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Connections per process: pool_size kept open, up to max_overflow more under
+# load. Railway's hobby Postgres allows ~100 connections across all services.
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+# Sync driver -> asyncio driver used by the API's read endpoints
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def pool_options(url: str) -> dict:
+    """Explicit pool sizing; SQLite keeps SQLAlchemy's defaults"""
+    if url and url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+    }
+
+
+def async_url(url: str) -> str:
+    """postgresql://... -> postgresql+asyncpg://..."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, **pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+@lru_cache(maxsize=None)
+def get_async_engine():
+    """
+    Async engine for the API, created on first use so scrapers and scripts
+    that only need the sync engine don't require the asyncio driver.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    url = async_url(DATABASE_URL)
+    return create_async_engine(url, pool_pre_ping=True, **pool_options(url))
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False, autoflush=False)
+
+
 def get_db():
     """Dependency for FastAPI"""
     db = SessionLocal()
@@ -21,3 +73,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async dependency for FastAPI; one AsyncSession per request"""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,79 @@
+"""Alembic helpers shared by init_db.py and the migration scripts"""
+import os
+from sqlalchemy import inspect
+from src.database.connection import engine
+from src.database.models import Base
+from src.database.partitions import is_partitioned, partitions
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+BASELINE_REVISION = "001"
+
+
+def alembic_config():
+    from alembic.config import Config
+    config = Config(os.path.abspath(ALEMBIC_INI))
+    config.set_main_option("script_location", os.path.abspath(
+        os.path.join(os.path.dirname(ALEMBIC_INI), "alembic")))
+    return config
+
+
+def upgrade_database():
+    """
+    Bring the database to the latest schema.
+    Empty databases are built from the models and stamped at head; databases
+    made by create_all before migrations existed are stamped at the baseline
+    first; anything else just runs the pending migrations.
+    """
+    from alembic import command
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables:
+        if not tables & set(Base.metadata.tables):
+            Base.metadata.create_all(engine)
+            command.stamp(config, "head")
+            return "created"
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+    return "upgraded"
+
+
+def create_indexes(op, table: str, indexes, unique: bool = False):
+    """
+    Create (name, columns) indexes if missing. On Postgres they are built
+    CONCURRENTLY so large tables stay writable while the migration runs.
+    """
+    if op.get_bind().dialect.name == "postgresql":
+        if is_partitioned(op.get_bind(), table):
+            for name, columns in indexes:
+                _create_partitioned_index(op, table, name, columns, unique)
+            return
+        with op.get_context().autocommit_block():
+            for name, columns in indexes:
+                op.create_index(name, table, columns, unique=unique, if_not_exists=True,
+                                postgresql_concurrently=True)
+    else:
+        for name, columns in indexes:
+            op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+
+
+def _create_partitioned_index(op, table: str, name: str, columns, unique: bool):
+    """
+    Postgres can't build an index on a partitioned table CONCURRENTLY: create
+    it on the parent only, build each partition's copy concurrently, then
+    attach them. Partitions created later inherit the index.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    column_list = ", ".join(columns)
+    op.execute(f"CREATE {kind} IF NOT EXISTS {name} ON ONLY {table} ({column_list})")
+    children = partitions(op.get_bind(), table)
+    with op.get_context().autocommit_block():
+        for value, partition in children.items():
+            op.execute(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name}_{value} "
+                       f"ON {partition} ({column_list})")
+    for value in children:
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {name}_{value}")
+
+
+def drop_indexes(op, table: str, indexes):
+    for name, _ in indexes:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,12 +1,91 @@
 """Database models for sports betting scrapers"""
 
-from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, func
+from sqlalchemy import (
+    BigInteger, Column, Integer, String, Text, Date, DateTime, Float, ForeignKey,
+    ForeignKeyConstraint, Index, JSON, PrimaryKeyConstraint, func
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
 
+class DataVersion(Base):
+    """Per-table write counter, bumped by BulkWriter; the API's response cache keys on it"""
+    __tablename__ = "data_versions"
+    
+    name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ChangeLog(Base):
+    """Rows BulkWriter inserted or changed, in commit order; seq is the /changes cursor"""
+    __tablename__ = "change_log"
+    
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    table_name = Column(String(50), nullable=False)
+    row_key = Column(JSON, nullable=False)  # primary key values, in column order
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Retention pruning deletes by age
+    __table_args__ = (
+        Index("ix_change_log_created_at", "created_at"),
+    )
+
+
+class ScrapeJob(Base):
+    """Queued scrape work: enqueued by the API, run by src/workers/worker.py"""
+    __tablename__ = "scrape_jobs"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    # kind plus canonical params; one active job per key
+    dedup_key = Column(String(255), nullable=False)
+    priority = Column(Integer, nullable=False, default=0)  # higher runs first
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(String(100))
+    # Progress counters, refreshed on every heartbeat while running
+    pages_fetched = Column(Integer, nullable=False, default=0)
+    pages_parsed = Column(Integer, nullable=False, default=0)
+    rows_written = Column(Integer, nullable=False, default=0)
+    timings = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    
+    # Workers claim the highest-priority, oldest queued job; the scheduler
+    # looks up the latest job per dedup_key
+    __table_args__ = (
+        Index("ix_scrape_jobs_status_priority_id", "status", "priority", "id"),
+        Index("ix_scrape_jobs_dedup_key_id", "dedup_key", "id"),
+    )
+
+
+class Player(Base):
+    """
+    Player dimension shared by every sport's stat table. Scrapers emit
+    player_name; BulkWriter resolves it to player_id (creating the row on
+    first sight), so stat rows carry a 4-byte key instead of the name.
+    """
+    __tablename__ = "players"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sport = Column(String(10), nullable=False)
+    name = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("uq_players_sport_name", "sport", "name", unique=True),
+    )
+
+
 # NBA Tables
+# Games and player lines are LIST-partitioned by season on Postgres (see
+# src/database/partitions.py), so the season is part of both primary keys.
 class NBAGame(Base):
     __tablename__ = "nba_games"
     
@@ -16,8 +95,17 @@ class NBAGame(Base):
     away_team = Column(String(50))
     home_score = Column(Integer)
     away_score = Column(Integer)
-    season = Column(Integer)
+    season = Column(Integer, primary_key=True)
     scraped_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Keyset pagination orders by (date, game_id) after any of these filters
+    __table_args__ = (
+        Index("ix_nba_games_date_game_id", "date", "game_id"),
+        Index("ix_nba_games_season_date_game_id", "season", "date", "game_id"),
+        Index("ix_nba_games_home_team_date_game_id", "home_team", "date", "game_id"),
+        Index("ix_nba_games_away_team_date_game_id", "away_team", "date", "game_id"),
+        {"postgresql_partition_by": "LIST (season)"},
+    )
 
 class NBATeam(Base):
     __tablename__ = "nba_teams"
@@ -41,11 +129,11 @@ class NBAPlayer(Base):
 class NBAPlayerStat(Base):
     __tablename__ = "nba_player_stats"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    game_id = Column(String(20), ForeignKey("nba_games.game_id"))
-    player_name = Column(String(100))
+    game_id = Column(String(20), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    season = Column(Integer, nullable=False)  # the game's season; partition key
     team = Column(String(50))
-    minutes = Column(String(10))
+    seconds_played = Column(Integer)  # NULL when the player didn't play
     points = Column(Integer)
     rebounds = Column(Integer)
     assists = Column(Integer)
@@ -58,6 +146,16 @@ class NBAPlayerStat(Base):
     three_attempted = Column(Integer)
     ft_made = Column(Integer)
     ft_attempted = Column(Integer)
+    
+    # Player game logs and props look rows up by player, then join to
+    # nba_games; the primary key serves per-game reads and is the upsert key
+    # for box-score refreshes
+    __table_args__ = (
+        PrimaryKeyConstraint("game_id", "player_id", "season"),
+        ForeignKeyConstraint(["game_id", "season"], ["nba_games.game_id", "nba_games.season"]),
+        Index("ix_nba_player_stats_player_id_game_id", "player_id", "game_id"),
+        {"postgresql_partition_by": "LIST (season)"},
+    )
 
 
 # NFL Tables
@@ -80,7 +178,7 @@ class NFLPlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     game_id = Column(String(20), ForeignKey("nfl_games.game_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(50))
     position = Column(String(10))
     pass_attempts = Column(Integer)
@@ -95,6 +193,57 @@ class NFLPlayerStat(Base):
     receiving_yards = Column(Integer)
     receiving_touchdowns = Column(Integer)
     targets = Column(Integer)
+    
+    __table_args__ = (
+        Index("ix_nfl_player_stats_game_id", "game_id"),
+        Index("ix_nfl_player_stats_player_id_game_id", "player_id", "game_id"),
+    )
+
+
+# CFB Tables
+class CFBGame(Base):
+    __tablename__ = "cfb_games"
+    
+    game_id = Column(String(100), primary_key=True)
+    date = Column(Date, nullable=False)
+    year = Column(Integer)
+    week = Column(Integer)
+    home_team = Column(String(100))
+    away_team = Column(String(100))
+    home_score = Column(Integer)
+    away_score = Column(Integer)
+    winner = Column(String(100))
+    scraped_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CFBPlayerStat(Base):
+    __tablename__ = "cfb_player_stats"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    game_id = Column(String(100), ForeignKey("cfb_games.game_id"))
+    player_id = Column(Integer, ForeignKey("players.id"))
+    team = Column(String(100))
+    stat_type = Column(String(20))
+    pass_cmp = Column(Integer)
+    pass_att = Column(Integer)
+    pass_yds = Column(Integer)
+    pass_td = Column(Integer)
+    pass_int = Column(Integer)
+    rush_att = Column(Integer)
+    rush_yds = Column(Integer)
+    rush_td = Column(Integer)
+    rec_tgt = Column(Integer)
+    rec_rec = Column(Integer)
+    rec_yds = Column(Integer)
+    rec_td = Column(Integer)
+    def_tackles = Column(Integer)
+    def_sacks = Column(Float)
+    def_int = Column(Integer)
+    
+    __table_args__ = (
+        Index("ix_cfb_player_stats_game_id", "game_id"),
+        Index("ix_cfb_player_stats_player_id_game_id", "player_id", "game_id"),
+    )
 
 
 # NHL Tables
@@ -116,7 +265,7 @@ class NHLPlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     game_id = Column(String(20), ForeignKey("nhl_games.game_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(50))
     position = Column(String(10))
     goals = Column(Integer)
@@ -125,7 +274,12 @@ class NHLPlayerStat(Base):
     plus_minus = Column(Integer)
     pim = Column(Integer)
     shots = Column(Integer)
-    time_on_ice = Column(String(10))
+    toi_seconds = Column(Integer)
+    
+    __table_args__ = (
+        Index("ix_nhl_player_stats_game_id", "game_id"),
+        Index("ix_nhl_player_stats_player_id_game_id", "player_id", "game_id"),
+    )
 
 
 # Soccer Tables  
@@ -148,7 +302,7 @@ class SoccerPlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(String(20), ForeignKey("soccer_matches.match_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(100))
     position = Column(String(20))
     goals = Column(Integer)
@@ -159,6 +313,11 @@ class SoccerPlayerStat(Base):
     xa = Column(Float)
     passes_completed = Column(Integer)
     passes_attempted = Column(Integer)
+    
+    __table_args__ = (
+        Index("ix_soccer_player_stats_match_id", "match_id"),
+        Index("ix_soccer_player_stats_player_id_match_id", "player_id", "match_id"),
+    )
 
 
 # LoL Tables
@@ -181,7 +340,7 @@ class LoLPlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(String(50), ForeignKey("lol_matches.match_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(100))
     champion = Column(String(50))
     role = Column(String(20))
@@ -191,6 +350,11 @@ class LoLPlayerStat(Base):
     cs = Column(Integer)
     gold = Column(Integer)
     damage_dealt = Column(Integer)
+    
+    __table_args__ = (
+        Index("ix_lol_player_stats_match_id", "match_id"),
+        Index("ix_lol_player_stats_player_id_match_id", "player_id", "match_id"),
+    )
 
 
 # CS2 Tables
@@ -212,13 +376,18 @@ class CS2PlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(String(50), ForeignKey("cs2_matches.match_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(100))
     kills = Column(Integer)
     deaths = Column(Integer)
     assists = Column(Integer)
     adr = Column(Float)
     rating = Column(Float)
+    
+    __table_args__ = (
+        Index("ix_cs2_player_stats_match_id", "match_id"),
+        Index("ix_cs2_player_stats_player_id_match_id", "player_id", "match_id"),
+    )
 
 
 # Dota2 Tables
@@ -240,7 +409,7 @@ class Dota2PlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(String(50), ForeignKey("dota2_matches.match_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(100))
     hero = Column(String(50))
     role = Column(String(20))
@@ -249,6 +418,11 @@ class Dota2PlayerStat(Base):
     assists = Column(Integer)
     net_worth = Column(Integer)
     hero_damage = Column(Integer)
+    
+    __table_args__ = (
+        Index("ix_dota2_player_stats_match_id", "match_id"),
+        Index("ix_dota2_player_stats_player_id_match_id", "player_id", "match_id"),
+    )
 
 
 # CoD Tables
@@ -271,10 +445,15 @@ class CoDPlayerStat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(String(50), ForeignKey("cod_matches.match_id"))
-    player_name = Column(String(100))
+    player_id = Column(Integer, ForeignKey("players.id"))
     team = Column(String(100))
     kills = Column(Integer)
     deaths = Column(Integer)
     assists = Column(Integer)
     damage = Column(Integer)
     kd_ratio = Column(Float)
+    
+    __table_args__ = (
+        Index("ix_cod_player_stats_match_id", "match_id"),
+        Index("ix_cod_player_stats_player_id_match_id", "player_id", "match_id"),
+    )
@@ -0,0 +1,112 @@
+"""
+Postgres LIST partitions by season.
+
+Tables declare postgresql_partition_by="LIST (<column>)" in models.py and
+get one partition per value, named <table>_<value> (nba_games_2026).
+BulkWriter calls create_partitions before each flush, so the first rows of a
+new season create its partitions. Other dialects ignore all of this and keep
+plain tables.
+"""
+import re
+from sqlalchemy import text
+from src.database.models import Base
+from src.metrics import log_event
+
+_PARTITION_BY = re.compile(r"LIST \((\w+)\)")
+
+
+def partition_column(table):
+    """Partition key column of a Table, or None if it isn't partitioned"""
+    match = _PARTITION_BY.fullmatch(table.dialect_options["postgresql"].get("partition_by") or "")
+    return match.group(1) if match else None
+
+
+# table name -> partition key column
+PARTITION_KEYS = {
+    table.name: partition_column(table)
+    for table in Base.metadata.sorted_tables if partition_column(table)
+}
+
+# Partition values seen in the catalog, per table
+_known = {}
+
+
+def forget_partitions():
+    """Drop cached partition lookups, e.g. after the tables were dropped and recreated"""
+    _known.clear()
+
+
+def partition_name(table: str, value: int) -> str:
+    return f"{table}_{int(value)}"
+
+
+def partitions(conn, table: str) -> dict:
+    """{value: partition name} of table's existing partitions"""
+    rows = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"), {"table": table}).scalars()
+    prefix = f"{table}_"
+    return {int(name[len(prefix):]): name for name in rows
+            if name.startswith(prefix) and name[len(prefix):].isdigit()}
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(text("SELECT relkind FROM pg_class WHERE relname = :table"),
+                        {"table": table}).scalar() == "p"
+
+
+def create_partition(conn, table: str, value: int):
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {partition_name(table, value)} "
+                      f"PARTITION OF {table} FOR VALUES IN ({int(value)})"))
+
+
+def unknown_partitions(wanted: dict) -> dict:
+    """{table: key values} -> the tables and values not yet known to have a partition"""
+    unknown = {}
+    for table, values in wanted.items():
+        values = {int(value) for value in values if value is not None}
+        if table in PARTITION_KEYS and not values <= _known.get(table, set()):
+            unknown[table] = values
+    return unknown
+
+
+def create_partitions(engine, wanted: dict):
+    """
+    Create the partitions that rows with these {table: key values} need, in a
+    short transaction of its own. CREATE TABLE ... PARTITION OF locks the
+    parent table until commit, so it must not share a transaction with a
+    long bulk write. Only connects when a value isn't known yet.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    unknown = unknown_partitions(wanted)
+    if not unknown:
+        return
+    with engine.begin() as conn:
+        for table, values in unknown.items():
+            ensure_partitions(conn, table, values)
+
+
+def ensure_partitions(conn, table: str, values) -> list:
+    """
+    Create the partitions rows with these key values need, inside conn's
+    transaction. Catalog lookups are cached, so rows for seasons already
+    seen cost nothing. Returns the values created.
+    """
+    if conn.dialect.name != "postgresql" or table not in PARTITION_KEYS:
+        return []
+    wanted = {int(value) for value in values if value is not None}
+    known = _known.setdefault(table, set())
+    if wanted <= known:
+        return []
+    known.update(partitions(conn, table))
+    missing = sorted(wanted - known)
+    if missing:
+        # Serialize with other writers creating the same season
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": table})
+        for value in missing:
+            create_partition(conn, table, value)
+            log_event("db.partition", table=table, value=value)
+    return missing
@@ -0,0 +1,192 @@
+"""
+In-process timing metrics and structured log lines for scrapers and the API.
+
+Histograms are exposed in Prometheus text format: the API's /metrics
+endpoint serves the api_* series, and scrapers run in the worker process,
+so the scraper_* series are served by the worker itself on
+WORKER_METRICS_PORT (src/workers/worker.py). Every observation worth a histogram is also written as one
+logfmt line (key=value pairs) so runs outside the API process can be
+broken down the same way from their logs. STRUCTURED_LOGS=0 silences
+the log lines; histograms are always kept.
+"""
+import os
+import re
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+ROWS_BUCKETS = (1, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000)
+
+LOG_ENABLED = os.environ.get("STRUCTURED_LOGS", "1") != "0"
+
+# URL pattern -> sport label for fetch and parse metrics
+SPORT_URLS = [
+    (re.compile(r"basketball-reference\.com"), "nba"),
+    (re.compile(r"sports-reference\.com/cfb"), "cfb"),
+    (re.compile(r"pro-football-reference\.com"), "nfl"),
+    (re.compile(r"hockey-reference\.com"), "nhl"),
+    (re.compile(r"gol\.gg"), "lol"),
+]
+
+_registry = []
+
+
+class Histogram:
+    """Cumulative bucket histogram keyed by label values"""
+
+    def __init__(self, name: str, help_text: str, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def _matching(self, labels):
+        return [
+            series for key, series in self._series.items()
+            if all(key[self.labels.index(name)] == str(value) for name, value in labels.items())
+        ]
+
+    def total(self, **labels) -> float:
+        """Sum of observed values across series matching labels"""
+        with self._lock:
+            return sum(series["sum"] for series in self._matching(labels))
+
+    def count(self, **labels) -> int:
+        """Number of observations across series matching labels"""
+        with self._lock:
+            return sum(series["count"] for series in self._matching(labels))
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key)]
+                bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+                counts = series["counts"] + [series["count"]]
+                for bound, count in zip(bounds, counts):
+                    labels = ",".join(pairs + [f'le="{bound}"'])
+                    lines.append(f"{self.name}_bucket{{{labels}}} {count}")
+                labels = "{" + ",".join(pairs) + "}" if pairs else ""
+                lines.append(f"{self.name}_sum{labels} {series['sum']}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+FETCH_SECONDS = Histogram(
+    "scraper_fetch_seconds", "Page fetch latency, including cache lookups and throttling",
+    ["sport", "source"])
+THROTTLE_SECONDS = Histogram(
+    "scraper_throttle_seconds", "Time spent waiting on the per-host rate limiter", ["sport"])
+FETCH_BYTES = Histogram(
+    "scraper_fetch_bytes", "Page body size", ["sport", "source"], BYTES_BUCKETS)
+PARSE_SECONDS = Histogram(
+    "scraper_parse_seconds", "Time to turn one page into rows", ["sport"])
+ROWS_WRITTEN = Histogram(
+    "scraper_rows_written", "Rows written per flush", ["sport", "table"], ROWS_BUCKETS)
+COMMIT_SECONDS = Histogram(
+    "scraper_commit_seconds", "Time to write and commit one flush", ["sport"])
+REQUEST_SECONDS = Histogram(
+    "api_request_seconds", "API request latency", ["method", "route", "status"])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(prefix: str = "") -> str:
+    """Metrics whose name starts with prefix (all by default) in Prometheus text exposition format"""
+    lines = []
+    for histogram in _registry:
+        if histogram.name.startswith(prefix):
+            lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def sport_for_url(url: str) -> str:
+    for pattern, sport in SPORT_URLS:
+        if pattern.search(url):
+            return sport
+    return "other"
+
+
+def sport_for_table(table: str) -> str:
+    """'nba_player_stats' -> 'nba'"""
+    return table.split("_", 1)[0]
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        value = f"{value:.4f}"
+    text = str(value)
+    if not text or any(c in text for c in ' ="'):
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return text
+
+
+def log_event(event: str, **fields):
+    """Write one logfmt line, e.g. ts=... event=fetch sport=nba seconds=0.2310"""
+    if not LOG_ENABLED:
+        return
+    parts = [f"ts={datetime.now(timezone.utc).isoformat(timespec='milliseconds')}", f"event={event}"]
+    parts.extend(f"{key}={_format_value(value)}" for key, value in fields.items() if value is not None)
+    print(" ".join(parts), flush=True)
+
+
+@contextmanager
+def timed(histogram: Histogram, event: str = None, **fields):
+    """
+    Observe the duration of the with-block on histogram, labelled by the
+    matching fields, and log it as event with all fields when given.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        histogram.observe(seconds, **{name: fields.get(name, "") for name in histogram.labels})
+        if event:
+            log_event(event, **fields, seconds=seconds)
+
+
+def stage_totals(sport: str) -> dict:
+    """Seconds spent so far in this process per scrape stage for sport"""
+    return {
+        "fetch_seconds": FETCH_SECONDS.total(sport=sport),
+        "throttle_seconds": THROTTLE_SECONDS.total(sport=sport),
+        "parse_seconds": PARSE_SECONDS.total(sport=sport),
+        "commit_seconds": COMMIT_SECONDS.total(sport=sport),
+    }
+
+
+@contextmanager
+def scrape_run(sport: str, event: str, **fields):
+    """
+    Log one summary line for a scrape run: wall time plus how much of it
+    went to fetching, parsing and committing.
+    """
+    before = stage_totals(sport)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        after = stage_totals(sport)
+        log_event(event, sport=sport, **fields, seconds=time.perf_counter() - started,
+                  **{stage: after[stage] - before[stage] for stage in after})
@@ -1,17 +1,67 @@
 """College Football scraper using Pro-Football-Reference"""
 import re
-import time
-import requests
 import pandas as pd
 from bs4 import BeautifulSoup
+from io import StringIO
 from datetime import datetime
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.database.connection import engine
 from src.database.models import CFBGame, CFBPlayerStat
+from src.database.bulk import BulkWriter, existing_ids
+from src.scrapers.columns import COLUMN_MAPS, frame_to_records, to_records, type_columns
+from src.scrapers.core import Discovery, SportAdapter, scrape
+from src.scrapers.http_cache import fetch
+from src.scrapers.pipeline import DEFAULT_MAX_IN_FLIGHT, DEFAULT_PARSE_WORKERS
+from src.metrics import PARSE_SECONDS, log_event, scrape_run, timed
 
 PFR_BASE = "https://www.pro-football-reference.com"
 CFB_BASE = "https://www.sports-reference.com/cfb"
 
+# Filled in on a stored game once the schedule shows its result
+SCORE_COLUMNS = ['home_score', 'away_score', 'winner']
+
+# Schedule column names on older pages -> current names
+SCHEDULE_ALIASES = {'W': 'Winner', 'PtsW': 'Pts', 'L': 'Loser', 'PtsL': 'Pts.1'}
+
+def parse_cfb_week(html, year: int, week: int):
+    """
+    Schedule page -> CFBGame rows for one week, or None when the page has
+    no schedule table. The winner is the away team when Notes has an '@'.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    schedule_table = soup.find('table', {'id': 'schedule'})
+    if not schedule_table:
+        return None
+    df = pd.read_html(StringIO(str(schedule_table)))[0]
+
+    # Filter for specific week; repeated header rows don't parse as a week
+    if 'Wk' in df.columns:
+        df = df[pd.to_numeric(df['Wk'], errors='coerce') == week]
+    else:
+        log_event("parse.warning", sport="cfb", year=year, reason="no week column")
+
+    # Older pages label the columns W/PtsW/L/PtsL
+    df = df.rename(columns={alias: name for alias, name in SCHEDULE_ALIASES.items()
+                            if name not in df.columns})
+    typed = type_columns(df, COLUMN_MAPS['cfb_schedule'])
+    typed = typed[typed['winner'].notna() & typed['loser'].notna()]
+
+    away_winner = typed['notes'].astype('string').str.contains('@', regex=False)
+    away_winner = away_winner.fillna(False).astype(bool)
+    dates = pd.to_datetime(typed['date'], format='%Y-%m-%d', errors='coerce')
+    games = pd.DataFrame({
+        'game_id': (f"{year}_{week}_" + typed['winner'].astype(str) + '_'
+                    + typed['loser'].astype(str)).str.replace(' ', '_'),
+        'date': dates.fillna(pd.Timestamp(datetime.now().date())).dt.date,
+        'home_team': typed['loser'].where(away_winner, typed['winner']),
+        'away_team': typed['winner'].where(away_winner, typed['loser']),
+        'home_score': typed['loser_pts'].where(away_winner, typed['winner_pts']),
+        'away_score': typed['winner_pts'].where(away_winner, typed['loser_pts']),
+        'winner': typed['winner'],
+    }, index=typed.index)
+    return to_records(games, year=year, week=week)
+
 def scrape_cfb_week(year: int, week: int):
     """
     Scrape college football games for a specific week.
@@ -19,209 +69,130 @@ def scrape_cfb_week(year: int, week: int):
     week: 1-15 (regular season) or 16+ (bowl games)
     """
     url = f"{CFB_BASE}/years/{year}-schedule.html"
-    print(f"Fetching {url}...")
     
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the schedule table
-        schedule_table = soup.find('table', {'id': 'schedule'})
-        if not schedule_table:
-            print(f"No schedule found for {year}")
-            return
+    with scrape_run("cfb", "scrape.done", year=year, week=week):
+        try:
+            html = fetch(url)
+            with timed(PARSE_SECONDS, "parse", sport="cfb", year=year, week=week):
+                games = parse_cfb_week(html, year, week)
+            if games is None:
+                log_event("parse.skipped", sport="cfb", year=year, reason="no schedule")
+                return
         
-        # Parse the table
-        df = pd.read_html(str(schedule_table))[0]
-        
-        # Filter for specific week
-        if 'Wk' in df.columns:
-            week_games = df[df['Wk'] == week]
-        else:
-            print("Week column not found, processing all games")
-            week_games = df
-        
-        print(f"Found {len(week_games)} games for week {week} of {year}")
-        
-        with Session(engine) as db:
-            for _, game_row in week_games.iterrows():
-                try:
-                    # Extract game info
-                    date_str = game_row.get('Date', '')
-                    winner = game_row.get('Winner', game_row.get('W', ''))
-                    winner_pts = safe_int(game_row.get('Pts', game_row.get('PtsW', '')))
-                    loser = game_row.get('Loser', game_row.get('L', ''))
-                    loser_pts = safe_int(game_row.get('Pts.1', game_row.get('PtsL', '')))
-                    
-                    # Parse date
-                    try:
-                        game_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except:
-                        game_date = datetime.now().date()
-                    
-                    # Create game_id
-                    game_id = f"{year}_{week}_{winner}_{loser}".replace(' ', '_')
-                    
-                    # Check if already scraped
-                    existing = db.query(CFBGame).filter(CFBGame.game_id == game_id).first()
-                    if existing:
-                        continue
-                    
-                    # Determine home/away (if available)
-                    notes = str(game_row.get('Notes', ''))
-                    if '@' in notes:
-                        # Away game for winner
-                        home_team = loser
-                        away_team = winner
-                        home_score = loser_pts
-                        away_score = winner_pts
-                    else:
-                        # Home game for winner or neutral
-                        home_team = winner
-                        away_team = loser
-                        home_score = winner_pts
-                        away_score = loser_pts
-                    
-                    # Save game
-                    game = CFBGame(
-                        game_id=game_id,
-                        date=game_date,
-                        year=year,
-                        week=week,
-                        home_team=home_team,
-                        away_team=away_team,
-                        home_score=home_score,
-                        away_score=away_score,
-                        winner=winner
-                    )
-                    db.add(game)
-                    
-                except Exception as e:
-                    print(f"  Error processing game: {e}")
-                    continue
+            log_event("games.found", sport="cfb", year=year, week=week, games=len(games))
+    
+            with Session(engine) as db, BulkWriter(db) as writer:
+                # One lookup for the whole week instead of one per game
+                stored = existing_ids(db, CFBGame.game_id, [game['game_id'] for game in games])
+                unscored = set(db.execute(
+                    select(CFBGame.game_id)
+                    .where(CFBGame.game_id.in_(stored), CFBGame.home_score.is_(None))
+                ).scalars()) if stored else set()
+                for game in games:
+                    if game['game_id'] not in stored:
+                        stored.add(game['game_id'])
+                        writer.add(CFBGame, game)
+                    elif game['game_id'] in unscored and game['home_score'] is not None:
+                        unscored.discard(game['game_id'])
+                        writer.add(CFBGame, game, SCORE_COLUMNS)
             
-            db.commit()
-            print(f"  ✓ Scraped {len(week_games)} games for week {week}")
+                writer.flush()
     
-    except Exception as e:
-        print(f"Error scraping week {week} of {year}: {e}")
+        except Exception as e:
+            log_event("scrape.error", sport="cfb", year=year, week=week, error=str(e))
+            raise
 
-def scrape_cfb_game_stats(game_url: str, game_id: str, db: Session):
+def scrape_cfb_game_stats(game_url: str, game_id: str, db: Session, writer: BulkWriter = None):
     """
     Scrape individual game box score for player stats.
+    Rows are queued on writer when given (the caller flushes it),
+    otherwise they are written straight away.
     """
     try:
-        response = requests.get(game_url, timeout=10)
-        response.raise_for_status()
-        html = response.text
+        html = fetch(game_url)
+        with timed(PARSE_SECONDS, "parse", sport="cfb", game_id=game_id):
+            stats = parse_cfb_game_stats(html, game_id)
+        
+        if writer is None:
+            with BulkWriter(db) as single:
+                single.add_many(CFBPlayerStat, stats)
+        else:
+            writer.add_many(CFBPlayerStat, stats)
+        log_event("game.scraped", sport="cfb", game_id=game_id, players=len(stats))
+    
+    except Exception as e:
+        db.rollback()
+        log_event("scrape.error", sport="cfb", game_id=game_id, error=str(e))
+
+def parse_cfb_game_stats(html, game_id: str) -> list:
+    """Parse a box score page into CFBPlayerStat rows (passing/rushing/receiving/defense)"""
+    # CFB Reference may hide tables in comments like NBA
+    html = html.replace('<!--', '').replace('-->', '')
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find passing, rushing, receiving tables
+    stat_tables = soup.find_all('table', {'class': re.compile(r'stats_table')})
+    stats = []
+    
+    for table in stat_tables:
+        table_id = table.get('id', '')
         
-        # CFB Reference may hide tables in comments like NBA
-        html = html.replace('<!--', '').replace('-->', '')
-        soup = BeautifulSoup(html, 'html.parser')
+        # Determine stat type
+        if 'passing' in table_id:
+            stat_type = 'passing'
+        elif 'rushing' in table_id:
+            stat_type = 'rushing'
+        elif 'receiving' in table_id:
+            stat_type = 'receiving'
+        elif 'defense' in table_id:
+            stat_type = 'defense'
+        else:
+            continue
         
-        # Find passing, rushing, receiving tables
-        stat_tables = soup.find_all('table', {'class': re.compile(r'stats_table')})
+        # Parse table
+        df = pd.read_html(StringIO(str(table)), header=1)[0]
+        df = df[df['Player'].notna()]
+        df = df[~df['Player'].str.contains('Player|Team Total', na=False)]
         
-        for table in stat_tables:
-            table_id = table.get('id', '')
-            
-            # Determine stat type
-            if 'passing' in table_id:
-                stat_type = 'passing'
-            elif 'rushing' in table_id:
-                stat_type = 'rushing'
-            elif 'receiving' in table_id:
-                stat_type = 'receiving'
-            elif 'defense' in table_id:
-                stat_type = 'defense'
-            else:
-                continue
-            
-            # Parse table
-            df = pd.read_html(str(table), header=1)[0]
-            df = df[df['Player'].notna()]
-            df = df[~df['Player'].str.contains('Player|Team Total', na=False)]
-            
-            # Extract team from table context
-            team_header = table.find_previous('h2')
-            team = team_header.text.strip() if team_header else 'Unknown'
-            
-            for _, row in df.iterrows():
-                player_name = row.get('Player', '')
-                
-                if stat_type == 'passing':
-                    stat = CFBPlayerStat(
-                        game_id=game_id,
-                        player_name=player_name,
-                        team=team,
-                        stat_type='passing',
-                        pass_cmp=safe_int(row.get('Cmp')),
-                        pass_att=safe_int(row.get('Att')),
-                        pass_yds=safe_int(row.get('Yds')),
-                        pass_td=safe_int(row.get('TD')),
-                        pass_int=safe_int(row.get('Int'))
-                    )
-                elif stat_type == 'rushing':
-                    stat = CFBPlayerStat(
-                        game_id=game_id,
-                        player_name=player_name,
-                        team=team,
-                        stat_type='rushing',
-                        rush_att=safe_int(row.get('Att')),
-                        rush_yds=safe_int(row.get('Yds')),
-                        rush_td=safe_int(row.get('TD'))
-                    )
-                elif stat_type == 'receiving':
-                    stat = CFBPlayerStat(
-                        game_id=game_id,
-                        player_name=player_name,
-                        team=team,
-                        stat_type='receiving',
-                        rec_tgt=safe_int(row.get('Tgt')),
-                        rec_rec=safe_int(row.get('Rec')),
-                        rec_yds=safe_int(row.get('Yds')),
-                        rec_td=safe_int(row.get('TD'))
-                    )
-                elif stat_type == 'defense':
-                    stat = CFBPlayerStat(
-                        game_id=game_id,
-                        player_name=player_name,
-                        team=team,
-                        stat_type='defense',
-                        def_tackles=safe_int(row.get('Tkl')),
-                        def_sacks=safe_float(row.get('Sk')),
-                        def_int=safe_int(row.get('Int'))
-                    )
-                else:
-                    continue
-                
-                db.add(stat)
+        # Extract team from table context
+        team_header = table.find_previous('h2')
+        team = team_header.text.strip() if team_header else 'Unknown'
         
-        db.commit()
-        print(f"  ✓ Scraped player stats for {game_id}")
+        stats.extend(frame_to_records(
+            df, f'cfb_{stat_type}', game_id=game_id, team=team, stat_type=stat_type
+        ))
     
-    except Exception as e:
-        db.rollback()
-        print(f"  Error scraping stats for {game_id}: {e}")
+    return stats
 
-def safe_int(value):
-    """Convert to int, return None if fails"""
-    try:
-        return int(float(value)) if pd.notna(value) else None
-    except:
-        return None
+def parse_cfb_game_page(url: str, html, game_ids: dict):
+    """Engine parse step; module-level so it can run in a worker process"""
+    return parse_cfb_game_stats(html, game_ids[url])
 
-def safe_float(value):
-    """Convert to float, return None if fails"""
-    try:
-        return float(value) if pd.notna(value) else None
-    except:
-        return None
+def discover_boxscores(games) -> Discovery:
+    """games: iterable of (game_id, box score URL) pairs"""
+    game_ids = {url: game_id for game_id, url in games}
+    return Discovery(game_ids, {'game_ids': game_ids})
 
-def scrape_current_cfb_week():
-    """Scrape current week's college football games"""
-    now = datetime.now()
+def save_game_stats(writer: BulkWriter, rows):
+    writer.add_many(CFBPlayerStat, rows)
+
+# Box scores are keyed by their stat rows: a game is skipped once it has any
+ADAPTER = SportAdapter("cfb", CFBPlayerStat.game_id, discover_boxscores, parse_cfb_game_page,
+                       save_game_stats)
+
+def scrape_cfb_boxscores(games, parse_workers: int = DEFAULT_PARSE_WORKERS,
+                         max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+    """
+    Scrape player stats for many games through the async pipeline.
+    games: iterable of (game_id, box score URL) pairs.
+    parse_workers: processes for the parse stage (0 = a thread).
+    """
+    return scrape(ADAPTER, {'games': games}, max_in_flight=max_in_flight,
+                  parse_workers=parse_workers)
+
+def current_cfb_week(now: datetime = None):
+    """(year, week) of the college football week containing now"""
+    now = now or datetime.now()
     # CFB season is Aug-Jan, determine year and approximate week
     if now.month >= 8:
         year = now.year
@@ -230,8 +201,11 @@ def scrape_current_cfb_week():
     else:
         year = now.year - 1
         week = 15  # Bowl season
-    
-    scrape_cfb_week(year, week)
+    return year, week
+
+def scrape_current_cfb_week():
+    """Scrape current week's college football games"""
+    scrape_cfb_week(*current_cfb_week())
 
 if __name__ == "__main__":
     scrape_current_cfb_week()
@@ -0,0 +1,121 @@
+"""Column typing stage: coerce whole stat tables at once and emit writer rows"""
+import re
+import numpy as np
+import pandas as pd
+
+# '34:12' or '34'; captures minutes and optional seconds
+MINUTES_PATTERN = r'(\d+)(?::(\d{2}))?'
+_MINUTES = re.compile(MINUTES_PATTERN)
+
+# Table column -> (model field, dtype) per table type.
+# 'Int64' / 'Float64' columns are coerced with pd.to_numeric; anything
+# unparseable becomes NULL. 'seconds' turns MM:SS playing time into integer
+# seconds (DNP reasons become NULL). 'str' columns are passed through.
+COLUMN_MAPS = {
+    'nba_basic': {
+        'Player': ('player_name', 'str'),
+        'MP': ('seconds_played', 'seconds'),
+        'PTS': ('points', 'Int64'),
+        'TRB': ('rebounds', 'Int64'),
+        'AST': ('assists', 'Int64'),
+        'STL': ('steals', 'Int64'),
+        'BLK': ('blocks', 'Int64'),
+        'TOV': ('turnovers', 'Int64'),
+        'FG': ('fg_made', 'Int64'),
+        'FGA': ('fg_attempted', 'Int64'),
+        '3P': ('three_made', 'Int64'),
+        '3PA': ('three_attempted', 'Int64'),
+        'FT': ('ft_made', 'Int64'),
+        'FTA': ('ft_attempted', 'Int64'),
+    },
+    'cfb_passing': {
+        'Player': ('player_name', 'str'),
+        'Cmp': ('pass_cmp', 'Int64'),
+        'Att': ('pass_att', 'Int64'),
+        'Yds': ('pass_yds', 'Int64'),
+        'TD': ('pass_td', 'Int64'),
+        'Int': ('pass_int', 'Int64'),
+    },
+    'cfb_rushing': {
+        'Player': ('player_name', 'str'),
+        'Att': ('rush_att', 'Int64'),
+        'Yds': ('rush_yds', 'Int64'),
+        'TD': ('rush_td', 'Int64'),
+    },
+    'cfb_receiving': {
+        'Player': ('player_name', 'str'),
+        'Tgt': ('rec_tgt', 'Int64'),
+        'Rec': ('rec_rec', 'Int64'),
+        'Yds': ('rec_yds', 'Int64'),
+        'TD': ('rec_td', 'Int64'),
+    },
+    'cfb_defense': {
+        'Player': ('player_name', 'str'),
+        'Tkl': ('def_tackles', 'Int64'),
+        'Sk': ('def_sacks', 'Float64'),
+        'Int': ('def_int', 'Int64'),
+    },
+    'cfb_schedule': {
+        'Date': ('date', 'str'),
+        'Winner': ('winner', 'str'),
+        'Pts': ('winner_pts', 'Int64'),
+        'Loser': ('loser', 'str'),
+        'Pts.1': ('loser_pts', 'Int64'),
+        'Notes': ('notes', 'str'),
+    },
+}
+
+
+def minutes_to_seconds(value):
+    """'34:12' -> 2052, '34' -> 2040; DNP reasons ('Did Not Play', ...) and blanks -> None"""
+    match = _MINUTES.fullmatch(str(value).strip()) if value is not None else None
+    if not match:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2) or 0)
+
+
+def safe_int(value):
+    """12, '12.0', '1,234' -> int; blanks, NaN and anything unparseable -> None"""
+    try:
+        if value is None or pd.isna(value):
+            return None
+        cleaned = str(value).replace(',', '').strip()
+        return int(float(cleaned)) if cleaned else None
+    except (TypeError, ValueError):
+        return None
+
+
+def type_columns(df: pd.DataFrame, column_map: dict) -> pd.DataFrame:
+    """
+    Rename and coerce the mapped columns of df in bulk.
+    Integer columns truncate like int(float(x)); missing columns come back as NULL.
+    """
+    out = {}
+    for source, (field, dtype) in column_map.items():
+        column = df[source] if source in df.columns else pd.Series(pd.NA, index=df.index, dtype=object)
+        if dtype == 'Int64':
+            values = pd.to_numeric(column, errors='coerce')
+            out[field] = pd.array(np.trunc(values.to_numpy(dtype=float, na_value=np.nan)), dtype='Int64')
+        elif dtype == 'Float64':
+            out[field] = pd.to_numeric(column, errors='coerce').astype('Float64')
+        elif dtype == 'seconds':
+            parts = column.astype('string').str.strip().str.extract(f'^{MINUTES_PATTERN}$')
+            minutes = pd.to_numeric(parts[0], errors='coerce')
+            seconds = pd.to_numeric(parts[1], errors='coerce').fillna(0)
+            out[field] = (minutes * 60 + seconds).astype('Int64')
+        else:
+            out[field] = column
+    return pd.DataFrame(out, index=df.index)
+
+
+def to_records(typed: pd.DataFrame, **constants) -> list:
+    """Typed frame -> list of plain dicts (NULLs as None) for BulkWriter"""
+    typed = typed.astype(object).where(typed.notna(), None)
+    for field, value in constants.items():
+        typed[field] = value
+    return typed.to_dict('records')
+
+
+def frame_to_records(df: pd.DataFrame, table_type: str, **constants) -> list:
+    """Shortcut for to_records(type_columns(df, COLUMN_MAPS[table_type]), **constants)"""
+    return to_records(type_columns(df, COLUMN_MAPS[table_type]), **constants)
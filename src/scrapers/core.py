@@ -0,0 +1,201 @@
+"""
+Scrape engine shared by every sport: discover -> dedup -> fetch -> parse -> batched write.
+
+A sport plugs in a SportAdapter with its discovery, parse and save steps;
+the engine owns the rest. Pages whose key is already stored are dropped
+with one lookup, the rest go through the async pipeline
+(src/scrapers/pipeline.py) and the parsed rows are queued on one
+BulkWriter per run, so every sport gets batched upserts, the shared HTTP
+cache and the per-host rate limiter without re-implementing them.
+
+    scrape(nba.ADAPTER, {"season": 2025, "month_slug": "january"})
+    scrape_many([(nba.ADAPTER, {}), (nhl.ADAPTER, {"season": 2025})], max_connections=8)
+"""
+import os
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+import aiohttp
+from src.database.bulk import BulkWriter, existing_ids
+from src.database.connection import engine
+from src.scrapers.http_cache import fetch
+from src.scrapers.pipeline import (
+    Politeness, run_pipeline, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_PARSE_WORKERS
+)
+from src.metrics import PARSE_SECONDS, log_event, scrape_run, timed
+
+# Open connections across every sport of a scrape_many run
+DEFAULT_MAX_CONNECTIONS = int(os.environ.get("SCRAPER_MAX_CONNECTIONS", "8"))
+
+
+class ScrapeError(RuntimeError):
+    """Every page a run tried failed, so a job running it should fail too"""
+
+
+@dataclass
+class Discovery:
+    """Pages a sport found: {url: dedup key}, plus keyword arguments for its parse step"""
+    pages: dict
+    context: dict = field(default_factory=dict)
+
+
+@dataclass
+class SportAdapter:
+    """
+    What a sport plugs into the engine.
+    discover(**params) -> Discovery, fetching whatever listing pages it needs.
+    parse(url, html, **context) -> result or None; module-level so it can
+    run in a parse worker process.
+    save(writer, result) queues the result's rows on a BulkWriter.
+    key_column holds a page's dedup key once its rows are stored.
+    """
+    sport: str
+    key_column: object
+    discover: Callable
+    parse: Callable
+    save: Callable
+    headers: dict = None
+
+
+def new_pages(adapter: SportAdapter, pages: dict) -> list:
+    """URLs of pages whose key isn't stored yet, with a single lookup"""
+    with engine.connect() as conn:
+        stored = existing_ids(conn, adapter.key_column, pages.values())
+    if stored:
+        log_event("games.skipped", sport=adapter.sport, games=len(stored))
+    return [url for url, key in pages.items() if key not in stored]
+
+
+def scrape_page(adapter: SportAdapter, url: str, writer: BulkWriter, revalidate: bool = False,
+                **context):
+    """
+    Fetch, parse and queue one page on the caller's thread, without
+    checking whether it is already stored
+    """
+    html = fetch(url, headers=adapter.headers, revalidate=revalidate)
+    with timed(PARSE_SECONDS, "parse", sport=adapter.sport, url=url):
+        result = adapter.parse(url, html, **context)
+    if result is not None:
+        adapter.save(writer, result)
+
+
+def _log_fields(params: dict) -> dict:
+    return {name: value for name, value in params.items() if isinstance(value, (str, int, float))}
+
+
+async def scrape_pages_async(
+    adapter: SportAdapter,
+    discovery: Discovery,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+    session=None,
+    politeness: Politeness = None,
+    pool=None,
+    revalidate: bool = False,
+    **fields,
+) -> dict:
+    """
+    Scrape the discovered pages that aren't stored yet through the async
+    pipeline and write their rows in batches. fields label the log lines.
+    revalidate re-checks cached pages with the origin, for pages that may
+    have been cached before they were final.
+    Returns the pipeline stats plus skipped, written (pages whose rows were
+    committed), rows_written per table and per-minute rates for both;
+    raises ScrapeError when every pending page failed.
+    """
+    with scrape_run(adapter.sport, "scrape.done", **fields):
+        pending = await asyncio.to_thread(new_pages, adapter, discovery.pages)
+        writer = BulkWriter(engine, key_column=adapter.key_column)
+        started = time.monotonic()
+
+        def write(result):
+            adapter.save(writer, result)
+
+        stats = await run_pipeline(
+            pending, partial(adapter.parse, **discovery.context), write,
+            headers=adapter.headers,
+            requests_per_minute=requests_per_minute,
+            max_in_flight=max_in_flight,
+            parse_workers=parse_workers,
+            session=session,
+            politeness=politeness,
+            pool=pool,
+            revalidate=revalidate,
+        )
+        await asyncio.to_thread(writer.flush)
+        stats['elapsed'] = time.monotonic() - started
+        stats['skipped'] = len(discovery.pages) - len(pending)
+        # Counted from what the writer committed, not what was handed to it
+        stats['written'] = sum(discovery.pages[url] in writer.committed_keys for url in pending)
+        stats['rows_written'] = writer.rows_written
+        minutes = stats['elapsed'] / 60
+        rows = sum(writer.rows_written.values())
+        stats['per_minute'] = stats['written'] / minutes if minutes > 0 else 0.0
+        stats['rows_per_minute'] = rows / minutes if minutes > 0 else 0.0
+
+    log_event("pipeline.done", sport=adapter.sport, **fields, urls=stats['urls'],
+              skipped=stats['skipped'], written=stats['written'], errors=stats['errors'],
+              rows=rows, seconds=stats['elapsed'], per_minute=stats['per_minute'],
+              rows_per_minute=stats['rows_per_minute'])
+    if stats['urls'] and stats['errors'] >= stats['urls']:
+        raise ScrapeError(f"all {stats['urls']} {adapter.sport} pages failed")
+    return stats
+
+
+async def scrape_async(adapter: SportAdapter, params: dict = None, **options) -> dict:
+    """Discover with params (off the event loop), then scrape_pages_async with options"""
+    params = params or {}
+    discovery = await asyncio.to_thread(adapter.discover, **params)
+    log_event("games.found", sport=adapter.sport, **_log_fields(params),
+              games=len(discovery.pages))
+    return await scrape_pages_async(adapter, discovery, **options, **_log_fields(params))
+
+
+def scrape(adapter: SportAdapter, params: dict = None, **options) -> dict:
+    """Blocking scrape_async for sync callers (scrapers run as jobs, CLIs)"""
+    return asyncio.run(scrape_async(adapter, params, **options))
+
+
+def scrape_pages(adapter: SportAdapter, discovery: Discovery, **options) -> dict:
+    """Blocking scrape_pages_async for pages found without the adapter's discover step"""
+    return asyncio.run(scrape_pages_async(adapter, discovery, **options))
+
+
+async def scrape_many_async(
+    runs,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+) -> list:
+    """
+    Run several (adapter, params) scrapes at once. They share one HTTP
+    connection pool of max_connections, one requests_per_minute budget
+    across all of them and one parse process pool, on top of the per-host
+    rate limiter. Returns each run's stats, or the exception it failed with,
+    in run order.
+    """
+    politeness = Politeness(requests_per_minute)
+    pool = ProcessPoolExecutor(parse_workers) if parse_workers > 0 else None
+    try:
+        connector = aiohttp.TCPConnector(limit=max_connections)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await asyncio.gather(*[
+                scrape_async(adapter, params, requests_per_minute=requests_per_minute,
+                             max_in_flight=max_in_flight, parse_workers=parse_workers,
+                             session=session, politeness=politeness, pool=pool)
+                for adapter, params in runs
+            ], return_exceptions=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def scrape_many(runs, **options) -> list:
+    """Blocking scrape_many_async"""
+    return asyncio.run(scrape_many_async(runs, **options))
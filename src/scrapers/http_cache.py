@@ -0,0 +1,326 @@
+"""On-disk HTTP cache with conditional-GET revalidation shared by all scrapers"""
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import aiohttp
+import requests
+from datetime import date
+from src.scrapers.rate_limit import limiter, THROTTLE_STATUSES
+from src.metrics import FETCH_SECONDS, FETCH_BYTES, log_event, sport_for_url
+
+CACHE_DIR = os.environ.get("SCRAPER_CACHE_DIR", ".cache/http")
+CACHE_ENABLED = os.environ.get("SCRAPER_HTTP_CACHE", "1") != "0"
+# Size cap for CACHE_DIR; least recently used entries are pruned past it (0 = no cap)
+CACHE_MAX_MB = float(os.environ.get("SCRAPER_CACHE_MAX_MB", "2048"))
+# Stores between size checks; each check walks the cache directory
+PRUNE_EVERY = 500
+
+IMMUTABLE = None
+
+# (url pattern, max age in seconds). IMMUTABLE entries are never refetched.
+# URLs that match no rule are always revalidated with the origin.
+FRESHNESS_RULES = [
+    (re.compile(r"basketball-reference\.com/boxscores/\d{9}[A-Z]{3}\.html$"), IMMUTABLE),
+    (re.compile(r"basketball-reference\.com/boxscores/\?"), 5 * 60),
+    (re.compile(r"basketball-reference\.com/leagues/NBA_\d+_games-\w+\.html$"), 60 * 60),
+    (re.compile(r"sports-reference\.com/cfb/boxscores/"), IMMUTABLE),
+    (re.compile(r"sports-reference\.com/cfb/years/\d+-schedule\.html$"), 60 * 60),
+    (re.compile(r"gol\.gg/game/stats/"), IMMUTABLE),
+    (re.compile(r"gol\.gg/tournament/"), 30 * 60),
+]
+
+# Daily scoreboard pages, e.g. /boxscores/?month=01&day=10&year=2026
+_DAY_PAGE = re.compile(r"month=(\d+)&day=(\d+)&year=(\d+)")
+
+# Attempts per URL when the host answers 429/503
+MAX_ATTEMPTS = 3
+
+# Per-process counters, handy for reporting how a run was served
+stats = {"hits": 0, "revalidated": 0, "downloaded": 0}
+
+
+def max_age(url: str):
+    """Freshness lifetime for a URL in seconds, IMMUTABLE, or 0 to always revalidate"""
+    day = _DAY_PAGE.search(url)
+    if day:
+        month, day_of_month, year = (int(x) for x in day.groups())
+        try:
+            # Scoreboards for days before yesterday no longer change
+            if (date.today() - date(year, month, day_of_month)).days > 1:
+                return IMMUTABLE
+        except ValueError:
+            pass
+    for pattern, age in FRESHNESS_RULES:
+        if pattern.search(url):
+            return age
+    return 0
+
+
+class HTTPCache:
+    """
+    Stores response bodies plus ETag/Last-Modified keyed by URL.
+    Each entry is a <key>.body file and a <key>.json metadata file, both
+    written atomically so several scraper processes can share a directory.
+    A body's mtime is bumped whenever it is served, and once the directory
+    grows past max_mb the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_mb: float = CACHE_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._stores = 0
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def lookup(self, url: str):
+        """Return the cached entry metadata for url, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return meta
+
+    def body_bytes(self, url: str) -> bytes:
+        _, body_path = self._paths(url)
+        with open(body_path, "rb") as f:
+            content = f.read()
+        try:
+            os.utime(body_path)  # recency for prune()
+        except OSError:
+            pass
+        return content
+
+    def body(self, url: str, meta: dict) -> str:
+        return decode(self.body_bytes(url), meta.get("encoding"))
+
+    def is_fresh(self, url: str, meta: dict) -> bool:
+        age = max_age(url)
+        if age is IMMUTABLE:
+            return True
+        return time.time() - meta.get("checked_at", 0) < age
+
+    def store(self, url: str, content: bytes, headers, encoding: str = None):
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "encoding": encoding,
+            "fetched_at": time.time(),
+            "checked_at": time.time(),
+        }
+        _atomic_write(body_path, content)
+        _atomic_write(meta_path, json.dumps(meta).encode())
+        self._stores += 1
+        if self.max_bytes and self._stores % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self, max_bytes: int = None) -> int:
+        """
+        Delete least recently used entries until the bodies fit in 90% of
+        max_bytes (default: the cache's cap). Returns the entries deleted.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries, total = [], 0
+        try:
+            shards = os.scandir(self.directory)
+        except OSError:
+            return 0
+        with shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith(".body"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        if total <= max_bytes:
+            return 0
+        target = int(max_bytes * 0.9)
+        deleted = 0
+        for _, size, body_path in sorted(entries):
+            if total <= target:
+                break
+            # Metadata first: lookup() treats an entry without it as missing
+            for path in (body_path[:-len(".body")] + ".json", body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            deleted += 1
+        log_event("cache.pruned", entries=deleted, bytes=total)
+        return deleted
+
+    def touch(self, url: str, meta: dict, headers=None):
+        """Record a successful 304 revalidation"""
+        meta_path, _ = self._paths(url)
+        meta["checked_at"] = time.time()
+        if headers is not None:
+            meta["etag"] = headers.get("ETag") or meta.get("etag")
+            meta["last_modified"] = headers.get("Last-Modified") or meta.get("last_modified")
+        _atomic_write(meta_path, json.dumps(meta).encode())
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def decode(content: bytes, encoding: str = None) -> str:
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def conditional_headers(meta: dict) -> dict:
+    """If-None-Match / If-Modified-Since for revalidating a cached entry"""
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+_cache = HTTPCache()
+
+
+def _record_fetch(url: str, source: str, started: float, content: bytes, status: int = None):
+    """Observe one fetch; source is 'cache', 'revalidated' or 'network'"""
+    seconds = time.perf_counter() - started
+    sport = sport_for_url(url)
+    FETCH_SECONDS.observe(seconds, sport=sport, source=source)
+    FETCH_BYTES.observe(len(content), sport=sport, source=source)
+    log_event("fetch", sport=sport, source=source, status=status, seconds=seconds,
+              bytes=len(content), url=url)
+
+
+def fetch(url: str, headers=None, timeout: float = 10, revalidate: bool = False) -> str:
+    """
+    GET url through the shared cache and return the page text.
+    Fresh entries are served locally, stale ones are revalidated with a
+    conditional request. Network requests draw from the shared per-host
+    rate limiter and are retried after the backoff on 429/503, and straight
+    away (still paced by the limiter) on connection errors, timeouts and
+    other 5xx, up to MAX_ATTEMPTS requests in all.
+    revalidate treats every entry as stale, even IMMUTABLE ones, for pages
+    that may have been cached before they were final.
+    Raises requests.HTTPError on error responses and CircuitOpenError while
+    the host's circuit breaker is open.
+    """
+    started = time.perf_counter()
+    meta = _cache.lookup(url) if CACHE_ENABLED else None
+    if meta and not revalidate and _cache.is_fresh(url, meta):
+        stats["hits"] += 1
+        content = _cache.body_bytes(url)
+        _record_fetch(url, "cache", started, content)
+        return decode(content, meta.get("encoding"))
+
+    request_headers = dict(headers or {})
+    if meta:
+        request_headers.update(conditional_headers(meta))
+
+    for attempt in range(MAX_ATTEMPTS):
+        limiter.acquire(url)
+        try:
+            response = requests.get(url, timeout=timeout, headers=request_headers)
+        except requests.RequestException:
+            limiter.record(url, None)
+            if attempt < MAX_ATTEMPTS - 1:
+                continue
+            raise
+        limiter.record(url, response.status_code, response.headers.get("Retry-After"))
+        if response.status_code not in THROTTLE_STATUSES and response.status_code < 500:
+            break
+
+    if meta and response.status_code == 304:
+        stats["revalidated"] += 1
+        _cache.touch(url, meta, response.headers)
+        content = _cache.body_bytes(url)
+        _record_fetch(url, "revalidated", started, content, 304)
+        return decode(content, meta.get("encoding"))
+
+    response.raise_for_status()
+    stats["downloaded"] += 1
+    _record_fetch(url, "network", started, response.content, response.status_code)
+    encoding = response.encoding or response.apparent_encoding
+    if CACHE_ENABLED:
+        _cache.store(url, response.content, response.headers, encoding)
+    return decode(response.content, encoding)
+
+
+async def fetch_async(session, url: str, timeout: float = 10, throttle=None, headers=None,
+                      revalidate: bool = False) -> str:
+    """
+    fetch() for an aiohttp ClientSession.
+    throttle is an optional coroutine function awaited only when the request
+    actually goes to the network, so local hits don't spend politeness budget.
+    The shared per-host rate limiter applies on top of it.
+    headers are sent on top of the session's own; revalidate is as for fetch().
+    """
+    content, encoding = await fetch_raw_async(session, url, timeout, throttle, headers,
+                                              revalidate)
+    return decode(content, encoding)
+
+
+async def fetch_raw_async(session, url: str, timeout: float = 10, throttle=None, headers=None,
+                          revalidate: bool = False):
+    """fetch_async() returning the undecoded (body bytes, encoding)"""
+    started = time.perf_counter()
+    meta = _cache.lookup(url) if CACHE_ENABLED else None
+    if meta and not revalidate and _cache.is_fresh(url, meta):
+        stats["hits"] += 1
+        content = _cache.body_bytes(url)
+        _record_fetch(url, "cache", started, content)
+        return content, meta.get("encoding")
+
+    request_headers = dict(headers or {})
+    if meta:
+        request_headers.update(conditional_headers(meta))
+    for attempt in range(MAX_ATTEMPTS):
+        if throttle is not None:
+            await throttle()
+        await limiter.acquire_async(url)
+        try:
+            async with session.get(url, headers=request_headers,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                await limiter.record_async(url, response.status,
+                                           response.headers.get("Retry-After"))
+                retry = response.status in THROTTLE_STATUSES or response.status >= 500
+                if retry and attempt < MAX_ATTEMPTS - 1:
+                    continue
+                if meta and response.status == 304:
+                    stats["revalidated"] += 1
+                    _cache.touch(url, meta, response.headers)
+                    content = _cache.body_bytes(url)
+                    _record_fetch(url, "revalidated", started, content, 304)
+                    return content, meta.get("encoding")
+
+                response.raise_for_status()
+                content = await response.read()
+                encoding = response.get_encoding()
+                break
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            await limiter.record_async(url, None)
+            if attempt < MAX_ATTEMPTS - 1:
+                continue
+            raise
+
+    stats["downloaded"] += 1
+    _record_fetch(url, "network", started, content, response.status)
+    if CACHE_ENABLED:
+        _cache.store(url, content, response.headers, encoding)
+    return content, encoding
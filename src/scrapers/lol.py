@@ -1,175 +1,195 @@
 """League of Legends scraper using gol.gg"""
 import re
-import time
-import requests
-import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime
 from sqlalchemy.orm import Session
-from src.database.connection import engine
-from src.database.models import LoLGame, LoLPlayerStat
+from src.database.models import LoLMatch, LoLPlayerStat
+from src.database.bulk import BulkWriter
+from src.scrapers.columns import safe_int
+from src.scrapers.core import Discovery, SportAdapter, scrape, scrape_many, scrape_page
+from src.scrapers.http_cache import fetch
+from src.metrics import log_event
 
 GOL_BASE = "https://gol.gg"
 
+CURRENT_TOURNAMENTS = ['LCS', 'LEC', 'LCK', 'LPL']
+CURRENT_SEASON = '2026-spring'
+
 def scrape_lol_tournament(tournament_id: str, season: str):
     """
     Scrape LoL games for a specific tournament.
     tournament_id: e.g., 'LCS', 'LEC', 'LCK', 'LPL'
     season: e.g., '2026-spring'
     """
-    url = f"{GOL_BASE}/tournament/tournament-matchlist/{tournament_id}/"
-    print(f"Fetching {url}...")
-    
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all match links
-        match_table = soup.find('table', {'class': 'table_list'})
-        if not match_table:
-            print(f"No matches found for {tournament_id}")
-            return
-        
-        match_links = match_table.find_all('a', href=re.compile(r'/game/stats/'))
-        game_ids = [link['href'].split('/')[-2] for link in match_links]
-        
-        print(f"Found {len(game_ids)} games for {tournament_id} {season}")
-        
-        with Session(engine) as db:
-            for game_id in game_ids:
-                scrape_single_lol_game(game_id, tournament_id, season, db)
-                time.sleep(2)  # Rate limiting
-    
+        return scrape(ADAPTER, {'tournament_id': tournament_id, 'season': season})
     except Exception as e:
-        print(f"Error scraping {tournament_id}: {e}")
+        log_event("scrape.error", sport="lol", tournament=tournament_id, error=str(e))
+        raise
+
+def discover_tournament(tournament_id: str, season: str = CURRENT_SEASON) -> Discovery:
+    """Game pages linked from a tournament's match list"""
+    html = fetch(f"{GOL_BASE}/tournament/tournament-matchlist/{tournament_id}/")
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find all match links
+    match_table = soup.find('table', {'class': 'table_list'})
+    if not match_table:
+        log_event("parse.skipped", sport="lol", tournament=tournament_id, reason="no match list")
+        return Discovery({})
+    
+    match_links = match_table.find_all('a', href=re.compile(r'/game/stats/'))
+    game_ids = [link['href'].split('/')[-2] for link in match_links]
+    return Discovery({game_url(game_id): game_id for game_id in game_ids},
+                     {'tournament': tournament_id, 'season': season})
+
+def game_url(game_id: str) -> str:
+    return f"{GOL_BASE}/game/stats/{game_id}/page-game/"
 
-def scrape_single_lol_game(game_id: str, tournament: str, season: str, db: Session):
+def scrape_single_lol_game(game_id: str, tournament: str, season: str, db: Session,
+                           writer: BulkWriter = None):
     """
     Scrape a single LoL game's stats.
+    Rows are queued on writer when given (the caller flushes it),
+    otherwise they are written straight away.
     """
     # Check if already scraped
-    from src.database.models import LoLGame
-    existing = db.query(LoLGame).filter(LoLGame.game_id == game_id).first()
+    existing = db.query(LoLMatch).filter(LoLMatch.match_id == game_id).first()
     if existing:
-        print(f"  {game_id} already scraped, skipping")
+        log_event("games.skipped", sport="lol", games=1, game_id=game_id)
         return
     
+    if writer is None:
+        with BulkWriter(db) as single:
+            scrape_lol_game(game_id, tournament, season, single)
+    else:
+        scrape_lol_game(game_id, tournament, season, writer)
+
+
+def scrape_lol_game(game_id: str, tournament: str, season: str, writer: BulkWriter):
+    """
+    Fetch, parse and queue one game without checking whether it is
+    already stored; callers filter candidates first.
+    """
     try:
-        url = f"{GOL_BASE}/game/stats/{game_id}/page-game/"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract game metadata
-        title = soup.find('h1')
-        if not title:
-            print(f"  No title found for {game_id}")
-            return
-        
-        # Parse teams from title (e.g., "Team A vs Team B")
-        title_text = title.text.strip()
-        teams = re.split(r'\s+vs\s+', title_text, flags=re.IGNORECASE)
-        if len(teams) < 2:
-            print(f"  Could not parse teams from: {title_text}")
-            return
-        
-        team_a = teams[0].strip()
-        team_b = teams[1].strip()
-        
-        # Get winner from score or result
-        score_divs = soup.find_all('div', {'class': 'score'})
-        winner = None
-        if len(score_divs) >= 2:
-            score_a = score_divs[0].text.strip()
-            score_b = score_divs[1].text.strip()
-            if score_a > score_b:
-                winner = team_a
-            else:
-                winner = team_b
-        
-        # Extract date
-        date_elem = soup.find('div', {'class': 'game-date'})
-        game_date = datetime.now().date()
-        if date_elem:
-            try:
-                game_date = datetime.strptime(date_elem.text.strip(), '%Y-%m-%d').date()
-            except:
-                pass
-        
-        # Save game
-        game = LoLGame(
-            game_id=game_id,
-            date=game_date,
-            tournament=tournament,
-            season=season,
-            team_a=team_a,
-            team_b=team_b,
-            winner=winner
-        )
-        db.add(game)
-        db.commit()
+        scrape_page(ADAPTER, game_url(game_id), writer, tournament=tournament, season=season)
+    except Exception as e:
+        log_event("scrape.error", sport="lol", game_id=game_id, error=str(e))
+        raise
+
+def parse_lol_game_page(url: str, html, tournament: str, season: str):
+    """Engine parse step; module-level so it can run in a worker process"""
+    return parse_lol_game(html, url.rstrip('/').split('/')[-2], tournament, season)
+
+def save_lol_game(writer: BulkWriter, result):
+    game, player_stats = result
+    writer.add(LoLMatch, game)
+    writer.add_many(LoLPlayerStat, player_stats)
+    log_event("game.scraped", sport="lol", game_id=game['match_id'], team1=game['team1'],
+              team2=game['team2'], players=len(player_stats))
+
+def parse_lol_game(html, game_id: str, tournament: str, season: str):
+    """
+    Parse a gol.gg game page into (game, player_stats) dicts.
+    Returns None if the page has no usable title.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Extract game metadata
+    title = soup.find('h1')
+    if not title:
+        log_event("parse.skipped", sport="lol", game_id=game_id, reason="no title")
+        return None
+    
+    # Parse teams from title (e.g., "Team A vs Team B")
+    title_text = title.text.strip()
+    teams = re.split(r'\s+vs\s+', title_text, flags=re.IGNORECASE)
+    if len(teams) < 2:
+        log_event("parse.skipped", sport="lol", game_id=game_id, reason="no teams", title=title_text)
+        return None
+    
+    team_a = teams[0].strip()
+    team_b = teams[1].strip()
+    
+    # Get winner from score or result
+    score_divs = soup.find_all('div', {'class': 'score'})
+    winner = None
+    if len(score_divs) >= 2:
+        score_a = score_divs[0].text.strip()
+        score_b = score_divs[1].text.strip()
+        if score_a > score_b:
+            winner = team_a
+        else:
+            winner = team_b
+    
+    # Extract date
+    date_elem = soup.find('div', {'class': 'game-date'})
+    game_date = datetime.now().date()
+    if date_elem:
+        try:
+            game_date = datetime.strptime(date_elem.text.strip(), '%Y-%m-%d').date()
+        except:
+            pass
+    
+    game = {
+        'match_id': game_id,
+        'date': game_date,
+        'league': tournament,
+        'season': season,
+        'team1': team_a,
+        'team2': team_b,
+        'winner': winner
+    }
+    player_stats = []
+    
+    # Extract player stats
+    stats_table = soup.find('table', {'class': 'table_list playersInfosLine'})
+    if stats_table:
+        rows = stats_table.find_all('tr')[1:]  # Skip header
         
-        # Extract player stats
-        stats_table = soup.find('table', {'class': 'table_list playersInfosLine'})
-        if stats_table:
-            rows = stats_table.find_all('tr')[1:]  # Skip header
+        for row in rows:
+            cells = row.find_all('td')
+            if len(cells) < 10:
+                continue
             
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) < 10:
-                    continue
-                
-                player_name = cells[1].text.strip()
-                champion = cells[2].text.strip()
-                team = cells[0].text.strip()
-                
-                # Extract stats (KDA, CS, gold, damage)
-                kills = safe_int(cells[3].text.strip())
-                deaths = safe_int(cells[4].text.strip())
-                assists = safe_int(cells[5].text.strip())
-                cs = safe_int(cells[6].text.strip())
-                gold = safe_int(cells[7].text.strip())
-                damage = safe_int(cells[8].text.strip())
-                
-                player_stat = LoLPlayerStat(
-                    game_id=game_id,
-                    player_name=player_name,
-                    champion=champion,
-                    team=team,
-                    kills=kills,
-                    deaths=deaths,
-                    assists=assists,
-                    cs=cs,
-                    gold=gold,
-                    damage=damage
-                )
-                db.add(player_stat)
-        
-        db.commit()
-        print(f"  ✓ Scraped {game_id}: {team_a} vs {team_b}")
+            player_name = cells[1].text.strip()
+            champion = cells[2].text.strip()
+            team = cells[0].text.strip()
+            
+            # Extract stats (KDA, CS, gold, damage)
+            kills = safe_int(cells[3].text.strip())
+            deaths = safe_int(cells[4].text.strip())
+            assists = safe_int(cells[5].text.strip())
+            cs = safe_int(cells[6].text.strip())
+            gold = safe_int(cells[7].text.strip())
+            damage = safe_int(cells[8].text.strip())
+            
+            player_stats.append({
+                'match_id': game_id,
+                'player_name': player_name,
+                'champion': champion,
+                'team': team,
+                'kills': kills,
+                'deaths': deaths,
+                'assists': assists,
+                'cs': cs,
+                'gold': gold,
+                'damage_dealt': damage
+            })
     
-    except Exception as e:
-        db.rollback()
-        print(f"  Error scraping {game_id}: {e}")
+    return game, player_stats
 
-def safe_int(value):
-    """Convert to int, return None if fails"""
-    try:
-        # Remove commas and convert
-        cleaned = str(value).replace(',', '').strip()
-        return int(float(cleaned)) if cleaned else None
-    except:
-        return None
+ADAPTER = SportAdapter("lol", LoLMatch.match_id, discover_tournament, parse_lol_game_page,
+                       save_lol_game)
 
 def scrape_current_tournaments():
-    """Scrape current major tournaments"""
-    tournaments = ['LCS', 'LEC', 'LCK', 'LPL']
-    season = '2026-spring'
-    
-    for tournament in tournaments:
-        scrape_lol_tournament(tournament, season)
-        time.sleep(5)  # Rate limiting between tournaments
+    """Scrape current major tournaments at once"""
+    runs = [(ADAPTER, {'tournament_id': tournament, 'season': CURRENT_SEASON})
+            for tournament in CURRENT_TOURNAMENTS]
+    for (_, params), result in zip(runs, scrape_many(runs)):
+        if isinstance(result, Exception):
+            log_event("scrape.error", sport="lol", tournament=params['tournament_id'],
+                      error=str(result))
 
 if __name__ == "__main__":
     scrape_current_tournaments()
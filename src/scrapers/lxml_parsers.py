@@ -0,0 +1,236 @@
+"""Fast lxml page parsers that pull only the parts the scrapers store"""
+from datetime import datetime
+import lxml.html
+from lxml import etree
+from src.scrapers.columns import minutes_to_seconds
+from src.metrics import log_event
+
+# Basketball-Reference data-stat -> NBAPlayerStat column
+NBA_BASIC_STATS = {
+    'pts': 'points',
+    'trb': 'rebounds',
+    'ast': 'assists',
+    'stl': 'steals',
+    'blk': 'blocks',
+    'tov': 'turnovers',
+    'fg': 'fg_made',
+    'fga': 'fg_attempted',
+    'fg3': 'three_made',
+    'fg3a': 'three_attempted',
+    'ft': 'ft_made',
+    'fta': 'ft_attempted',
+}
+
+# Pro-Football-Reference player_offense data-stat -> NFLPlayerStat column
+NFL_OFFENSE_STATS = {
+    'pass_cmp': 'pass_completions',
+    'pass_att': 'pass_attempts',
+    'pass_yds': 'pass_yards',
+    'pass_td': 'pass_touchdowns',
+    'pass_int': 'interceptions',
+    'rush_att': 'rush_attempts',
+    'rush_yds': 'rush_yards',
+    'rush_td': 'rush_touchdowns',
+    'targets': 'targets',
+    'rec': 'receptions',
+    'rec_yds': 'receiving_yards',
+    'rec_td': 'receiving_touchdowns',
+}
+
+# Hockey-Reference *_skaters data-stat -> NHLPlayerStat column
+NHL_SKATER_STATS = {
+    'goals': 'goals',
+    'assists': 'assists',
+    'points': 'points',
+    'plus_minus': 'plus_minus',
+    'pen_min': 'pim',
+    'shots': 'shots',
+}
+
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_SCOREBOX = etree.XPath("//div[" + _HAS_CLASS.format('scorebox') + "]")
+_SCORES = etree.XPath(".//div[" + _HAS_CLASS.format('score') + "]")
+_BODY_ROWS = etree.XPath("./tbody/tr | ./tr")
+_CELLS = etree.XPath("./th | ./td")
+
+
+def _table_finder(predicate: str, marker: str):
+    """
+    Finder for the tables matching the XPath predicate, visible or hidden in
+    the HTML comments Sports Reference sites wrap them in (found by marker),
+    in document order
+    """
+    nodes = etree.XPath(f"//table[{predicate}] | //comment()[contains(., '{marker}')]")
+    tables = etree.XPath(f"//table[{predicate}]")
+
+    def find(doc):
+        for node in nodes(doc):
+            if isinstance(node, etree._Comment):
+                fragment = lxml.html.fragment_fromstring(node.text, create_parent='div')
+                yield from tables(fragment)
+            else:
+                yield node
+
+    return find
+
+
+_basic_tables = _table_finder(
+    "starts-with(@id, 'box-') and substring(@id, string-length(@id) - 10) = '-game-basic'",
+    '-game-basic',
+)
+_offense_tables = _table_finder("@id = 'player_offense'", 'player_offense')
+_skater_tables = _table_finder("substring(@id, string-length(@id) - 7) = '_skaters'", '_skaters')
+
+
+def _int(text):
+    try:
+        return int(float(text)) if text else None
+    except ValueError:
+        return None
+
+
+def _team_name(div):
+    anchors = div.xpath('.//a')
+    if anchors:
+        return anchors[0].text_content()
+    strong = div.xpath('.//strong')
+    return strong[0].text_content() if strong else None
+
+
+def _scorebox_game(doc, sport: str, game_id: str):
+    """
+    Teams and scores from a Sports Reference scorebox (away team first) plus
+    the date in the game id, or None if the page has no usable scorebox
+    """
+    scorebox = _SCOREBOX(doc)
+    if not scorebox:
+        log_event("parse.skipped", sport=sport, game_id=game_id, reason="no scorebox")
+        return None
+    scorebox = scorebox[0]
+
+    teams = [child for child in scorebox if child.tag == 'div']
+    if len(teams) < 2:
+        log_event("parse.skipped", sport=sport, game_id=game_id, reason="no teams")
+        return None
+
+    scores = [_int(div.text_content().strip()) for div in _SCORES(scorebox)]
+    return {
+        'game_id': game_id,
+        'date': datetime.strptime(game_id[:8], '%Y%m%d').date(),
+        'home_team': _team_name(teams[1]),
+        'away_team': _team_name(teams[0]),
+        'home_score': scores[1] if len(scores) > 1 else None,
+        'away_score': scores[0] if scores else None,
+    }
+
+
+def _stat_cells(table):
+    """data-stat -> text for each body row of a stat table, skipping repeated header rows"""
+    for tr in _BODY_ROWS(table):
+        if 'thead' in (tr.get('class') or '').split():
+            continue
+        cells = {}
+        for cell in _CELLS(tr):
+            stat = cell.get('data-stat')
+            if stat:
+                cells[stat] = cell.text_content().strip()
+        yield cells
+
+
+def _player_rows(table, game_id, team_abbr):
+    for cells in _stat_cells(table):
+        player_name = cells.get('player')
+        if not player_name or player_name in ('Starters', 'Reserves', 'Player'):
+            continue
+
+        row = {
+            'game_id': game_id,
+            'player_name': player_name,
+            'team': team_abbr,
+            'seconds_played': minutes_to_seconds(cells.get('mp')),
+        }
+        for stat, column in NBA_BASIC_STATS.items():
+            row[column] = _int(cells.get(stat))
+        yield row
+
+
+def parse_nba_box_score(html, game_id: str, season: int):
+    """
+    Parse a Basketball-Reference box score into (game, player_stats) dicts.
+    Reads the scorebox and the box-*-game-basic tables only, including the
+    ones hidden in HTML comments. Returns None if the page has no usable scorebox.
+    """
+    doc = lxml.html.fromstring(html)
+
+    game = _scorebox_game(doc, "nba", game_id)
+    if game is None:
+        return None
+    game['season'] = season
+
+    player_stats = []
+    for table in _basic_tables(doc):
+        team_abbr = table.get('id', '').split('-')[1]
+        player_stats.extend(_player_rows(table, game_id, team_abbr))
+
+    return game, player_stats
+
+
+def parse_nfl_box_score(html, game_id: str, season: int, week: int = None):
+    """
+    Parse a Pro-Football-Reference box score into (game, player_stats) dicts
+    from the scorebox and the player_offense table (passing, rushing and
+    receiving in one row per player). Returns None if the page has no usable scorebox.
+    """
+    doc = lxml.html.fromstring(html)
+
+    game = _scorebox_game(doc, "nfl", game_id)
+    if game is None:
+        return None
+    game['season'] = season
+    game['week'] = week
+
+    player_stats = []
+    for table in _offense_tables(doc):
+        for cells in _stat_cells(table):
+            player_name = cells.get('player')
+            if not player_name or player_name == 'Player':
+                continue
+            row = {'game_id': game_id, 'player_name': player_name, 'team': cells.get('team')}
+            for stat, column in NFL_OFFENSE_STATS.items():
+                row[column] = _int(cells.get(stat))
+            player_stats.append(row)
+
+    return game, player_stats
+
+
+def parse_nhl_box_score(html, game_id: str, season: int):
+    """
+    Parse a Hockey-Reference box score into (game, player_stats) dicts from
+    the scorebox and the {TEAM}_skaters tables. Returns None if the page has
+    no usable scorebox.
+    """
+    doc = lxml.html.fromstring(html)
+
+    game = _scorebox_game(doc, "nhl", game_id)
+    if game is None:
+        return None
+    game['season'] = season
+
+    player_stats = []
+    for table in _skater_tables(doc):
+        team_abbr = table.get('id', '').split('_')[0]
+        for cells in _stat_cells(table):
+            player_name = cells.get('player')
+            if not player_name or player_name == 'Player':
+                continue
+            row = {
+                'game_id': game_id,
+                'player_name': player_name,
+                'team': team_abbr,
+                'toi_seconds': minutes_to_seconds(cells.get('time_on_ice')),
+            }
+            for stat, column in NHL_SKATER_STATS.items():
+                row[column] = _int(cells.get(stat))
+            player_stats.append(row)
+
+    return game, player_stats
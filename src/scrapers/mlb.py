@@ -1,30 +0,0 @@
-"""MLB scraper - Baseball-Reference.com"""
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-from sqlalchemy.orm import Session
-
-def scrape_mlb_data(session: Session, season: int = 2026):
-    """Scrape MLB data from Baseball-Reference"""
-    try:
-        # Placeholder - framework structure
-        # TODO: Implement actual scraping logic
-        from src.database.models import MLBGame, MLBTeam, MLBPlayer, MLBPlayerStats
-        
-        print(f"MLB scraper initialized for season {season}")
-        
-        # Return placeholder data for framework
-        return {
-            "status": "success",
-            "message": f"MLB scraper framework ready",
-            "games_scraped": 0,
-            "teams_scraped": 0,
-            "players_scraped": 0
-        }
-        
-    except Exception as e:
-        print(f"Error in MLB scraper: {str(e)}")
-        return {
-            "status": "error",
-            "message": str(e)
-        }
@@ -1,14 +1,26 @@
 """NBA scraper using Basketball-Reference"""
 
+import os
 import re
-import time
-import requests
 import pandas as pd
 from bs4 import BeautifulSoup
-from datetime import datetime, date
+from io import StringIO
+from datetime import datetime, timedelta
+from sqlalchemy import exists, or_, select
 from sqlalchemy.orm import Session
 from src.database.connection import engine
 from src.database.models import NBAGame, NBAPlayerStat
+from src.database.bulk import BulkWriter, existing_ids
+from src.scrapers.http_cache import fetch
+from src.scrapers.columns import frame_to_records
+from src.scrapers.core import (
+    Discovery, ScrapeError, SportAdapter, scrape, scrape_page, scrape_pages
+)
+from src.scrapers.lxml_parsers import parse_nba_box_score
+from src.metrics import PARSE_SECONDS, log_event, scrape_run, timed
+from src.scrapers.pipeline import (
+    DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_MAX_IN_FLIGHT, DEFAULT_PARSE_WORKERS
+)
 
 BR_BASE = "https://www.basketball-reference.com"
 
@@ -17,178 +29,327 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# What a refreshed box score overwrites on rows that already exist
+GAME_REFRESH_COLUMNS = ['home_team', 'away_team', 'home_score', 'away_score']
+# Upserted on the primary key (game_id, player_id, season); rows carry
+# player_name, which BulkWriter resolves to player_id before writing
+STAT_REFRESH_COLUMNS = [c.name for c in NBAPlayerStat.__table__.columns if not c.primary_key]
 
-def scrape_nba_month(season: int, month_slug: str):
+# Games dated today are only checked from this hour (server clock) on
+FINAL_AFTER_HOUR = int(os.environ.get("NBA_FINAL_AFTER_HOUR", "22"))
+
+
+def scrape_nba_month(season: int, month_slug: str, concurrent: bool = False,
+                     requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                     max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                     parse_workers: int = DEFAULT_PARSE_WORKERS):
     """
     Scrape NBA games for a specific month.
     month_slug: 'january', 'february', etc.
+    concurrent: fetch up to max_in_flight box scores at a time instead of
+    one. Both modes are paced by the shared per-host rate limiter.
+    parse_workers: processes for the parse stage (0 = a thread).
     """
-    url = f"{BR_BASE}/leagues/NBA_{season}_games-{month_slug}.html"
-    print(f"Fetching {url}...")
-    
     try:
-        response = requests.get(url, timeout=10, headers=HEADERS)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all box score links
-        links = soup.select('td[data-stat="box_score_text"] a')
-        game_urls = [BR_BASE + a['href'] for a in links]
-        
-        print(f"Found {len(game_urls)} games for {season} {month_slug}")
-        
-        with Session(engine) as db:
-            for url in game_urls:
-                scrape_single_game(url, season, db)
-                time.sleep(3)  # Rate limiting
-                
+        return scrape(ADAPTER, {'season': season, 'month_slug': month_slug},
+                      requests_per_minute=requests_per_minute,
+                      max_in_flight=max_in_flight if concurrent else 1,
+                      parse_workers=parse_workers)
     except Exception as e:
-        print(f"Error scraping {season} {month_slug}: {e}")
+        log_event("scrape.error", sport="nba", season=season, month=month_slug, error=str(e))
+        raise
+
+
+def discover_month(season: int = None, month_slug: str = None) -> Discovery:
+    """Box score pages linked from a schedule month page; defaults to the current month"""
+    now = datetime.now()
+    season = season or season_for_date(now)
+    month_slug = month_slug or month_slug_for_date(now)
+    html = fetch(f"{BR_BASE}/leagues/NBA_{season}_games-{month_slug}.html", headers=HEADERS)
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find all box score links
+    links = soup.select('td[data-stat="box_score_text"] a')
+    return box_score_pages([BR_BASE + a['href'] for a in links], season)
+
 
+def box_score_pages(game_urls, season: int) -> Discovery:
+    return Discovery({url: game_id_from_url(url) for url in game_urls}, {'season': season})
 
-def scrape_single_game(url: str, season: int, db: Session):
+
+def scrape_games_concurrent(game_urls, season: int,
+                            requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                            parse_workers: int = DEFAULT_PARSE_WORKERS):
+    """
+    Scrape box scores through the async pipeline.
+    Network waits overlap with parsing and DB writes while request starts
+    stay inside the per-host rate limit (and requests_per_minute, if set).
+    """
+    return scrape_pages(ADAPTER, box_score_pages(game_urls, season),
+                        requests_per_minute=requests_per_minute,
+                        max_in_flight=max_in_flight,
+                        parse_workers=parse_workers,
+                        season=season, concurrent=True)
+
+
+def game_id_from_url(url: str) -> str:
+    """Box score URL -> game_id, e.g. .../boxscores/202501010LAL.html -> 202501010LAL"""
+    return url.rstrip('/').split('/')[-1].replace('.html', '')
+
+
+def scrape_single_game(url: str, season: int, db: Session, writer: BulkWriter = None):
     """
     Scrape a single NBA game's box score.
+    Rows are queued on writer when given (the caller flushes it),
+    otherwise they are written straight away.
     """
-    game_id = url.rstrip('/').split('/')[-1].replace('.html', '')
+    game_id = game_id_from_url(url)
     
     # Check if already scraped
     existing = db.query(NBAGame).filter(NBAGame.game_id == game_id).first()
     if existing:
-        print(f"  {game_id} already scraped, skipping")
+        log_event("games.skipped", sport="nba", games=1, game_id=game_id)
         return
     
+    if writer is None:
+        with BulkWriter(db) as single:
+            scrape_game(url, season, single)
+    else:
+        scrape_game(url, season, writer)
+
+
+def scrape_game(url: str, season: int, writer: BulkWriter):
+    """
+    Fetch, parse and queue one box score without checking whether it is
+    already stored.
+    """
     try:
-        response = requests.get(url, timeout=10, headers=HEADERS)
-        response.raise_for_status()
-        html = response.text
-        
-        # Basketball-Reference hides tables in comments
-        html = html.replace('<!--', '').replace('-->', '')
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extract game metadata
-        scorebox = soup.find('div', {'class': 'scorebox'})
-        if not scorebox:
-            print(f"  No scorebox found for {game_id}")
-            return
-        
-        teams = scorebox.find_all('div', recursive=False)
-        if len(teams) < 2:
-            print(f"  Could not parse teams for {game_id}")
-            return
-        
-        away_team = teams[0].find('a').text if teams[0].find('a') else teams[0].find('strong').text
-        home_team = teams[1].find('a').text if teams[1].find('a') else teams[1].find('strong').text
-        
-        scores = scorebox.find_all('div', {'class': 'score'})
-        away_score = int(scores[0].text) if len(scores) > 0 and scores[0].text.strip() else None
-        home_score = int(scores[1].text) if len(scores) > 1 and scores[1].text.strip() else None
-        
-        # Extract date
-        meta = soup.find('div', {'class': 'scorebox_meta'})
-        date_str = meta.find('div').text if meta else game_id[:8]
-        game_date = datetime.strptime(game_id[:8], '%Y%m%d').date()
-        
-        # Save game
-        game = NBAGame(
-            game_id=game_id,
-            date=game_date,
-            home_team=home_team,
-            away_team=away_team,
-            home_score=home_score,
-            away_score=away_score,
-            season=season
-        )
-        db.add(game)
-        db.commit()
-        
-        # Extract player stats
-        tables = soup.find_all('table', {'id': re.compile(r'box-.*-game-basic')})
-        
-        for table in tables:
-            team_abbr = table.get('id', '').split('-')[1]
-            df = pd.read_html(str(table), header=1)[0]
-            
-            # Clean dataframe
-            df = df[df['Player'] != 'Player']  # Remove header rows
-            df = df[df['Player'].notna()]  # Remove empty rows
-            df = df[~df['Player'].str.contains('Reserves|Did Not Play', na=False)]
-            
-            for _, row in df.iterrows():
-                player_stat = NBAPlayerStat(
-                    game_id=game_id,
-                    player_name=row.get('Player', ''),
-                    team=team_abbr,
-                    minutes=str(row.get('MP', '')),
-                    points=safe_int(row.get('PTS')),
-                    rebounds=safe_int(row.get('TRB')),
-                    assists=safe_int(row.get('AST')),
-                    steals=safe_int(row.get('STL')),
-                    blocks=safe_int(row.get('BLK')),
-                    turnovers=safe_int(row.get('TOV')),
-                    fg_made=safe_int(row.get('FG')),
-                    fg_attempted=safe_int(row.get('FGA')),
-                    three_made=safe_int(row.get('3P')),
-                    three_attempted=safe_int(row.get('3PA')),
-                    ft_made=safe_int(row.get('FT')),
-                    ft_attempted=safe_int(row.get('FTA'))
-                )
-                db.add(player_stat)
-        
-        db.commit()
-        print(f"  ✓ Scraped {game_id}: {away_team} @ {home_team}")
-        
+        scrape_page(ADAPTER, url, writer, season=season)
     except Exception as e:
-        db.rollback()
-        print(f"  Error scraping {game_id}: {e}")
+        log_event("scrape.error", sport="nba", game_id=game_id_from_url(url), error=str(e))
+        raise
 
 
-def safe_int(value):
-    """Convert to int, return None if fails"""
-    try:
-        return int(float(value)) if pd.notna(value) else None
-    except:
+def parse_box_score_page(url: str, html, season: int):
+    """Engine parse step; module-level so it can run in a worker process"""
+    return parse_box_score(html, game_id_from_url(url), season)
+
+
+def parse_box_score(html, game_id: str, season: int):
+    """
+    Parse a box score page into (game, player_stats) dicts.
+    Returns None if the page has no usable scorebox.
+    """
+    return parse_nba_box_score(html, game_id, season)
+
+
+def parse_box_score_bs4(html: str, game_id: str, season: int):
+    """
+    Reference BeautifulSoup + pd.read_html implementation of parse_box_score.
+    Roughly 10-20x slower; kept to check the lxml parser against.
+    """
+    # Basketball-Reference hides tables in comments
+    html = html.replace('<!--', '').replace('-->', '')
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Extract game metadata
+    scorebox = soup.find('div', {'class': 'scorebox'})
+    if not scorebox:
+        log_event("parse.skipped", sport="nba", game_id=game_id, reason="no scorebox")
+        return None
+    
+    teams = scorebox.find_all('div', recursive=False)
+    if len(teams) < 2:
+        log_event("parse.skipped", sport="nba", game_id=game_id, reason="no teams")
         return None
+    
+    away_team = teams[0].find('a').text if teams[0].find('a') else teams[0].find('strong').text
+    home_team = teams[1].find('a').text if teams[1].find('a') else teams[1].find('strong').text
+    
+    scores = scorebox.find_all('div', {'class': 'score'})
+    away_score = int(scores[0].text) if len(scores) > 0 and scores[0].text.strip() else None
+    home_score = int(scores[1].text) if len(scores) > 1 and scores[1].text.strip() else None
+    
+    game_date = datetime.strptime(game_id[:8], '%Y%m%d').date()
+    
+    game = {
+        'game_id': game_id,
+        'date': game_date,
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_score': home_score,
+        'away_score': away_score,
+        'season': season,
+    }
+    
+    # Extract player stats
+    player_stats = []
+    tables = soup.find_all('table', {'id': re.compile(r'box-.*-game-basic')})
+    
+    for table in tables:
+        team_abbr = table.get('id', '').split('-')[1]
+        df = pd.read_html(StringIO(str(table)), header=1)[0]
+        df = df.rename(columns={df.columns[0]: 'Player'})  # 'Starters' header
+        
+        # Clean dataframe
+        df = df[df['Player'] != 'Player']  # Remove header rows
+        df = df[df['Player'].notna()]  # Remove empty rows
+        df = df[~df['Player'].str.contains('Reserves|Did Not Play|Team Totals', na=False)]
+        
+        player_stats.extend(frame_to_records(df, 'nba_basic', game_id=game_id, team=team_abbr))
+    
+    return game, player_stats
+
+
+def save_box_score(writer: BulkWriter, game: dict, player_stats: list, refresh: bool = False):
+    """
+    Queue a parsed box score on the bulk writer. refresh upserts over a
+    game and player lines that are already stored instead of skipping them.
+    """
+    # Player lines carry their game's season, the partition key
+    player_stats = [{**row, 'season': game['season']} for row in player_stats]
+    if refresh:
+        writer.add(NBAGame, game, GAME_REFRESH_COLUMNS)
+        writer.add_many(NBAPlayerStat, player_stats, STAT_REFRESH_COLUMNS)
+    else:
+        writer.add(NBAGame, game)
+        writer.add_many(NBAPlayerStat, player_stats)
+    log_event("game.scraped", sport="nba", game_id=game['game_id'], away=game['away_team'],
+              home=game['home_team'], players=len(player_stats), refresh=refresh or None)
+
+
+def save_box_score_page(writer: BulkWriter, result):
+    """Engine save step for parse_box_score_page's (game, player_stats)"""
+    save_box_score(writer, *result)
+
+
+ADAPTER = SportAdapter("nba", NBAGame.game_id, discover_month, parse_box_score_page,
+                       save_box_score_page, headers=HEADERS)
+
+
+def box_score_url(game_id: str) -> str:
+    return f"{BR_BASE}/boxscores/{game_id}.html"
+
+
+def is_final(game: dict, player_stats: list) -> bool:
+    return game['home_score'] is not None and game['away_score'] is not None and bool(player_stats)
+
+
+def unfinished_games(db: Session, days: int = None, now: datetime = None) -> list:
+    """
+    (game_id, season) of stored games that should be over but still have no
+    score or no box-score rows, oldest first. days limits how far back to look.
+    """
+    now = now or datetime.now()
+    latest = now.date() if now.hour >= FINAL_AFTER_HOUR else now.date() - timedelta(days=1)
+    has_stats = exists().where(NBAPlayerStat.game_id == NBAGame.game_id,
+                               NBAPlayerStat.season == NBAGame.season)
+    stmt = (
+        select(NBAGame.game_id, NBAGame.season)
+        .where(NBAGame.date <= latest, or_(NBAGame.home_score.is_(None), ~has_stats))
+        .order_by(NBAGame.date, NBAGame.game_id)
+    )
+    if days is not None:
+        stmt = stmt.where(NBAGame.date >= now.date() - timedelta(days=days))
+    return db.execute(stmt).all()
+
+
+def refresh_unfinished_games(days: int = None):
+    """
+    Re-fetch the box score of every unfinished game and upsert its score and
+    player lines once it is final. One request per open game; month pages
+    are not re-scanned. Returns the number of games completed; raises
+    ScrapeError when no box score could be fetched.
+    """
+    completed = failed = 0
+    with scrape_run("nba", "refresh.done", days=days), \
+            Session(engine) as db, BulkWriter(db) as writer:
+        games = unfinished_games(db, days)
+        log_event("games.unfinished", sport="nba", games=len(games))
+        for game_id, season in games:
+            try:
+                # The cached copy may predate the final score
+                html = fetch(box_score_url(game_id), headers=HEADERS, revalidate=True)
+                with timed(PARSE_SECONDS, "parse", sport="nba", game_id=game_id):
+                    result = parse_box_score(html, game_id, season)
+            except Exception as e:
+                log_event("scrape.error", sport="nba", game_id=game_id, error=str(e))
+                failed += 1
+                continue
+            if result is None or not is_final(*result):
+                log_event("game.pending", sport="nba", game_id=game_id)
+                continue
+            save_box_score(writer, *result, refresh=True)
+            completed += 1
+        writer.flush()
+    if games and failed == len(games):
+        raise ScrapeError(f"all {failed} unfinished nba box scores failed")
+    return completed
+
+
+def season_for_date(day) -> int:
+    """Basketball-Reference names seasons by the year they end: Nov 2025 -> 2026"""
+    return day.year + 1 if day.month > 6 else day.year
+
+
+def month_slug_for_date(day) -> str:
+    return day.strftime('%B').lower()
 
 
 def scrape_current_month():
     """Scrape current month's games"""
     now = datetime.now()
-    season = now.year if now.month > 6 else now.year
-    month_slug = now.strftime('%B').lower()
+    season = season_for_date(now)
+    month_slug = month_slug_for_date(now)
     scrape_nba_month(season, month_slug)
 
 
+def scrape_recent_days(days: int = 4):
+    """Scrape the schedule month(s) covering today and the past N-1 days"""
+    now = datetime.now()
+    months = []
+    for day_offset in range(days):
+        target_date = now - timedelta(days=day_offset)
+        months.append((season_for_date(target_date), month_slug_for_date(target_date)))
+    # Each month page covers every day in it, so scrape it once. A failed
+    # month doesn't stop the others; the first failure is raised at the end.
+    failures = []
+    for season, month_slug in dict.fromkeys(months):
+        try:
+            scrape_nba_month(season, month_slug)
+        except Exception as e:
+            failures.append(e)
+    if failures:
+        raise failures[0]
+
+
 def scrape_upcoming_days(days=4):
     """
     Scrape NBA games for today and the next N days.
     This matches what Underdog Fantasy shows.
+    Raises ScrapeError when no day's page could be fetched.
     """
-    from datetime import timedelta
-    
-    print(f"Scraping NBA games for the next {days} days...")
-    
     now = datetime.now()
-    season = now.year if now.month > 6 else now.year
+    season = season_for_date(now)
     
-    with Session(engine) as db:
+    candidates = []
+    failed_days = 0
+    with scrape_run("nba", "scrape.done", days=days), Session(engine) as db, BulkWriter(db) as writer:
         for day_offset in range(days):
             target_date = now + timedelta(days=day_offset)
             date_str = target_date.strftime('%Y-%m-%d')
             
             # Basketball-Reference uses format: /boxscores/?month=01&day=10&year=2026
             url = f"{BR_BASE}/boxscores/?month={target_date.month:02d}&day={target_date.day:02d}&year={target_date.year}"
-            print(f"Fetching games for {date_str}...")
             
             try:
-                response = requests.get(url, timeout=10, headers=HEADERS)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
+                html = fetch(url, headers=HEADERS)
+                soup = BeautifulSoup(html, 'html.parser')
                 
                 # Find all game boxes
                 game_divs = soup.find_all('div', class_='game_summary')
-                print(f"Found {len(game_divs)} games for {date_str}")
+                log_event("games.found", sport="nba", date=date_str, games=len(game_divs))
                 
                 for game_div in game_divs:
                     try:
@@ -197,15 +358,8 @@ def scrape_upcoming_days(days=4):
                         if not link:
                             continue
                         
-                        game_url = BR_BASE + link['href']
                         game_id = link['href'].split('/')[-1].replace('.html', '')
                         
-                        # Check if already scraped
-                        existing = db.query(NBAGame).filter(NBAGame.game_id == game_id).first()
-                        if existing:
-                            print(f"  {game_id} already scraped, skipping")
-                            continue
-                        
                         # Extract teams
                         teams = game_div.find_all('a', itemprop='name')
                         if len(teams) < 2:
@@ -225,31 +379,38 @@ def scrape_upcoming_days(days=4):
                             except:
                                 pass  # Game hasn't finished yet
                         
-                        # Create game record
-                        game = NBAGame(
-                            game_id=game_id,
-                            date=target_date.date(),
-                            home_team=home_team,
-                            away_team=away_team,
-                            home_score=home_score,
-                            away_score=away_score,
-                            season=season
-                        )
-                        db.add(game)
-                        print(f"  ✓ Added {away_team} @ {home_team}")
+                        candidates.append({
+                            'game_id': game_id,
+                            'date': target_date.date(),
+                            'home_team': home_team,
+                            'away_team': away_team,
+                            'home_score': home_score,
+                            'away_score': away_score,
+                            'season': season
+                        })
                         
                     except Exception as e:
-                        print(f"  Error processing game: {e}")
+                        log_event("scrape.error", sport="nba", date=date_str, error=str(e))
                         continue
                 
-                db.commit()
-                time.sleep(2)  # Rate limiting
-                
             except Exception as e:
-                print(f"Error fetching {date_str}: {e}")
+                log_event("scrape.error", sport="nba", date=date_str, error=str(e))
+                failed_days += 1
                 continue
-    
-    print("✓ Finished scraping upcoming games")
+        if days and failed_days == days:
+            raise ScrapeError(f"all {days} nba schedule days failed")
+        
+        # One lookup for every game found across the requested days
+        stored = existing_ids(db, NBAGame.game_id, [game['game_id'] for game in candidates])
+        if stored:
+            log_event("games.skipped", sport="nba", games=len(stored))
+        for game in candidates:
+            if game['game_id'] in stored:
+                continue
+            stored.add(game['game_id'])
+            writer.add(NBAGame, game)
+            log_event("game.added", sport="nba", game_id=game['game_id'],
+                      away=game['away_team'], home=game['home_team'])
 
 
 if __name__ == "__main__":
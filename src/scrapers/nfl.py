@@ -1,30 +1,81 @@
-"""NFL scraper - Pro-Football-Reference.com"""
-import requests
-from bs4 import BeautifulSoup
+"""NFL scraper using Pro-Football-Reference"""
+import re
 from datetime import datetime
-from sqlalchemy.orm import Session
+from bs4 import BeautifulSoup
+from src.database.models import NFLGame, NFLPlayerStat
+from src.database.bulk import BulkWriter
+from src.scrapers.columns import safe_int
+from src.scrapers.core import Discovery, SportAdapter, scrape
+from src.scrapers.http_cache import fetch
+from src.scrapers.lxml_parsers import parse_nfl_box_score
+from src.scrapers.pipeline import DEFAULT_MAX_IN_FLIGHT, DEFAULT_PARSE_WORKERS
+from src.metrics import log_event
+
+PFR_BASE = "https://www.pro-football-reference.com"
+
+_BOX_SCORE = re.compile(r'/boxscores/(\w+)\.htm$')
+
+
+def season_for_date(day) -> int:
+    """NFL seasons are named by the year they start: Jan 2026 playoffs -> 2025"""
+    return day.year if day.month >= 8 else day.year - 1
+
+
+def game_id_from_url(url: str) -> str:
+    """Box score URL -> game_id, e.g. .../boxscores/202509040phi.htm -> 202509040phi"""
+    return _BOX_SCORE.search(url).group(1)
+
+
+def discover_season(season: int = None) -> Discovery:
+    """Box score pages of every played game on a season's schedule, with each game's week"""
+    season = season or season_for_date(datetime.now())
+    html = fetch(f"{PFR_BASE}/years/{season}/games.htm")
+    soup = BeautifulSoup(html, 'html.parser')
 
-def scrape_nfl_data(session: Session, season: int = 2026):
-    """Scrape NFL data from Pro-Football-Reference"""
+    pages, weeks = {}, {}
+    for row in soup.select('table#games tbody tr'):
+        # Upcoming games link a preview instead
+        link = row.select_one('td[data-stat="boxscore_word"] a')
+        if link is None or not _BOX_SCORE.search(link['href']):
+            continue
+        game_id = game_id_from_url(link['href'])
+        week = row.select_one('th[data-stat="week_num"]')
+        pages[PFR_BASE + link['href']] = game_id
+        weeks[game_id] = safe_int(week.get_text(strip=True)) if week else None
+    return Discovery(pages, {'season': season, 'weeks': weeks})
+
+
+def parse_box_score_page(url: str, html, season: int, weeks: dict):
+    """Engine parse step; module-level so it can run in a worker process"""
+    game_id = game_id_from_url(url)
+    return parse_nfl_box_score(html, game_id, season, weeks.get(game_id))
+
+
+def save_box_score(writer: BulkWriter, result):
+    game, player_stats = result
+    writer.add(NFLGame, game)
+    writer.add_many(NFLPlayerStat, player_stats)
+    log_event("game.scraped", sport="nfl", game_id=game['game_id'], away=game['away_team'],
+              home=game['home_team'], players=len(player_stats))
+
+
+ADAPTER = SportAdapter("nfl", NFLGame.game_id, discover_season, parse_box_score_page,
+                       save_box_score)
+
+
+def scrape_nfl_season(season: int = None, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                      parse_workers: int = DEFAULT_PARSE_WORKERS):
+    """
+    Scrape every played game of an NFL season not stored yet.
+    season: the year the season starts, e.g. 2025; defaults to the current one.
+    """
     try:
-        # Placeholder - framework structure
-        # TODO: Implement actual scraping logic
-        from src.database.models import NFLGame, NFLTeam, NFLPlayer, NFLPlayerStats
-        
-        print(f"NFL scraper initialized for season {season}")
-        
-        # Return placeholder data for framework
-        return {
-            "status": "success",
-            "message": f"NFL scraper framework ready",
-            "games_scraped": 0,
-            "teams_scraped": 0,
-            "players_scraped": 0
-        }
-        
+        return scrape(ADAPTER, {'season': season}, max_in_flight=max_in_flight,
+                      parse_workers=parse_workers)
     except Exception as e:
-        print(f"Error in NFL scraper: {str(e)}")
-        return {
-            "status": "error",
-            "message": str(e)
-        }
+        log_event("scrape.error", sport="nfl", season=season, error=str(e))
+        raise
+
+
+if __name__ == "__main__":
+    scrape_nfl_season()
@@ -1,14 +1,73 @@
-"""NHL scraper - Hockey-Reference.com"""
-import requests
-from bs4 import BeautifulSoup
+"""NHL scraper using Hockey-Reference"""
+import re
 from datetime import datetime
-from sqlalchemy.orm import Session
+from bs4 import BeautifulSoup
+from src.database.models import NHLGame, NHLPlayerStat
+from src.database.bulk import BulkWriter
+from src.scrapers.core import Discovery, SportAdapter, scrape
+from src.scrapers.http_cache import fetch
+from src.scrapers.lxml_parsers import parse_nhl_box_score
+from src.scrapers.pipeline import DEFAULT_MAX_IN_FLIGHT, DEFAULT_PARSE_WORKERS
+from src.metrics import log_event
+
+HR_BASE = "https://www.hockey-reference.com"
+
+_BOX_SCORE = re.compile(r'/boxscores/(\d{9}\w+)\.html$')
+
+
+def season_for_date(day) -> int:
+    """Hockey-Reference names seasons by the year they end: Oct 2025 -> 2026"""
+    return day.year + 1 if day.month > 6 else day.year
+
+
+def game_id_from_url(url: str) -> str:
+    """Box score URL -> game_id, e.g. .../boxscores/202510070FLA.html -> 202510070FLA"""
+    return _BOX_SCORE.search(url).group(1)
+
+
+def discover_season(season: int = None) -> Discovery:
+    """Box score pages of every played game on a season's schedule"""
+    season = season or season_for_date(datetime.now())
+    html = fetch(f"{HR_BASE}/leagues/NHL_{season}_games.html")
+    soup = BeautifulSoup(html, 'html.parser')
 
-def scrape_nhl_data(session: Session, season: int = 2026):
-    """Scrape NHL data from Hockey-Reference"""
+    # Played games link their box score from the date cell
+    links = soup.select('table#games th[data-stat="date_game"] a')
+    pages = {HR_BASE + a['href']: game_id_from_url(a['href'])
+             for a in links if _BOX_SCORE.search(a['href'])}
+    return Discovery(pages, {'season': season})
+
+
+def parse_box_score_page(url: str, html, season: int):
+    """Engine parse step; module-level so it can run in a worker process"""
+    return parse_nhl_box_score(html, game_id_from_url(url), season)
+
+
+def save_box_score(writer: BulkWriter, result):
+    game, player_stats = result
+    writer.add(NHLGame, game)
+    writer.add_many(NHLPlayerStat, player_stats)
+    log_event("game.scraped", sport="nhl", game_id=game['game_id'], away=game['away_team'],
+              home=game['home_team'], players=len(player_stats))
+
+
+ADAPTER = SportAdapter("nhl", NHLGame.game_id, discover_season, parse_box_score_page,
+                       save_box_score)
+
+
+def scrape_nhl_season(season: int = None, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                      parse_workers: int = DEFAULT_PARSE_WORKERS):
+    """
+    Scrape every played game of an NHL season not stored yet.
+    season: the year the season ends, e.g. 2026 for 2025-26; defaults to the current one.
+    """
     try:
-        from src.database.models import NHLGame, NHLTeam, NHLPlayer, NHLPlayerStats
-        print(f"NHL scraper initialized for season {season}")
-        return {"status": "success", "message": "NHL scraper framework ready", "games_scraped": 0}
+        return scrape(ADAPTER, {'season': season}, max_in_flight=max_in_flight,
+                      parse_workers=parse_workers)
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        log_event("scrape.error", sport="nhl", season=season, error=str(e))
+        raise
+
+
+if __name__ == "__main__":
+    scrape_nhl_season()
@@ -0,0 +1,170 @@
+"""Async fetch -> parse -> write pipeline shared by the scrapers"""
+import os
+import asyncio
+import contextlib
+import time
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+from src.scrapers.http_cache import fetch_raw_async, decode
+from src.metrics import PARSE_SECONDS, log_event, sport_for_url
+
+# Per-run politeness cap; None leaves pacing to the shared per-host limiter
+DEFAULT_REQUESTS_PER_MINUTE = None
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_QUEUE_SIZE = 16
+# Worker processes for the parse stage; 0 parses on a thread in this process
+DEFAULT_PARSE_WORKERS = int(os.environ.get("SCRAPER_PARSE_WORKERS", "0"))
+
+_DONE = object()
+
+
+class Politeness:
+    """Spaces out request starts so the pipeline stays inside a requests/minute budget"""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now = time.monotonic()
+            self._next_start = now + self.interval
+
+
+async def _fetch_stage(session, urls, parse_q, politeness, timeout, headers, revalidate, stats):
+    while True:
+        try:
+            url = urls.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            content, encoding = await fetch_raw_async(
+                session, url, timeout=timeout, throttle=politeness.wait, headers=headers,
+                revalidate=revalidate,
+            )
+            await parse_q.put((url, content, encoding))
+        except Exception as e:
+            stats["errors"] += 1
+            log_event("fetch.error", sport=sport_for_url(url), url=url, error=str(e))
+
+
+def _decode_and_parse(parse, url, content, encoding):
+    # Runs in the parse worker, so decoding is off the event loop too.
+    # Timed here rather than around the executor call to leave out pickling.
+    started = time.perf_counter()
+    result = parse(url, decode(content, encoding))
+    return result, time.perf_counter() - started
+
+
+async def _parse_stage(parse_q, write_q, parse, pool, stats):
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await parse_q.get()
+        if item is _DONE:
+            return
+        url, content, encoding = item
+        try:
+            result, seconds = await loop.run_in_executor(
+                pool, _decode_and_parse, parse, url, content, encoding
+            )
+        except Exception as e:
+            stats["errors"] += 1
+            log_event("parse.error", sport=sport_for_url(url), url=url, error=str(e))
+            continue
+        sport = sport_for_url(url)
+        PARSE_SECONDS.observe(seconds, sport=sport)
+        log_event("parse", sport=sport, seconds=seconds, url=url)
+        if result is not None:
+            await write_q.put(result)
+
+
+async def _write_stage(write_q, write, stats):
+    while True:
+        result = await write_q.get()
+        if result is _DONE:
+            return
+        try:
+            await asyncio.to_thread(write, result)
+            stats["saved"] += 1
+        except Exception as e:
+            stats["errors"] += 1
+            log_event("write.error", error=str(e))
+
+
+async def run_pipeline(
+    urls,
+    parse,
+    write,
+    headers=None,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    timeout: float = 10,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+    session=None,
+    politeness: Politeness = None,
+    pool=None,
+    revalidate: bool = False,
+):
+    """
+    Fetch every URL concurrently and feed the pages through parse and write.
+    parse(url, html) -> result or None, runs off the event loop.
+    write(result) runs off the event loop, one result at a time.
+    parse_workers > 0 ships raw page bytes to a process pool of that size so
+    parsing uses several cores; parse must then be picklable (a module-level
+    function or a functools.partial of one) and return picklable records.
+    session, politeness and pool let several pipelines share one connection
+    pool, one requests/minute budget and one set of parse processes; the
+    pipeline creates (and closes) its own when they are not given.
+    revalidate re-checks cached pages with the origin even when they look
+    fresh (see http_cache.fetch).
+    Returns a stats dict with counts and elapsed seconds. saved counts
+    results write() accepted; when write only buffers them, whether they
+    were stored is up to the caller to check.
+    """
+    url_q = asyncio.Queue()
+    for url in urls:
+        url_q.put_nowait(url)
+
+    parse_q = asyncio.Queue(maxsize=queue_size)
+    write_q = asyncio.Queue(maxsize=queue_size)
+    politeness = politeness or Politeness(requests_per_minute)
+    stats = {"urls": url_q.qsize(), "saved": 0, "errors": 0}
+
+    own_pool = pool is None and parse_workers > 0
+    if own_pool:
+        pool = ProcessPoolExecutor(parse_workers)
+    started = time.monotonic()
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            if session is None:
+                session = await stack.enter_async_context(aiohttp.ClientSession())
+            writer = asyncio.create_task(_write_stage(write_q, write, stats))
+            parsers = [
+                asyncio.create_task(_parse_stage(parse_q, write_q, parse, pool, stats))
+                for _ in range(max(1, parse_workers))
+            ]
+            fetchers = [
+                asyncio.create_task(
+                    _fetch_stage(session, url_q, parse_q, politeness, timeout, headers, revalidate,
+                                 stats)
+                )
+                for _ in range(max(1, max_in_flight))
+            ]
+            await asyncio.gather(*fetchers)
+            for _ in parsers:
+                await parse_q.put(_DONE)
+            await asyncio.gather(*parsers)
+            await write_q.put(_DONE)
+            await writer
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    stats["elapsed"] = time.monotonic() - started
+    return stats
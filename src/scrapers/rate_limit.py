@@ -0,0 +1,246 @@
+"""
+Per-host token-bucket rate limiter shared by every scraper process on a box.
+
+Bucket state lives in a small SQLite file, so concurrent workers draw from
+the same budget. Throttling responses (429/503, or anything carrying
+Retry-After) halve the host's rate, block it for a growing backoff and,
+repeated, open a circuit breaker that fails fast until a cooldown has
+passed. Connection errors, timeouts and other 5xx say nothing about our
+request rate: they neither back off nor slow the host, and only a much
+longer unbroken run of them opens the circuit. Successful responses creep
+the rate back up towards its ceiling.
+"""
+import os
+import time
+import sqlite3
+import asyncio
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from src.metrics import THROTTLE_SECONDS, log_event, sport_for_url
+
+RATE_LIMIT_DB = os.environ.get("SCRAPER_RATE_LIMIT_DB", ".cache/rate_limit.sqlite")
+
+THROTTLE_STATUSES = (429, 503)
+CIRCUIT_THRESHOLD = 5        # consecutive throttling responses before the circuit opens
+ERROR_CIRCUIT_THRESHOLD = 50  # consecutive errors (no response, other 5xx) before it opens
+CIRCUIT_COOLDOWN = 15 * 60   # seconds the circuit stays open
+BASE_BACKOFF = 30            # seconds, doubled per consecutive failure
+MAX_BACKOFF = 10 * 60
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+@dataclass
+class HostLimit:
+    requests_per_minute: float
+    burst: float = 1
+    min_requests_per_minute: float = 2
+    recovery_per_success: float = 0.5
+
+
+HOST_LIMITS = {
+    "basketball-reference.com": HostLimit(20),
+    "sports-reference.com": HostLimit(20),
+    "pro-football-reference.com": HostLimit(20),
+    "hockey-reference.com": HostLimit(20),
+    "gol.gg": HostLimit(30, burst=2),
+}
+DEFAULT_LIMIT = HostLimit(30)
+
+
+def _load_overrides():
+    # SCRAPER_RATE_LIMITS="basketball-reference.com=15,gol.gg=40"
+    for item in os.environ.get("SCRAPER_RATE_LIMITS", "").split(","):
+        host, _, rpm = item.partition("=")
+        if host.strip() and rpm.strip():
+            limit = HOST_LIMITS.get(host.strip(), HostLimit(DEFAULT_LIMIT.requests_per_minute))
+            limit.requests_per_minute = float(rpm)
+            HOST_LIMITS[host.strip()] = limit
+
+
+_load_overrides()
+
+
+def host_key(url: str) -> str:
+    """Bucket key for a URL: the configured domain it belongs to, else its hostname"""
+    host = (urlsplit(url).hostname or "").lower()
+    for domain in HOST_LIMITS:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return host
+
+
+def parse_retry_after(value):
+    """Retry-After header (seconds or HTTP date) -> seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    def __init__(self, path: str = RATE_LIMIT_DB):
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # One connection per process; reconnect after fork
+        if self._conn is None or self._pid != os.getpid():
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    host TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    rate REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    blocked_until REAL NOT NULL DEFAULT 0,
+                    failures INTEGER NOT NULL DEFAULT 0,
+                    circuit_open_until REAL NOT NULL DEFAULT 0,
+                    errors INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(buckets)")}
+            if "errors" not in columns:
+                # State files written before errors were counted apart from throttling
+                conn.execute("ALTER TABLE buckets ADD COLUMN errors INTEGER NOT NULL DEFAULT 0")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _transaction(self, host: str, update):
+        """Run update(state, now) -> result on the host's row under an exclusive lock"""
+        limit = HOST_LIMITS.get(host, DEFAULT_LIMIT)
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT tokens, rate, updated_at, blocked_until, failures, circuit_open_until, "
+                    "errors FROM buckets WHERE host = ?", (host,)
+                ).fetchone()
+                if row is None:
+                    row = (limit.burst, limit.requests_per_minute, now, 0.0, 0, 0.0, 0)
+                state = dict(zip(
+                    ("tokens", "rate", "updated_at", "blocked_until", "failures", "circuit_open_until",
+                     "errors"),
+                    row,
+                ))
+                # Refill at the current (possibly backed-off) rate
+                elapsed = max(0.0, now - state["updated_at"])
+                state["tokens"] = min(limit.burst, state["tokens"] + elapsed * state["rate"] / 60)
+                state["updated_at"] = now
+
+                result = update(state, now, limit)
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets "
+                    "(host, tokens, rate, updated_at, blocked_until, failures, circuit_open_until, "
+                    "errors) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (host, state["tokens"], state["rate"], state["updated_at"],
+                     state["blocked_until"], state["failures"], state["circuit_open_until"],
+                     state["errors"]),
+                )
+                conn.execute("COMMIT")
+                return result
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for url's host and return how long to wait before sending.
+        Raises CircuitOpenError while the host's circuit is open.
+        """
+        host = host_key(url)
+
+        def update(state, now, limit):
+            if state["circuit_open_until"] > now:
+                raise CircuitOpenError(
+                    f"circuit open for {host} for another {state['circuit_open_until'] - now:.0f}s"
+                )
+            # Tokens may go negative: the deficit is this caller's place in line
+            state["tokens"] -= 1
+            wait = max(0.0, -state["tokens"] * 60 / state["rate"])
+            return max(wait, state["blocked_until"] - now)
+
+        return self._transaction(host, update)
+
+    def acquire(self, url: str):
+        """Block until a request to url's host is allowed"""
+        wait = self.reserve(url)
+        THROTTLE_SECONDS.observe(max(wait, 0.0), sport=sport_for_url(url))
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """
+        acquire() for coroutines. The SQLite transaction runs on a thread so
+        waiting on another process's lock never blocks the event loop.
+        """
+        wait = await asyncio.to_thread(self.reserve, url)
+        THROTTLE_SECONDS.observe(max(wait, 0.0), sport=sport_for_url(url))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, url: str, status=None, retry_after=None) -> float:
+        """
+        Feed a response back into the host's bucket.
+        status None means the request failed without a response.
+        Returns the backoff in seconds imposed on the host (0 unless throttled).
+        """
+        host = host_key(url)
+        retry_after = parse_retry_after(retry_after)
+        throttled = status in THROTTLE_STATUSES or (
+            retry_after is not None and status is not None and status >= 400)
+
+        def update(state, now, limit):
+            if not throttled and status is not None and status < 500:
+                state["failures"] = state["errors"] = 0
+                state["rate"] = min(limit.requests_per_minute,
+                                    state["rate"] + limit.recovery_per_success)
+                return 0.0
+
+            if not throttled:
+                # One flaky socket or 500 shouldn't block every worker on the host
+                state["errors"] += 1
+                if state["errors"] >= ERROR_CIRCUIT_THRESHOLD:
+                    state["circuit_open_until"] = now + CIRCUIT_COOLDOWN
+                    log_event("circuit.open", host=host, errors=state["errors"],
+                              cooldown=CIRCUIT_COOLDOWN)
+                return 0.0
+
+            state["failures"] += 1
+            backoff = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (state["failures"] - 1))
+            state["rate"] = max(limit.min_requests_per_minute, state["rate"] / 2)
+            if retry_after is not None:
+                backoff = retry_after
+            state["blocked_until"] = max(state["blocked_until"], now + backoff)
+            if state["failures"] >= CIRCUIT_THRESHOLD:
+                state["circuit_open_until"] = now + CIRCUIT_COOLDOWN
+                log_event("circuit.open", host=host, failures=state["failures"],
+                          cooldown=CIRCUIT_COOLDOWN)
+            return backoff
+
+        return self._transaction(host, update)
+
+    async def record_async(self, url: str, status=None, retry_after=None) -> float:
+        """record() for coroutines, off the event loop like acquire_async()"""
+        return await asyncio.to_thread(self.record, url, status, retry_after)
+
+
+limiter = RateLimiter()
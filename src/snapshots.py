@@ -0,0 +1,270 @@
+"""
+Local Parquet snapshots of the game and player stat tables for offline modeling.
+
+    python -m src.snapshots                 # append new games for every sport
+    python -m src.snapshots --sport nba --compact
+
+    from src.snapshots import load
+    stats = load("nba_player_stats", seasons=[2025, 2026], columns=["player_name", "points"])
+
+Files live under SNAPSHOT_DIR as <table>/season=<season>/part-00001.parquet.
+A game is snapshotted once it is final (scored, with its player lines
+stored) and never changes after that, so each sync only appends a new part
+holding the games it hasn't seen, plus their player lines under the same
+part name. compact_season() merges a season's parts into one file.
+
+load() reads local files only (memory-mapped, just the requested columns)
+and never imports the database connection, so notebooks need no DATABASE_URL.
+"""
+import argparse
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from src.metrics import log_event
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "snapshots")
+
+# Parts per season before sync compacts them into one file
+SNAPSHOT_COMPACT_PARTS = int(os.environ.get("SNAPSHOT_COMPACT_PARTS", "20"))
+
+# Game keys per IN (...) when fetching new rows
+KEY_CHUNK = 500
+
+_PART = re.compile(r"part-(\d+)\.parquet")
+
+
+@dataclass
+class SnapshotSpec:
+    games: str   # game table
+    stats: str   # player stat table, as named in src.api.export.EXPORTS
+    key: str     # game table primary key
+    season: str  # game table season column
+    final: str   # game table column that stays NULL until the game is over
+
+
+SNAPSHOTS = {
+    "nba": SnapshotSpec("nba_games", "nba_player_stats", "game_id", "season", "home_score"),
+    "cfb": SnapshotSpec("cfb_games", "cfb_player_stats", "game_id", "year", "home_score"),
+    "lol": SnapshotSpec("lol_matches", "lol_player_stats", "match_id", "season", "winner"),
+}
+
+
+# --- reading ------------------------------------------------------------------
+
+def season_dirs(table: str, root: str = None) -> dict:
+    """{season: directory} of a table's snapshot, seasons as strings"""
+    base = os.path.join(root or SNAPSHOT_DIR, table)
+    if not os.path.isdir(base):
+        return {}
+    return {name.split("=", 1)[1]: os.path.join(base, name)
+            for name in sorted(os.listdir(base)) if name.startswith("season=")}
+
+
+def part_files(directory: str) -> list:
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if _PART.fullmatch(name)]
+
+
+def load(table: str, seasons=None, columns=None, arrow: bool = False, root: str = None):
+    """
+    Read a snapshotted table as a pandas DataFrame (or a pyarrow Table with
+    arrow=True). seasons limits which season directories are opened at all;
+    columns limits which columns are decoded. Files are memory-mapped.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    dirs = season_dirs(table, root)
+    if seasons is not None:
+        dirs = {season: path for season, path in dirs.items()
+                if season in {str(s) for s in seasons}}
+    files = [path for directory in dirs.values() for path in part_files(directory)]
+    if not files:
+        raise FileNotFoundError(f"No snapshot of {table} under {root or SNAPSHOT_DIR}"
+                                + (f" for seasons {list(seasons)}" if seasons is not None else ""))
+    result = pa.concat_tables([pq.read_table(path, columns=columns, memory_map=True)
+                               for path in files])
+    return result if arrow else result.to_pandas()
+
+
+# --- writing ------------------------------------------------------------------
+
+def _write_part(path: str, columns, rows):
+    """Write rows atomically: readers see the whole part or nothing"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from src.api.export import arrow_schema
+
+    schema = arrow_schema(columns)
+    values = list(zip(*rows)) or [[] for _ in schema]
+    arrays = [pa.array(list(column), type=field.type) for column, field in zip(values, schema)]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pq.write_table(pa.Table.from_arrays(arrays, schema=schema), path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def _part_number(path: str) -> int:
+    return int(_PART.fullmatch(os.path.basename(path)).group(1))
+
+
+def _local_keys(spec: SnapshotSpec, season) -> set:
+    directory = season_dirs(spec.games).get(str(season))
+    if directory is None:
+        return set()
+    import pyarrow.parquet as pq
+    keys = set()
+    for path in part_files(directory):
+        keys.update(pq.read_table(path, columns=[spec.key], memory_map=True)
+                    .column(spec.key).to_pylist())
+    return keys
+
+
+def _local_counts(spec: SnapshotSpec) -> dict:
+    """{season: games} from Parquet footers, without reading any data"""
+    import pyarrow.parquet as pq
+    return {season: sum(pq.ParquetFile(path).metadata.num_rows for path in part_files(directory))
+            for season, directory in season_dirs(spec.games).items()}
+
+
+def _clean(spec: SnapshotSpec):
+    """
+    Undo interrupted writes: leftover .tmp files, and stat parts whose game
+    part never landed (their games are fetched again on this sync)
+    """
+    for table in (spec.stats, spec.games):
+        for season, directory in season_dirs(table).items():
+            for name in os.listdir(directory):
+                if name.endswith(".tmp"):
+                    os.remove(os.path.join(directory, name))
+    games = season_dirs(spec.games)
+    for season, directory in season_dirs(spec.stats).items():
+        for path in part_files(directory):
+            game_part = os.path.join(games.get(season, ""), os.path.basename(path))
+            if not os.path.exists(game_part):
+                os.remove(path)
+
+
+@contextmanager
+def _lock():
+    """One sync or compaction at a time per snapshot directory"""
+    import fcntl
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(os.path.join(SNAPSHOT_DIR, ".lock"), "w") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def sync_sport(sport: str) -> dict:
+    """
+    Append the sport's newly final games and their player lines. Only seasons
+    whose final-game count differs from the snapshot's are diffed, so a sync
+    with nothing new costs one small GROUP BY on the game table.
+    """
+    from sqlalchemy import exists, func, select
+    from src.api.export import EXPORTS, export_columns, export_query
+    from src.database.connection import engine
+    from src.database.models import Base
+
+    spec = SNAPSHOTS[sport]
+    games = Base.metadata.tables[spec.games]
+    stats = EXPORTS[spec.stats]
+    key, season_column = games.c[spec.key], games.c[spec.season]
+    final = [games.c[spec.final].isnot(None), exists().where(stats.join_on)]
+    appended = {spec.games: 0, spec.stats: 0}
+
+    _clean(spec)
+    local = _local_counts(spec)
+    with engine.connect() as conn:
+        counts = conn.execute(select(season_column, func.count()).where(*final)
+                              .group_by(season_column)).all()
+        for season, count in counts:
+            if season is None or local.get(str(season)) == count:
+                continue
+            stored = conn.execute(select(key).where(*final, season_column == season)).scalars()
+            new = sorted(set(stored) - _local_keys(spec, season))
+            if not new:
+                continue
+            game_rows, stat_rows = [], []
+            for start in range(0, len(new), KEY_CHUNK):
+                chunk = new[start:start + KEY_CHUNK]
+                game_rows += conn.execute(select(*games.c).where(key.in_(chunk), season_column == season)
+                                          .order_by(key)).all()
+                stat_rows += conn.execute(export_query(stats, season=season).where(key.in_(chunk))).all()
+
+            # Stats first: a game part only exists once its player lines do
+            existing = part_files(season_dirs(spec.games).get(str(season), ""))
+            name = f"part-{(_part_number(existing[-1]) + 1 if existing else 1):05d}.parquet"
+            partition = f"season={season}"
+            _write_part(os.path.join(SNAPSHOT_DIR, spec.stats, partition, name),
+                        export_columns(stats), stat_rows)
+            _write_part(os.path.join(SNAPSHOT_DIR, spec.games, partition, name),
+                        list(games.c), game_rows)
+            appended[spec.games] += len(game_rows)
+            appended[spec.stats] += len(stat_rows)
+            if len(existing) + 1 > SNAPSHOT_COMPACT_PARTS:
+                compact_season(spec, season)
+    return appended
+
+
+def compact_season(spec: SnapshotSpec, season):
+    """
+    Merge a season's parts into part-00001 for each table. Old parts are
+    removed before the merged ones are renamed into place, so an interrupted
+    compaction only loses rows, which the next sync fetches again.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    merged = {}
+    for table in (spec.stats, spec.games):
+        directory = season_dirs(table).get(str(season))
+        parts = part_files(directory) if directory else []
+        if len(parts) <= 1:
+            return
+        target = os.path.join(directory, "part-00001.parquet")
+        pq.write_table(pa.concat_tables([pq.read_table(path, memory_map=True) for path in parts]),
+                       target + ".tmp")
+        merged[table] = (parts, target)
+    for table in (spec.games, spec.stats):
+        for path in merged[table][0]:
+            os.remove(path)
+    for table in (spec.stats, spec.games):
+        target = merged[table][1]
+        os.replace(target + ".tmp", target)
+    log_event("snapshot.compact", table=spec.games, season=season, parts=len(merged[spec.games][0]))
+
+
+def sync(sports=None, compact: bool = False) -> dict:
+    """Sync each sport's snapshot (all by default); returns rows appended per table"""
+    appended = {}
+    with _lock():
+        for sport in sports or SNAPSHOTS:
+            started = time.perf_counter()
+            rows = sync_sport(sport)
+            if compact:
+                for season in season_dirs(SNAPSHOTS[sport].games):
+                    compact_season(SNAPSHOTS[sport], season)
+            log_event("snapshot.sync", sport=sport, seconds=time.perf_counter() - started,
+                      games=rows[SNAPSHOTS[sport].games], rows=rows[SNAPSHOTS[sport].stats])
+            appended.update(rows)
+    return appended
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new games to the local Parquet snapshots")
+    parser.add_argument("--sport", action="append", choices=list(SNAPSHOTS),
+                        help="sport to sync (repeatable; default all)")
+    parser.add_argument("--compact", action="store_true", help="merge each season into one file")
+    args = parser.parse_args()
+    sync(args.sport, compact=args.compact)
+
+
+if __name__ == "__main__":
+    main()
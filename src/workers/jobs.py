@@ -0,0 +1,208 @@
+"""
+DB-backed scrape job queue.
+
+The API enqueues a row in scrape_jobs and returns its id straight away; a
+worker process (src/workers/worker.py) claims queued rows by priority, then age,
+runs the scraper and keeps the row's progress counters and heartbeat
+current until it finishes.
+"""
+import importlib
+import inspect
+import json
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from src.database.models import ScrapeJob
+from src.metrics import (
+    COMMIT_SECONDS, FETCH_SECONDS, PARSE_SECONDS, ROWS_WRITTEN, THROTTLE_SECONDS, log_event
+)
+
+# Job kind -> "module:function" run with the job's params as keyword arguments.
+# Imported only when needed so the API doesn't load every scraper.
+JOB_KINDS = {
+    "nba_recent": "src.scrapers.nba:scrape_recent_days",
+    "nba_month": "src.scrapers.nba:scrape_nba_month",
+    "nba_upcoming": "src.scrapers.nba:scrape_upcoming_days",
+    "nba_refresh": "src.scrapers.nba:refresh_unfinished_games",
+    "cfb_week": "src.scrapers.cfb:scrape_cfb_week",
+    "lol_tournament": "src.scrapers.lol:scrape_lol_tournament",
+    "nfl_season": "src.scrapers.nfl:scrape_nfl_season",
+    "nhl_season": "src.scrapers.nhl:scrape_nhl_season",
+}
+
+ACTIVE = ("queued", "running")
+
+# A running job whose heartbeat is older than this lost its worker
+JOB_STALE_SECONDS = int(os.environ.get("JOB_STALE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+
+
+class JobError(ValueError):
+    """Unknown job kind or params that don't fit its scraper"""
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def job_function(kind: str):
+    target = JOB_KINDS.get(kind)
+    if target is None:
+        raise JobError(f"Unknown job kind '{kind}'; available: {', '.join(JOB_KINDS)}")
+    module, name = target.split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def check_params(kind: str, params: dict):
+    """Raise JobError unless params bind to the kind's scraper signature"""
+    try:
+        inspect.signature(job_function(kind)).bind(**params)
+    except TypeError as e:
+        raise JobError(f"Bad params for {kind}: {e}")
+
+
+def dedup_key(kind: str, params: dict) -> str:
+    """nba_month:{"month_slug":"january","season":2025}"""
+    return f"{kind}:{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+
+def latest_job(db: Session, kind: str, params: dict):
+    """Most recently queued job with this kind and params, or None"""
+    return db.execute(
+        select(ScrapeJob).where(ScrapeJob.dedup_key == dedup_key(kind, params))
+        .order_by(ScrapeJob.id.desc()).limit(1)
+    ).scalar()
+
+
+def enqueue(db: Session, kind: str, params: dict = None, priority: int = 0):
+    """
+    Queue a job and return (job, created). An identical job that is still
+    queued or running is returned instead of queueing a duplicate; a queued
+    one is raised to priority if that is higher.
+    """
+    params = params or {}
+    check_params(kind, params)
+    key = dedup_key(kind, params)
+    job = db.execute(
+        select(ScrapeJob).where(ScrapeJob.dedup_key == key, ScrapeJob.status.in_(ACTIVE))
+        .order_by(ScrapeJob.id).limit(1)
+    ).scalar()
+    if job is not None:
+        if job.status == "queued" and priority > job.priority:
+            job.priority = priority
+            db.commit()
+        return job, False
+
+    job = ScrapeJob(kind=kind, params=params, dedup_key=key, priority=priority, status="queued",
+                    attempts=0, pages_fetched=0, pages_parsed=0, rows_written=0)
+    db.add(job)
+    db.commit()
+    log_event("job.queued", job_id=job.id, kind=kind, priority=priority)
+    return job, True
+
+
+def claim(db: Session, worker: str):
+    """
+    Mark the highest-priority (then oldest) queued job running for worker
+    and return it, or None.
+    The conditional UPDATE makes the claim safe with several workers even
+    where SKIP LOCKED isn't available (SQLite).
+    """
+    while True:
+        job_id = db.execute(
+            select(ScrapeJob.id).where(ScrapeJob.status == "queued")
+            .order_by(ScrapeJob.priority.desc(), ScrapeJob.id).limit(1)
+            .with_for_update(skip_locked=True)
+        ).scalar()
+        if job_id is None:
+            db.rollback()
+            return None
+        now = utcnow()
+        claimed = db.execute(
+            update(ScrapeJob)
+            .where(ScrapeJob.id == job_id, ScrapeJob.status == "queued")
+            .values(status="running", worker=worker, attempts=ScrapeJob.attempts + 1,
+                    started_at=now, heartbeat_at=now, finished_at=None, error=None)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(ScrapeJob, job_id)
+
+
+def requeue_stale(db: Session, stale_seconds: int = JOB_STALE_SECONDS):
+    """
+    Running jobs with no heartbeat for stale_seconds lost their worker:
+    queue them again, or fail them once they've used JOB_MAX_ATTEMPTS.
+    Scrapers skip games already stored, so a rerun picks up where it stopped.
+    """
+    cutoff = utcnow() - timedelta(seconds=stale_seconds)
+    stale = db.execute(
+        select(ScrapeJob).where(ScrapeJob.status == "running", ScrapeJob.heartbeat_at < cutoff)
+    ).scalars().all()
+    for job in stale:
+        if job.attempts >= JOB_MAX_ATTEMPTS:
+            job.status, job.finished_at = "failed", utcnow()
+            job.error = f"worker {job.worker} stopped responding"
+        else:
+            job.status = "queued"
+        log_event("job.stale", job_id=job.id, kind=job.kind, worker=job.worker, status=job.status)
+    db.commit()
+    return len(stale)
+
+
+def progress_snapshot() -> dict:
+    """Process-wide scrape counters; a worker runs one job at a time, so deltas are per job"""
+    return {
+        "pages_fetched": FETCH_SECONDS.count(),
+        "pages_parsed": PARSE_SECONDS.count(),
+        "rows_written": int(ROWS_WRITTEN.total()),
+        "fetch_seconds": FETCH_SECONDS.total(),
+        "throttle_seconds": THROTTLE_SECONDS.total(),
+        "parse_seconds": PARSE_SECONDS.total(),
+        "commit_seconds": COMMIT_SECONDS.total(),
+    }
+
+
+def progress_values(before: dict, after: dict, seconds: float) -> dict:
+    """Column values for scrape_jobs from two progress snapshots"""
+    delta = {name: after[name] - before[name] for name in after}
+    timings = {name: round(delta[name], 3) for name in delta if name.endswith("_seconds")}
+    timings["total_seconds"] = round(seconds, 3)
+    return {
+        "pages_fetched": delta["pages_fetched"],
+        "pages_parsed": delta["pages_parsed"],
+        "rows_written": delta["rows_written"],
+        "timings": timings,
+    }
+
+
+def record_progress(db: Session, job_id: int, **values):
+    db.execute(update(ScrapeJob).where(ScrapeJob.id == job_id).values(**values))
+    db.commit()
+
+
+def job_dict(job: ScrapeJob) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "params": job.params,
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "worker": job.worker,
+        "pages_fetched": job.pages_fetched,
+        "pages_parsed": job.pages_parsed,
+        "rows_written": job.rows_written,
+        "timings": job.timings,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "heartbeat_at": job.heartbeat_at,
+        "finished_at": job.finished_at,
+    }
@@ -0,0 +1,196 @@
+"""
+Scrape scheduler: python -m src.workers.scheduler
+
+Every SCHEDULE_TICK_SECONDS it looks at what is stored for each sport and
+queues scrape jobs for the worker (src/workers/worker.py):
+
+- live: games that should be over but are still unscored are refreshed
+  every few minutes at high priority, one box score per open game
+- routine: the current month / week / match lists are checked a few
+  times a day to pick up new games
+- completed months and weeks are never queued again, and sports outside
+  their season months go dormant
+
+Whether a job is due comes from scrape_jobs itself (the latest job with the
+same kind and params), so restarts and overlapping ticks never double-queue
+and a job still queued or running is never queued twice.
+"""
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.database.changes import prune_change_log
+from src.database.connection import engine
+from src.database.models import CFBGame, LoLMatch
+from src.metrics import log_event
+from src.workers.jobs import ACTIVE, enqueue, latest_job, utcnow
+
+SCHEDULE_TICK_SECONDS = int(os.environ.get("SCHEDULE_TICK_SECONDS", "60"))
+SCHEDULE_TIMEZONE = os.environ.get("SCHEDULE_TIMEZONE", "America/New_York")
+
+PRIORITY_LIVE = 20
+PRIORITY_ROUTINE = 10
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# Seconds between runs of the same job
+CADENCES = {
+    "nba": {"live": 15 * MINUTE, "routine": 6 * HOUR, "schedule": 12 * HOUR},
+    "cfb": {"live": 30 * MINUTE, "routine": 12 * HOUR},
+    "lol": {"live": HOUR, "routine": 12 * HOUR},
+}
+
+# Months each sport is played; outside them the sport is dormant unless
+# games are still waiting on scores
+SEASON_MONTHS = {
+    "nba": {10, 11, 12, 1, 2, 3, 4, 5, 6},
+    "cfb": {8, 9, 10, 11, 12, 1},
+    "lol": {1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11},
+}
+
+# How far back an unscored game still counts as in progress
+PENDING_DAYS = 3
+
+# CFB games are mostly Thursday to Saturday
+CFB_GAME_DAYS = {3, 4, 5}
+
+
+@dataclass
+class PlannedJob:
+    kind: str
+    params: dict = field(default_factory=dict)
+    priority: int = PRIORITY_ROUTINE
+    every: int = 6 * HOUR
+
+
+def in_season(sport: str, day) -> bool:
+    return day.month in SEASON_MONTHS[sport]
+
+
+def plan_nba(db: Session, now: datetime) -> list:
+    from src.scrapers.nba import month_slug_for_date, season_for_date, unfinished_games
+
+    today = now.date()
+    pending = unfinished_games(db, PENDING_DAYS, now.replace(tzinfo=None))
+    if not pending and not in_season("nba", today):
+        return []
+
+    cadence = CADENCES["nba"]
+    plan = [
+        PlannedJob("nba_upcoming", {"days": 2}, PRIORITY_ROUTINE, cadence["schedule"]),
+        # Only the current month; finished months are never scanned again
+        PlannedJob("nba_month", {"season": season_for_date(today),
+                                 "month_slug": month_slug_for_date(today)},
+                   PRIORITY_ROUTINE, cadence["routine"]),
+    ]
+    if pending:
+        plan.append(PlannedJob("nba_refresh", {"days": PENDING_DAYS}, PRIORITY_LIVE, cadence["live"]))
+    return plan
+
+
+def plan_cfb(db: Session, now: datetime) -> list:
+    from src.scrapers.cfb import current_cfb_week
+
+    today = now.date()
+    pending = db.execute(
+        select(CFBGame.year, CFBGame.week).distinct()
+        .where(CFBGame.home_score.is_(None), CFBGame.date >= today - timedelta(days=PENDING_DAYS),
+               CFBGame.date <= today)
+    ).all()
+    if not pending and not in_season("cfb", today):
+        return []
+
+    cadence = CADENCES["cfb"]
+    live = bool(pending) or today.weekday() in CFB_GAME_DAYS
+    weeks = dict.fromkeys([current_cfb_week(now), *[tuple(week) for week in pending]])
+    return [PlannedJob("cfb_week", {"year": year, "week": week},
+                       PRIORITY_LIVE if live else PRIORITY_ROUTINE,
+                       cadence["live"] if live else cadence["routine"])
+            for year, week in weeks]
+
+
+def plan_lol(db: Session, now: datetime) -> list:
+    from src.scrapers.lol import CURRENT_SEASON, CURRENT_TOURNAMENTS
+
+    if not in_season("lol", now.date()):
+        return []
+    cadence = CADENCES["lol"]
+    # lol_matches.date is naive
+    recent = now.replace(tzinfo=None) - timedelta(days=1)
+    active = set(db.execute(
+        select(LoLMatch.league).distinct().where(LoLMatch.date >= recent)
+    ).scalars())
+    return [PlannedJob("lol_tournament", {"tournament_id": tournament, "season": CURRENT_SEASON},
+                       PRIORITY_LIVE if tournament in active else PRIORITY_ROUTINE,
+                       cadence["live"] if tournament in active else cadence["routine"])
+            for tournament in CURRENT_TOURNAMENTS]
+
+
+PLANNERS = {"nba": plan_nba, "cfb": plan_cfb, "lol": plan_lol}
+
+
+def is_due(db: Session, planned: PlannedJob, now: datetime) -> bool:
+    """Not queued or running, and the last run finished at least planned.every ago"""
+    job = latest_job(db, planned.kind, planned.params)
+    if job is None:
+        return True
+    if job.status in ACTIVE:
+        return False
+    last = job.finished_at or job.created_at
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=timezone.utc)
+    return (now - last).total_seconds() >= planned.every
+
+
+def tick(now: datetime = None, sports=None) -> list:
+    """Queue every job that is due now; returns the ids of jobs queued"""
+    now = now or utcnow()
+    local = now.astimezone(_zone())
+    queued, dormant = [], []
+    with Session(engine) as db:
+        for sport in sports or PLANNERS:
+            try:
+                plan = PLANNERS[sport](db, local)
+            except Exception as e:
+                log_event("schedule.error", sport=sport, error=str(e))
+                db.rollback()
+                continue
+            if not plan:
+                dormant.append(sport)
+            for planned in plan:
+                if not is_due(db, planned, now):
+                    continue
+                job, created = enqueue(db, planned.kind, planned.params, planned.priority)
+                if created:
+                    queued.append(job.id)
+        try:
+            pruned = prune_change_log(db)
+        except Exception as e:
+            log_event("schedule.error", task="prune_change_log", error=str(e))
+            db.rollback()
+            pruned = 0
+    log_event("schedule.tick", queued=len(queued), dormant=",".join(dormant) or None,
+              changes_pruned=pruned or None)
+    return queued
+
+
+def _zone():
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(SCHEDULE_TIMEZONE)
+
+
+def main():
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
+    scheduler = BlockingScheduler(timezone=SCHEDULE_TIMEZONE)
+    # One tick at a time; a tick missed while another ran is skipped, not replayed
+    scheduler.add_job(tick, "interval", seconds=SCHEDULE_TICK_SECONDS, next_run_time=datetime.now(_zone()),
+                      max_instances=1, coalesce=True)
+    log_event("schedule.start", tick_seconds=SCHEDULE_TICK_SECONDS, timezone=SCHEDULE_TIMEZONE)
+    scheduler.start()
+
+
+if __name__ == "__main__":
+    main()
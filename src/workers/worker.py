@@ -0,0 +1,157 @@
+"""
+Scrape job worker: python -m src.workers.worker
+
+Polls scrape_jobs for queued work and runs one job at a time, so long
+backfills never tie up an API process. Run as many workers as the
+scraped sites' rate limits allow; each claims different jobs.
+
+The scraper_* histograms (src/metrics.py) live in this process, so with
+WORKER_METRICS_PORT set the worker serves them at /metrics on that port.
+"""
+import argparse
+import os
+import signal
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from sqlalchemy.orm import Session
+from src.database.connection import engine
+from src.metrics import log_event, render
+from src.workers.jobs import (
+    claim, job_function, progress_snapshot, progress_values, record_progress, requeue_stale,
+    utcnow, worker_name
+)
+
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "5"))
+JOB_HEARTBEAT_SECONDS = float(os.environ.get("JOB_HEARTBEAT_SECONDS", "15"))
+# 0 leaves the metrics endpoint off
+WORKER_METRICS_PORT = int(os.environ.get("WORKER_METRICS_PORT", "0"))
+
+
+def run_job(job, heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS):
+    """
+    Run a claimed job to completion. A background thread writes progress
+    counters and the heartbeat every heartbeat_seconds while it runs.
+    """
+    job_id, kind, params = job.id, job.kind, dict(job.params or {})
+    before = progress_snapshot()
+    started = time.perf_counter()
+    done = threading.Event()
+
+    def heartbeat():
+        while not done.wait(heartbeat_seconds):
+            try:
+                with Session(engine) as db:
+                    record_progress(db, job_id, heartbeat_at=utcnow(), **progress_values(
+                        before, progress_snapshot(), time.perf_counter() - started))
+            except Exception as e:
+                log_event("job.heartbeat_error", job_id=job_id, error=str(e))
+
+    log_event("job.start", job_id=job_id, kind=kind, attempt=job.attempts)
+    beat = threading.Thread(target=heartbeat, name=f"job-{job_id}-heartbeat", daemon=True)
+    beat.start()
+    status, error = "succeeded", None
+    try:
+        job_function(kind)(**params)
+    except Exception as e:
+        status = "failed"
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+    finally:
+        done.set()
+        beat.join()
+
+    seconds = time.perf_counter() - started
+    values = progress_values(before, progress_snapshot(), seconds)
+    with Session(engine) as db:
+        now = utcnow()
+        record_progress(db, job_id, status=status, error=error, heartbeat_at=now, finished_at=now,
+                        **values)
+    log_event("job.done", job_id=job_id, kind=kind, status=status, error=error,
+              rows=values["rows_written"], pages=values["pages_fetched"], seconds=seconds)
+    if status == "succeeded" and os.environ.get("SNAPSHOT_DIR"):
+        snapshot(kind)
+    return status
+
+
+def snapshot(kind: str):
+    """Append what the job scraped to the local Parquet snapshots (src/snapshots.py)"""
+    from src.snapshots import SNAPSHOTS, sync
+    sport = kind.split("_", 1)[0]
+    if sport not in SNAPSHOTS:
+        return
+    try:
+        sync([sport])
+    except Exception as e:
+        log_event("snapshot.error", sport=sport, error=str(e))
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics -> scraper histograms in Prometheus text format"""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render("scraper_").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int):
+    """Serve /metrics on port from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    log_event("worker.metrics", port=server.server_address[1])
+    return server
+
+
+def work(once: bool = False, poll_seconds: float = JOB_POLL_SECONDS):
+    """
+    Claim and run jobs until SIGTERM/SIGINT (finishing the current job
+    first), or until the queue is empty when once is set.
+    """
+    name = worker_name()
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        log_event("worker.stopping", worker=name, signal=signum)
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    log_event("worker.start", worker=name)
+
+    while not stopping.is_set():
+        with Session(engine) as db:
+            requeue_stale(db)
+            job = claim(db, name)
+        if job is None:
+            if once:
+                break
+            stopping.wait(poll_seconds)
+            continue
+        run_job(job)
+    log_event("worker.stop", worker=name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued scrape jobs")
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    parser.add_argument("--poll-seconds", type=float, default=JOB_POLL_SECONDS)
+    parser.add_argument("--metrics-port", type=int, default=WORKER_METRICS_PORT,
+                        help="serve scraper metrics at /metrics on this port (0 = off)")
+    args = parser.parse_args()
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    work(once=args.once, poll_seconds=args.poll_seconds)
+
+
+if __name__ == "__main__":
+    main()
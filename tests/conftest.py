@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+# src.database.connection builds its engine from DATABASE_URL at import time
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+
+import pytest
+from sqlalchemy import MetaData
+
+
+@pytest.fixture
+def empty_db():
+    """The test database with every table dropped"""
+    from src.database.connection import engine
+    metadata = MetaData()
+    metadata.reflect(engine)
+    metadata.drop_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def api(empty_db, monkeypatch):
+    """TestClient for the API on a freshly migrated database, with empty response caches"""
+    from fastapi.testclient import TestClient
+    from src.api import cache
+    from src.api.main import app
+    from src.database.migrations import upgrade_database
+    upgrade_database()
+    monkeypatch.setattr(cache, "response_cache", cache.ResponseCache())
+    # Re-read data_versions on every request so bumps show up straight away
+    monkeypatch.setattr(cache, "version_tracker", cache.VersionTracker(interval=0))
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,240 @@
+-- SQLite schema Base.metadata.create_all built from the models before migrations existed (alembic revision 001)
+CREATE TABLE nba_games (
+	game_id VARCHAR(20) NOT NULL, 
+	date DATE NOT NULL, 
+	home_team VARCHAR(50), 
+	away_team VARCHAR(50), 
+	home_score INTEGER, 
+	away_score INTEGER, 
+	season INTEGER, 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (game_id)
+);
+CREATE TABLE nba_teams (
+	id INTEGER NOT NULL, 
+	name VARCHAR(100), 
+	abbreviation VARCHAR(10), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (id)
+);
+CREATE TABLE nba_players (
+	id INTEGER NOT NULL, 
+	name VARCHAR(100), 
+	team VARCHAR(50), 
+	position VARCHAR(10), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (id)
+);
+CREATE TABLE nfl_games (
+	game_id VARCHAR(20) NOT NULL, 
+	date DATE NOT NULL, 
+	home_team VARCHAR(50), 
+	away_team VARCHAR(50), 
+	home_score INTEGER, 
+	away_score INTEGER, 
+	season INTEGER, 
+	week INTEGER, 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (game_id)
+);
+CREATE TABLE nhl_games (
+	game_id VARCHAR(20) NOT NULL, 
+	date DATE NOT NULL, 
+	home_team VARCHAR(50), 
+	away_team VARCHAR(50), 
+	home_score INTEGER, 
+	away_score INTEGER, 
+	season INTEGER, 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (game_id)
+);
+CREATE TABLE soccer_matches (
+	match_id VARCHAR(20) NOT NULL, 
+	date DATE NOT NULL, 
+	home_team VARCHAR(100), 
+	away_team VARCHAR(100), 
+	home_score INTEGER, 
+	away_score INTEGER, 
+	league VARCHAR(100), 
+	season VARCHAR(20), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (match_id)
+);
+CREATE TABLE lol_matches (
+	match_id VARCHAR(50) NOT NULL, 
+	date DATETIME NOT NULL, 
+	team1 VARCHAR(100), 
+	team2 VARCHAR(100), 
+	winner VARCHAR(100), 
+	duration INTEGER, 
+	league VARCHAR(100), 
+	season VARCHAR(20), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (match_id)
+);
+CREATE TABLE cs2_matches (
+	match_id VARCHAR(50) NOT NULL, 
+	date DATETIME NOT NULL, 
+	team1 VARCHAR(100), 
+	team2 VARCHAR(100), 
+	team1_score INTEGER, 
+	team2_score INTEGER, 
+	tournament VARCHAR(200), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (match_id)
+);
+CREATE TABLE dota2_matches (
+	match_id VARCHAR(50) NOT NULL, 
+	date DATETIME NOT NULL, 
+	team1 VARCHAR(100), 
+	team2 VARCHAR(100), 
+	winner VARCHAR(100), 
+	duration INTEGER, 
+	tournament VARCHAR(200), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (match_id)
+);
+CREATE TABLE cod_matches (
+	match_id VARCHAR(50) NOT NULL, 
+	date DATETIME NOT NULL, 
+	team1 VARCHAR(100), 
+	team2 VARCHAR(100), 
+	team1_score INTEGER, 
+	team2_score INTEGER, 
+	mode VARCHAR(50), 
+	event VARCHAR(200), 
+	scraped_at DATETIME DEFAULT (CURRENT_TIMESTAMP), 
+	PRIMARY KEY (match_id)
+);
+CREATE TABLE nba_player_stats (
+	id INTEGER NOT NULL, 
+	game_id VARCHAR(20), 
+	player_name VARCHAR(100), 
+	team VARCHAR(50), 
+	minutes VARCHAR(10), 
+	points INTEGER, 
+	rebounds INTEGER, 
+	assists INTEGER, 
+	steals INTEGER, 
+	blocks INTEGER, 
+	turnovers INTEGER, 
+	fg_made INTEGER, 
+	fg_attempted INTEGER, 
+	three_made INTEGER, 
+	three_attempted INTEGER, 
+	ft_made INTEGER, 
+	ft_attempted INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(game_id) REFERENCES nba_games (game_id)
+);
+CREATE TABLE nfl_player_stats (
+	id INTEGER NOT NULL, 
+	game_id VARCHAR(20), 
+	player_name VARCHAR(100), 
+	team VARCHAR(50), 
+	position VARCHAR(10), 
+	pass_attempts INTEGER, 
+	pass_completions INTEGER, 
+	pass_yards INTEGER, 
+	pass_touchdowns INTEGER, 
+	interceptions INTEGER, 
+	rush_attempts INTEGER, 
+	rush_yards INTEGER, 
+	rush_touchdowns INTEGER, 
+	receptions INTEGER, 
+	receiving_yards INTEGER, 
+	receiving_touchdowns INTEGER, 
+	targets INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(game_id) REFERENCES nfl_games (game_id)
+);
+CREATE TABLE nhl_player_stats (
+	id INTEGER NOT NULL, 
+	game_id VARCHAR(20), 
+	player_name VARCHAR(100), 
+	team VARCHAR(50), 
+	position VARCHAR(10), 
+	goals INTEGER, 
+	assists INTEGER, 
+	points INTEGER, 
+	plus_minus INTEGER, 
+	pim INTEGER, 
+	shots INTEGER, 
+	time_on_ice VARCHAR(10), 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(game_id) REFERENCES nhl_games (game_id)
+);
+CREATE TABLE soccer_player_stats (
+	id INTEGER NOT NULL, 
+	match_id VARCHAR(20), 
+	player_name VARCHAR(100), 
+	team VARCHAR(100), 
+	position VARCHAR(20), 
+	goals INTEGER, 
+	assists INTEGER, 
+	shots INTEGER, 
+	shots_on_target INTEGER, 
+	xg FLOAT, 
+	xa FLOAT, 
+	passes_completed INTEGER, 
+	passes_attempted INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(match_id) REFERENCES soccer_matches (match_id)
+);
+CREATE TABLE lol_player_stats (
+	id INTEGER NOT NULL, 
+	match_id VARCHAR(50), 
+	player_name VARCHAR(100), 
+	team VARCHAR(100), 
+	champion VARCHAR(50), 
+	role VARCHAR(20), 
+	kills INTEGER, 
+	deaths INTEGER, 
+	assists INTEGER, 
+	cs INTEGER, 
+	gold INTEGER, 
+	damage_dealt INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(match_id) REFERENCES lol_matches (match_id)
+);
+CREATE TABLE cs2_player_stats (
+	id INTEGER NOT NULL, 
+	match_id VARCHAR(50), 
+	player_name VARCHAR(100), 
+	team VARCHAR(100), 
+	kills INTEGER, 
+	deaths INTEGER, 
+	assists INTEGER, 
+	adr FLOAT, 
+	rating FLOAT, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(match_id) REFERENCES cs2_matches (match_id)
+);
+CREATE TABLE dota2_player_stats (
+	id INTEGER NOT NULL, 
+	match_id VARCHAR(50), 
+	player_name VARCHAR(100), 
+	team VARCHAR(100), 
+	hero VARCHAR(50), 
+	role VARCHAR(20), 
+	kills INTEGER, 
+	deaths INTEGER, 
+	assists INTEGER, 
+	net_worth INTEGER, 
+	hero_damage INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(match_id) REFERENCES dota2_matches (match_id)
+);
+CREATE TABLE cod_player_stats (
+	id INTEGER NOT NULL, 
+	match_id VARCHAR(50), 
+	player_name VARCHAR(100), 
+	team VARCHAR(100), 
+	kills INTEGER, 
+	deaths INTEGER, 
+	assists INTEGER, 
+	damage INTEGER, 
+	kd_ratio FLOAT, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(match_id) REFERENCES cod_matches (match_id)
+);
@@ -0,0 +1,49 @@
+from datetime import date
+from src.database.bulk import BulkWriter
+from src.database.models import NBAGame
+
+
+def add_games(engine, *game_ids):
+    with BulkWriter(engine) as writer:
+        for game_id in game_ids:
+            writer.add(NBAGame, {"game_id": game_id, "date": date(2025, 1, 15), "season": 2025,
+                                 "home_team": "BOS", "away_team": "NYK"})
+
+
+def test_repeat_request_is_a_cache_hit_and_304(api, empty_db):
+    add_games(empty_db, "202501150BOS")
+    first = api.get("/nba/games")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+
+    second = api.get("/nba/games", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.content == b""
+
+
+def test_write_bumps_version_and_changes_etag(api, empty_db):
+    add_games(empty_db, "202501150BOS")
+    first = api.get("/nba/games")
+    add_games(empty_db, "202501160BOS")
+
+    second = api.get("/nba/games", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["X-Cache"] == "MISS"
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert first.json()["count"] == 1
+    assert second.json()["count"] == 2
+    assert api.get("/nba/games").headers["X-Cache"] == "HIT"
+
+
+def test_error_responses_are_not_cached(api, empty_db):
+    NBAGame.__table__.drop(empty_db)
+    try:
+        for _ in range(2):
+            response = api.get("/nba/games")
+            assert response.json()["status"] == "error"
+            assert response.headers["X-Cache"] == "MISS"
+    finally:
+        # Other tables reference it, and empty_db reflects them all
+        NBAGame.__table__.create(empty_db)
@@ -0,0 +1,48 @@
+from datetime import date
+import pytest
+from sqlalchemy import select
+from src.database.bulk import BulkWriter
+from src.database.migrations import upgrade_database
+from src.database.models import NBAGame, NBAPlayerStat
+
+
+def game(game_id, day=date(2025, 1, 15)):
+    return {"game_id": game_id, "date": day, "home_team": "BOS", "away_team": "NYK",
+            "home_score": 108, "away_score": 112, "season": 2025}
+
+
+def test_rejected_row_keeps_the_rest_of_its_batch(empty_db):
+    upgrade_database()
+    with BulkWriter(empty_db) as writer:
+        for game_id in ["202501150BOS", "202501160BOS", "202501170BOS"]:
+            # date is NOT NULL, so the middle game is rejected
+            writer.add(NBAGame, game(game_id, None if game_id == "202501160BOS" else date(2025, 1, 15)))
+            writer.add_many(NBAPlayerStat, [
+                {"game_id": game_id, "season": 2025, "player_name": f"Player {i}", "points": i}
+                for i in range(3)
+            ])
+
+    with empty_db.connect() as conn:
+        games = conn.execute(select(NBAGame.game_id).order_by(NBAGame.game_id)).scalars().all()
+        stat_games = conn.execute(select(NBAPlayerStat.game_id)).scalars().all()
+    assert games == ["202501150BOS", "202501170BOS"]
+    assert sum(game_id in games for game_id in stat_games) == 6
+    assert writer.rows_written["nba_games"] == 2
+
+
+def test_failed_flush_keeps_rows_buffered(empty_db, monkeypatch):
+    upgrade_database()
+    writer = BulkWriter(empty_db)
+    writer.add(NBAGame, game("202501150BOS"))
+
+    def unavailable(conn, pending):
+        raise ConnectionError("database went away")
+
+    monkeypatch.setattr(writer, "_write", unavailable)
+    with pytest.raises(ConnectionError):
+        writer.flush()
+    assert writer.pending_count == 1
+
+    monkeypatch.undo()
+    writer.flush()
+    assert writer.rows_written == {"nba_games": 1}
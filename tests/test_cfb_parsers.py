@@ -0,0 +1,36 @@
+from datetime import date
+from src.scrapers.cfb import parse_cfb_week
+
+HEAD = "<tr><th>Wk</th><th>Date</th><th>{w}</th><th>{pw}</th><th>{l}</th><th>{pl}</th><th>Notes</th></tr>"
+
+
+def schedule(rows, names=("Winner", "Pts", "Loser", "Pts")):
+    head = HEAD.format(w=names[0], pw=names[1], l=names[2], pl=names[3])
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f'<table id="schedule"><thead>{head}</thead><tbody>{body}</tbody></table>'
+
+
+def test_week_rows_are_typed_and_oriented():
+    html = schedule([
+        (1, "2025-08-30", "Ohio State", 31, "Texas", 14, ""),
+        (2, "2025-09-06", "Alabama", 42, "Georgia", 3, "@"),
+        ("Wk", "Date", "Winner", "Pts", "Loser", "Pts", "Notes"),
+        (2, "2025-09-06", "Navy", "", "Army", "", ""),
+    ])
+    games = parse_cfb_week(html, 2025, 2)
+    assert games == [
+        {"game_id": "2025_2_Alabama_Georgia", "date": date(2025, 9, 6), "home_team": "Georgia",
+         "away_team": "Alabama", "home_score": 3, "away_score": 42, "winner": "Alabama",
+         "year": 2025, "week": 2},
+        {"game_id": "2025_2_Navy_Army", "date": date(2025, 9, 6), "home_team": "Navy",
+         "away_team": "Army", "home_score": None, "away_score": None, "winner": "Navy",
+         "year": 2025, "week": 2},
+    ]
+
+
+def test_old_column_names_and_missing_table():
+    html = schedule([(3, "2025-09-13", "Oregon", 28, "USC", 21, "")],
+                    names=("W", "PtsW", "L", "PtsL"))
+    [game] = parse_cfb_week(html, 2025, 3)
+    assert (game["home_score"], game["away_score"]) == (28, 21)
+    assert parse_cfb_week("<html></html>", 2025, 3) is None
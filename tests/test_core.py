@@ -0,0 +1,37 @@
+from datetime import date
+from src.database.migrations import upgrade_database
+from src.database.models import NBAGame
+from src.scrapers import core, pipeline
+
+BASE = "https://www.basketball-reference.com/boxscores/"
+
+
+def parse_game(url, html):
+    game_id = url[len(BASE):-len(".html")]
+    # An empty page stands in for one whose row the database rejects (date is NOT NULL)
+    return {"game_id": game_id, "date": date(2025, 1, 15) if html else None, "season": 2025}
+
+
+def save_game(writer, game):
+    writer.add(NBAGame, game)
+
+
+ADAPTER = core.SportAdapter("nba", NBAGame.game_id, None, parse_game, save_game)
+
+
+def test_written_counts_only_committed_pages(empty_db, monkeypatch):
+    upgrade_database()
+    pages = {f"{BASE}202501150BOS.html": "<html>ok</html>", f"{BASE}202501160BOS.html": ""}
+
+    async def fetch_raw_async(session, url, timeout=10, throttle=None, headers=None,
+                              revalidate=False):
+        return pages[url].encode(), "utf-8"
+
+    monkeypatch.setattr(pipeline, "fetch_raw_async", fetch_raw_async)
+    discovery = core.Discovery({url: url[len(BASE):-len(".html")] for url in pages})
+    stats = core.scrape_pages(ADAPTER, discovery, parse_workers=0)
+
+    assert stats["saved"] == 2
+    assert stats["written"] == 1
+    assert stats["rows_written"]["nba_games"] == 1
+    assert stats["errors"] == 0
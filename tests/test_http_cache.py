@@ -0,0 +1,61 @@
+import asyncio
+import os
+from src.scrapers import http_cache
+from src.scrapers.http_cache import HTTPCache
+
+URL = "https://www.basketball-reference.com/boxscores/202501150BOS.html"
+
+
+def test_prune_deletes_least_recently_used_entries(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_mb=0)
+    urls = [f"{URL}?n={n}" for n in range(4)]
+    for age, url in enumerate(urls):
+        cache.store(url, b"x" * 1000, {})
+        _, body_path = cache._paths(url)
+        os.utime(body_path, (1000 + age, 1000 + age))
+    cache.body_bytes(urls[0])  # served, so now the most recent
+
+    assert cache.prune(2500) == 2
+    assert [cache.lookup(url) is not None for url in urls] == [True, False, False, True]
+    assert cache.prune(2500) == 0
+
+
+class _NotModified:
+    status = 304
+    headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers)
+        return _NotModified()
+
+
+async def _no_wait(*args, **kwargs):
+    return 0.0
+
+
+def test_revalidate_rechecks_immutable_entries(tmp_path, monkeypatch):
+    cache = HTTPCache(str(tmp_path))
+    cache.store(URL, b"<html></html>", {"ETag": '"v1"'}, "utf-8")
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    monkeypatch.setattr(http_cache.limiter, "acquire_async", _no_wait)
+    monkeypatch.setattr(http_cache.limiter, "record_async", _no_wait)
+    session = _Session()
+
+    # Box scores are IMMUTABLE, so a plain fetch never asks the origin
+    asyncio.run(http_cache.fetch_raw_async(session, URL))
+    assert session.requests == []
+
+    content, _ = asyncio.run(http_cache.fetch_raw_async(session, URL, revalidate=True))
+    assert content == b"<html></html>"
+    assert session.requests == [{"If-None-Match": '"v1"'}]
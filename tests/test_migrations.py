@@ -0,0 +1,30 @@
+import os
+from sqlalchemy import inspect, text
+from alembic.script import ScriptDirectory
+from src.database.migrations import alembic_config, upgrade_database
+
+BASELINE_SCHEMA = os.path.join(os.path.dirname(__file__), "fixtures", "baseline_schema.sql")
+
+
+def test_upgrade_from_baseline_schema(empty_db):
+    with open(BASELINE_SCHEMA) as f:
+        statements = [s for s in f.read().split(";") if s.strip()]
+    with empty_db.begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+        conn.execute(text("INSERT INTO nba_games (game_id, date, season) "
+                          "VALUES ('202401010BOS', '2024-01-01', 2024)"))
+        conn.execute(text("INSERT INTO nba_player_stats (game_id, player_name, minutes) "
+                          "VALUES ('202401010BOS', 'Jayson Tatum', '36:30')"))
+
+    assert upgrade_database() == "upgraded"
+
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    inspector = inspect(empty_db)
+    assert {"cfb_games", "cfb_player_stats", "players"} <= set(inspector.get_table_names())
+    with empty_db.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == head
+        row = conn.execute(text(
+            "SELECT p.name, s.seconds_played FROM nba_player_stats s "
+            "JOIN players p ON p.id = s.player_id")).one()
+    assert tuple(row) == ("Jayson Tatum", 36 * 60 + 30)
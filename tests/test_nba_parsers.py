@@ -0,0 +1,28 @@
+import os
+from src.scrapers.nba import parse_box_score, parse_box_score_bs4
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "nba_box_score.html")
+GAME_ID = "202501150BOS"
+
+
+def load_fixture():
+    with open(FIXTURE) as f:
+        return f.read()
+
+
+def test_lxml_parser_matches_bs4_parser():
+    html = load_fixture()
+    assert parse_box_score(html, GAME_ID, 2025) == parse_box_score_bs4(html, GAME_ID, 2025)
+
+
+def test_lxml_parser_reads_hidden_tables_and_dnp_rows():
+    game, player_stats = parse_box_score(load_fixture(), GAME_ID, 2025)
+    assert (game["away_team"], game["away_score"]) == ("New York Knicks", 112)
+    assert (game["home_team"], game["home_score"]) == ("Boston Celtics", 108)
+    by_name = {row["player_name"]: row for row in player_stats}
+    assert len(by_name) == 10
+    assert by_name["Jayson Tatum"]["team"] == "BOS"
+    assert by_name["Jayson Tatum"]["seconds_played"] == 40 * 60 + 1
+    assert by_name["Jayson Tatum"]["points"] == 29
+    assert by_name["Ariel Hukporti"]["seconds_played"] is None
+    assert by_name["Ariel Hukporti"]["points"] is None
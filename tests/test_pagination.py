@@ -0,0 +1,48 @@
+from datetime import date
+import pytest
+from src.database.bulk import BulkWriter
+from src.database.models import NBAGame
+
+
+@pytest.fixture
+def games(empty_db):
+    """12 games over 3 dates, so most pages end between games on the same date"""
+    game_ids = []
+    with BulkWriter(empty_db) as writer:
+        for day in (14, 15, 16):
+            for team in ("ATL", "BOS", "CHI", "DAL"):
+                game_id = f"202501{day}0{team}"
+                game_ids.append(game_id)
+                writer.add(NBAGame, {"game_id": game_id, "date": date(2025, 1, day),
+                                     "season": 2025, "home_team": team, "away_team": "NYK"})
+    return game_ids
+
+
+def page_through(api, **params):
+    seen, cursor = [], None
+    while True:
+        body = api.get("/nba/games", params={**params, "limit": 5, "fields": "id,date",
+                                              **({"cursor": cursor} if cursor else {})}).json()
+        seen += [(game["date"], game["id"]) for game in body["games"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_pages_return_every_game_once_in_order(api, games, order):
+    seen = page_through(api, order=order)
+    assert len(seen) == len(set(seen)) == len(games)
+    assert seen == sorted(seen, reverse=order == "desc")
+
+
+def test_pages_respect_filters(api, games):
+    seen = page_through(api, order="asc", team="BOS")
+    assert [game_id for _, game_id in seen] == [g for g in games if g.endswith("BOS")]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WzFd", "WyIyMDI1LTEzLTAxIiwgIngiXQ"])
+def test_malformed_cursor_is_a_400(api, games, cursor):
+    response = api.get("/nba/games", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,72 @@
+import random
+import statistics
+import pytest
+from fastapi import HTTPException
+from src.api.props import PROP_STATS, STAT_INDEX, evaluate_props, game_tensor, parse_stat
+
+# Rows as recent_games_query returns them: (player, recency, *PROP_STATS values)
+PLAYERS = {"Jayson Tatum": 20, "Rookie": 3, "Unknown Player": 0}
+
+
+def make_rows(seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for player, count in PLAYERS.items():
+        for recency in range(1, count + 1):
+            # Small ranges so integer lines push; the odd NULL stat is left out per prop
+            rows.append((player, recency, *[None if rng.random() < 0.05 else rng.randint(0, 6)
+                                            for _ in PROP_STATS]))
+    rng.shuffle(rows)
+    return rows
+
+
+def naive(rows, prop):
+    """One prop at a time, straight from the rows"""
+    parts = parse_stat(prop["stat"])
+    values = []
+    for row in rows:
+        if row[0] != prop["player"] or row[1] > prop["window"]:
+            continue
+        components = [row[2 + STAT_INDEX[part]] for part in parts]
+        if None not in components:
+            values.append(sum(components))
+    played = len(values)
+    return {
+        "player": prop["player"], "stat": prop["stat"], "line": prop["line"],
+        "window": prop["window"], "games": played,
+        "over": sum(value > prop["line"] for value in values),
+        "under": sum(value < prop["line"] for value in values),
+        "push": sum(value == prop["line"] for value in values),
+        "hit_rate": round(sum(value > prop["line"] for value in values) / played, 3) if played else None,
+        "average": round(statistics.mean(values), 3) if played else None,
+        "median": round(float(statistics.median(values)), 3) if played else None,
+    }
+
+
+def test_vectorized_matches_naive_per_prop():
+    props = [
+        {"player": player, "stat": stat, "line": line, "window": window}
+        for player in PLAYERS
+        for stat in ("points", "pts", "pra", "stocks", "threes+turnovers", "REB + AST")
+        for line in (3, 3.5, 8, 12)
+        for window in (1, 5, 10, 25)
+    ]
+    max_window = max(prop["window"] for prop in props)
+    players = list(PLAYERS)
+    rows = make_rows()
+    tensor = game_tensor(rows, players, max_window)
+    results = evaluate_props(props, tensor, {name: i for i, name in enumerate(players)})
+
+    assert results == [naive(rows, prop) for prop in props]
+    assert any(result["push"] for result in results)
+    short = [r for r in results if r["player"] == "Rookie" and r["window"] == 10]
+    assert all(result["games"] <= 3 for result in short)
+    unknown = [r for r in results if r["player"] == "Unknown Player"]
+    assert all(r["games"] == 0 and r["hit_rate"] is None and r["median"] is None for r in unknown)
+
+
+def test_unknown_stat_is_a_400():
+    assert parse_stat("pra") == ["points", "rebounds", "assists"]
+    with pytest.raises(HTTPException) as error:
+        parse_stat("points+dunks")
+    assert error.value.status_code == 400
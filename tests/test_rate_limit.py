@@ -0,0 +1,22 @@
+import pytest
+from src.scrapers.rate_limit import CIRCUIT_THRESHOLD, CircuitOpenError, RateLimiter
+
+URL = "https://www.basketball-reference.com/boxscores/202501150BOS.html"
+
+
+def test_errors_without_a_response_do_not_back_off(tmp_path):
+    limiter = RateLimiter(str(tmp_path / "limits.sqlite"))
+    for _ in range(CIRCUIT_THRESHOLD * 2):
+        assert limiter.record(URL, None) == 0.0
+        assert limiter.record(URL, 500) == 0.0
+    # No backoff, no open circuit: the next request only waits for its token
+    assert limiter.reserve(URL) < 10
+
+
+def test_throttling_backs_off_and_opens_the_circuit(tmp_path):
+    limiter = RateLimiter(str(tmp_path / "limits.sqlite"))
+    assert limiter.record(URL, 429, "120") == 120
+    for _ in range(CIRCUIT_THRESHOLD - 1):
+        limiter.record(URL, 503)
+    with pytest.raises(CircuitOpenError):
+        limiter.reserve(URL)
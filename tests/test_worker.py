@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Session
+from src.database.migrations import upgrade_database
+from src.database.models import ScrapeJob
+from src.scrapers import nba
+from src.scrapers.rate_limit import CircuitOpenError
+from src.workers.jobs import claim, enqueue
+from src.workers.worker import run_job
+
+
+def test_failed_scrape_marks_job_failed(empty_db, monkeypatch):
+    upgrade_database()
+
+    def fetch(url, **kwargs):
+        raise CircuitOpenError("www.basketball-reference.com circuit open")
+
+    monkeypatch.setattr(nba, "fetch", fetch)
+    with Session(empty_db) as db:
+        job, _ = enqueue(db, "nba_month", {"season": 2025, "month_slug": "january"})
+        job = claim(db, "test-worker")
+
+    assert run_job(job, heartbeat_seconds=60) == "failed"
+    with Session(empty_db) as db:
+        job = db.get(ScrapeJob, job.id)
+    assert job.status == "failed"
+    assert "CircuitOpenError" in job.error